@@ -3,8 +3,19 @@ import os
 
 from fastapi import FastAPI
 
+from services.concurrent_service import CONCURRENT_SERVICE
 from services.database import create_db_and_tables
-from utils.get_env import get_app_data_directory_env
+from services.http_session_service import HTTP_SESSION_SERVICE
+from services.libreoffice_service import LIBREOFFICE_SERVICE
+from services.process_pool_service import (
+    DOCUMENT_PROCESS_POOL,
+    PAGE_IMAGE_PROCESS_POOL,
+    PPTX_IMAGE_PROCESS_POOL,
+)
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_heavy_features_enabled_env,
+)
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
 )
@@ -15,6 +26,7 @@ async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
     Initializes the application data directory and checks LLM model availability.
+    Warms up document parser workers in the background and shuts down worker process pools, LibreOffice instances and the shared HTTP session on exit.
 
     """
     try:
@@ -24,4 +36,11 @@ async def app_lifespan(_: FastAPI):
         os.makedirs(get_app_data_directory_env(), exist_ok=True)
     await create_db_and_tables()
     await check_llm_and_image_provider_api_or_model_availability()
+    if get_heavy_features_enabled_env().lower() == "true":
+        CONCURRENT_SERVICE.run_task(None, DOCUMENT_PROCESS_POOL.start)
     yield
+    DOCUMENT_PROCESS_POOL.shutdown()
+    PAGE_IMAGE_PROCESS_POOL.shutdown()
+    PPTX_IMAGE_PROCESS_POOL.shutdown()
+    await LIBREOFFICE_SERVICE.shutdown()
+    await HTTP_SESSION_SERVICE.close()
@@ -3,11 +3,14 @@ import os
 from typing import Annotated, List, Optional
 from fastapi import APIRouter, Body, File, UploadFile
 
-from constants.documents import UPLOAD_ACCEPTED_FILE_TYPES
+from constants.documents import MAX_UPLOAD_SIZE_MB, UPLOAD_ACCEPTED_FILE_TYPES
+from enums.pdf_engine import PdfEngine
 from models.decomposed_file_info import DecomposedFileInfo
+from services.document_cache_service import DOCUMENT_CACHE_SERVICE
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.documents_loader import DocumentsLoader
 import uuid
+from utils.file_utils import save_upload_file
 from utils.validators import validate_files
 
 FILES_ROUTER = APIRouter(prefix="/files", tags=["Files"])
@@ -20,7 +23,7 @@ async def upload_files(files: Optional[List[UploadFile]]):
 
     temp_dir = TEMP_FILE_SERVICE.create_temp_dir(str(uuid.uuid4()))
 
-    validate_files(files, True, True, 100, UPLOAD_ACCEPTED_FILE_TYPES)
+    validate_files(files, True, True, MAX_UPLOAD_SIZE_MB, UPLOAD_ACCEPTED_FILE_TYPES)
 
     temp_files: List[str] = []
     if files:
@@ -28,9 +31,10 @@ async def upload_files(files: Optional[List[UploadFile]]):
             temp_path = TEMP_FILE_SERVICE.create_temp_file_path(
                 each_file.filename, temp_dir
             )
-            with open(temp_path, "wb") as f:
-                content = await each_file.read()
-                f.write(content)
+            file_hash = await save_upload_file(
+                each_file, temp_path, MAX_UPLOAD_SIZE_MB
+            )
+            DOCUMENT_CACHE_SERVICE.remember_file_hash(temp_path, file_hash)
 
             temp_files.append(temp_path)
 
@@ -38,7 +42,10 @@ async def upload_files(files: Optional[List[UploadFile]]):
 
 
 @FILES_ROUTER.post("/decompose", response_model=List[DecomposedFileInfo])
-async def decompose_files(file_paths: Annotated[List[str], Body(embed=True)]):
+async def decompose_files(
+    file_paths: Annotated[List[str], Body(embed=True)],
+    pdf_engine: Annotated[PdfEngine, Body(embed=True)] = PdfEngine.AUTO,
+):
     temp_dir = TEMP_FILE_SERVICE.create_temp_dir(str(uuid.uuid4()))
 
     txt_files = []
@@ -49,7 +56,7 @@ async def decompose_files(file_paths: Annotated[List[str], Body(embed=True)]):
         else:
             other_files.append(file_path)
 
-    documents_loader = DocumentsLoader(file_paths=other_files)
+    documents_loader = DocumentsLoader(file_paths=other_files, pdf_engine=pdf_engine)
     await documents_loader.load_documents(temp_dir)
     parsed_documents = documents_loader.documents
 
@@ -81,7 +88,10 @@ async def update_files(
     file_path: Annotated[str, Body()],
     file: Annotated[UploadFile, File()],
 ):
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    # Written next to the original so a rejected upload leaves it untouched
+    temp_path = f"{file_path}.{uuid.uuid4()}.tmp"
+    file_hash = await save_upload_file(file, temp_path, MAX_UPLOAD_SIZE_MB)
+    os.replace(temp_path, file_path)
+    DOCUMENT_CACHE_SERVICE.remember_file_hash(file_path, file_hash)
 
     return {"message": "File updated successfully"}
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from constants.documents import MAX_IMAGE_UPLOAD_SIZE_MB
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
 from services.database import get_async_session
@@ -10,7 +11,7 @@ from services.image_generation_service import ImageGenerationService
 from utils.asset_directory_utils import get_images_directory
 import os
 import uuid
-from utils.file_utils import get_file_name_with_random_uuid
+from utils.file_utils import get_file_name_with_random_uuid, save_upload_file
 
 IMAGES_ROUTER = APIRouter(prefix="/images", tags=["Images"])
 
@@ -58,8 +59,7 @@ async def upload_image(
             get_images_directory(), os.path.basename(new_filename)
         )
 
-        with open(image_path, "wb") as f:
-            f.write(await file.read())
+        await save_upload_file(file, image_path, MAX_IMAGE_UPLOAD_SIZE_MB)
 
         image_asset = ImageAsset(path=image_path, is_uploaded=True)
 
@@ -67,6 +67,8 @@ async def upload_image(
         await sql_session.commit()
 
         return image_asset
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload image: {str(e)}")
 
@@ -18,6 +18,7 @@ from models.sse_response import (
 )
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.database import get_async_session
+from services.document_context_service import DocumentContextService
 from services.documents_loader import DocumentsLoader
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from utils.ppt_utils import get_presentation_title_from_outlines
@@ -47,7 +48,9 @@ async def stream_outlines(
             await documents_loader.load_documents(temp_dir)
             documents = documents_loader.documents
             if documents:
-                additional_context = "\n\n".join(documents)
+                additional_context = (
+                    await DocumentContextService().get_summarized_context(documents)
+                )
 
         presentation_outlines_text = ""
 
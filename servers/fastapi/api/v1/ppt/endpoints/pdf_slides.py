@@ -1,15 +1,18 @@
 import os
 import shutil
 import tempfile
+import asyncio
 import subprocess
 from typing import List, Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from pydantic import BaseModel
 
 from services.documents_loader import DocumentsLoader
 from utils.asset_directory_utils import get_images_directory
 import uuid
-from constants.documents import PDF_MIME_TYPES
+from constants.documents import MAX_UPLOAD_SIZE_MB, PDF_MIME_TYPES
+from utils.file_utils import save_upload_file
+from utils.parsers import parse_page_ranges
 
 
 PDF_SLIDES_ROUTER = APIRouter(prefix="/pdf-slides", tags=["PDF Slides"])
@@ -28,14 +31,17 @@ class PdfSlidesResponse(BaseModel):
 
 @PDF_SLIDES_ROUTER.post("/process", response_model=PdfSlidesResponse)
 async def process_pdf_slides(
-    pdf_file: UploadFile = File(..., description="PDF file to process")
+    pdf_file: UploadFile = File(..., description="PDF file to process"),
+    pages: Optional[str] = Form(
+        None, description="Optional page ranges to process, e.g. 1-3,5"
+    ),
 ):
     """
     Process a PDF file to extract slide screenshots.
 
     This endpoint:
     1. Validates the uploaded PDF file
-    2. Uses ImageMagick to convert PDF pages to PNG images
+    2. Renders the PDF pages (or the requested page ranges) to images in parallel
     3. Returns screenshot URLs for each slide/page
 
     Note: Font installation is not needed since PDFs already have fonts embedded.
@@ -57,19 +63,24 @@ async def process_pdf_slides(
             status_code=400,
             detail="PDF file exceeded max upload size of 100 MB",
         )
+    try:
+        page_ranges = parse_page_ranges(pages)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid page ranges: {pages}")
 
     # Create temporary directory for processing
     with tempfile.TemporaryDirectory() as temp_dir:
         try:
             # Save uploaded PDF file
             pdf_path = os.path.join(temp_dir, "presentation.pdf")
-            with open(pdf_path, "wb") as f:
-                pdf_content = await pdf_file.read()
-                f.write(pdf_content)
+            await save_upload_file(pdf_file, pdf_path, MAX_UPLOAD_SIZE_MB)
 
-            # Generate screenshots from PDF using ImageMagick
+            # Generate screenshots from PDF pages
+            page_numbers = await asyncio.to_thread(
+                DocumentsLoader.get_page_numbers_from_ranges, pdf_path, page_ranges
+            )
             screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
-                pdf_path, temp_dir
+                pdf_path, temp_dir, page_numbers
             )
             print(f"Generated {len(screenshot_paths)} PDF screenshots")
 
@@ -81,9 +92,11 @@ async def process_pdf_slides(
 
             slides_data = []
 
-            for i, screenshot_path in enumerate(screenshot_paths, 1):
+            slide_numbers = page_numbers or range(1, len(screenshot_paths) + 1)
+            for i, screenshot_path in zip(slide_numbers, screenshot_paths):
                 # Move screenshot to permanent location
-                screenshot_filename = f"slide_{i}.png"
+                extension = os.path.splitext(screenshot_path)[1]
+                screenshot_filename = f"slide_{i}{extension}"
                 permanent_screenshot_path = os.path.join(
                     presentation_images_dir, screenshot_filename
                 )
@@ -109,6 +122,8 @@ async def process_pdf_slides(
                 success=True, slides=slides_data, total_slides=len(slides_data)
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Error processing PDF slides: {str(e)}")
             raise HTTPException(
@@ -5,17 +5,24 @@ import tempfile
 import subprocess
 import uuid
 from typing import List, Optional, Dict
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from pydantic import BaseModel
-import aiohttp
 import asyncio
-import xml.etree.ElementTree as ET
+from lxml import etree
 import re
 
 from services.documents_loader import DocumentsLoader
+from services.google_fonts_service import GOOGLE_FONTS_SERVICE, get_google_fonts_url
+from services.libreoffice_service import LIBREOFFICE_SERVICE
 from utils.asset_directory_utils import get_images_directory
 import uuid
-from constants.documents import POWERPOINT_TYPES
+from constants.documents import (
+    MAX_FONT_UPLOAD_SIZE_MB,
+    MAX_UPLOAD_SIZE_MB,
+    POWERPOINT_TYPES,
+)
+from utils.file_utils import save_upload_file
+from utils.parsers import parse_page_ranges
 
 
 PPTX_SLIDES_ROUTER = APIRouter(prefix="/pptx-slides", tags=["PPTX Slides"])
@@ -35,6 +42,11 @@ class FontAnalysisResult(BaseModel):
     not_supported_fonts: List[str]  # ["Custom Font Name"]
 
 
+class PptxSlideXml(BaseModel):
+    xml_content: str
+    raw_fonts: List[str]
+
+
 class PptxSlidesResponse(BaseModel):
     success: bool
     slides: List[SlideData]
@@ -144,117 +156,34 @@ def normalize_font_family_name(raw_name: str) -> str:
     return normalized
 
 
-def extract_fonts_from_oxml(xml_content: str) -> List[str]:
-    """
-    Extract font names from OXML content.
+# Theme placeholders resolved by the slide master rather than real font families
+_THEME_FONTS = {"+mn-lt", "+mj-lt", "+mn-ea", "+mj-ea", "+mn-cs", "+mj-cs", ""}
 
-    Args:
-        xml_content: OXML content as string
 
-    Returns:
-        List of unique font names found in the OXML
+def extract_fonts_from_root(root: etree._Element) -> List[str]:
     """
-    fonts = set()
+    Extract font names from parsed OXML.
 
-    try:
-        # Parse the XML content
-        root = ET.fromstring(xml_content)
-
-        # Define namespaces commonly used in OXML
-        namespaces = {
-            "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
-            "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
-            "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-        }
-
-        # Search for font references in various OXML elements
-        # Look for latin fonts
-        for font_elem in root.findall(".//a:latin", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for east asian fonts
-        for font_elem in root.findall(".//a:ea", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for complex script fonts
-        for font_elem in root.findall(".//a:cs", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for font references in theme elements
-        for font_elem in root.findall(".//a:font", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for rPr (run properties) font references
-        for rpr_elem in root.findall(".//a:rPr", namespaces):
-            for font_elem in rpr_elem.findall(".//a:latin", namespaces):
-                if "typeface" in font_elem.attrib:
-                    fonts.add(font_elem.attrib["typeface"])
-
-        # Also search without namespace prefix for compatibility
-        for font_elem in root.findall(".//latin"):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Regex fallback for fonts that might be missed
-        font_pattern = r'typeface="([^"]+)"'
-        regex_fonts = re.findall(font_pattern, xml_content)
-        fonts.update(regex_fonts)
-
-        # Filter out system fonts and empty values
-        system_fonts = {"+mn-lt", "+mj-lt", "+mn-ea", "+mj-ea", "+mn-cs", "+mj-cs", ""}
-        fonts = {font for font in fonts if font not in system_fonts and font.strip()}
-
-        return list(fonts)
-
-    except Exception as e:
-        print(f"Error extracting fonts from OXML: {e}")
-        return []
-
-
-async def check_google_font_availability(font_name: str) -> bool:
+    Every font reference (a:latin, a:ea, a:cs, a:font, a:sym and their rPr variants)
+    carries the family in a typeface attribute, so a single attribute scan finds them all.
     """
-    Check if a font is available in Google Fonts.
+    fonts = {str(typeface) for typeface in root.xpath("//@typeface")}
+    return [font for font in fonts if font not in _THEME_FONTS and font.strip()]
 
-    Args:
-        font_name: Name of the font to check
 
-    Returns:
-        True if font is available in Google Fonts, False otherwise
-    """
-    try:
-        formatted_name = font_name.replace(" ", "+")
-        url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.head(
-                url, timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                return response.status == 200
-
-    except Exception as e:
-        print(f"Error checking Google Font availability for {font_name}: {e}")
-        return False
-
-
-async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResult:
+async def analyze_fonts_in_all_slides(
+    slides: List[PptxSlideXml],
+) -> FontAnalysisResult:
     """
     Analyze fonts across all slides and determine Google Fonts availability.
 
     Args:
-        slide_xmls: List of OXML content strings from all slides
+        slides: Parsed slides of the presentation
 
     Returns:
         FontAnalysisResult with supported and unsupported fonts
     """
-    # Extract fonts from all slides
-    raw_fonts = set()
-    for xml_content in slide_xmls:
-        slide_fonts = extract_fonts_from_oxml(xml_content)
-        raw_fonts.update(slide_fonts)
+    raw_fonts = get_raw_fonts(slides)
 
     # Normalize to root families (e.g., "Montserrat Italic" -> "Montserrat")
     normalized_fonts = {normalize_font_family_name(f) for f in raw_fonts}
@@ -264,19 +193,16 @@ async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResu
     if not normalized_fonts:
         return FontAnalysisResult(internally_supported_fonts=[], not_supported_fonts=[])
 
-    # Check each normalized font's availability in Google Fonts concurrently
-    tasks = [check_google_font_availability(font) for font in normalized_fonts]
-    results = await asyncio.gather(*tasks)
+    # Check availability in Google Fonts, bundled and cached families skip the network
+    availability = await GOOGLE_FONTS_SERVICE.check_availability(normalized_fonts)
 
     internally_supported_fonts = []
     not_supported_fonts = []
 
-    for font, is_available in zip(normalized_fonts, results):
+    for font, is_available in availability.items():
         if is_available:
-            formatted_name = font.replace(" ", "+")
-            google_fonts_url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
             internally_supported_fonts.append(
-                {"name": font, "google_fonts_url": google_fonts_url}
+                {"name": font, "google_fonts_url": get_google_fonts_url(font)}
             )
         else:
             not_supported_fonts.append(font)
@@ -290,6 +216,9 @@ async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResu
 async def process_pptx_slides(
     pptx_file: UploadFile = File(..., description="PPTX file to process"),
     fonts: Optional[List[UploadFile]] = File(None, description="Optional font files"),
+    pages: Optional[str] = Form(
+        None, description="Optional slide ranges to process, e.g. 1-3,5"
+    ),
 ):
     """
     Process a PPTX file to extract slide screenshots and XML content.
@@ -318,34 +247,45 @@ async def process_pptx_slides(
             status_code=400,
             detail="PPTX file exceeded max upload size of 100 MB",
         )
+    try:
+        page_ranges = parse_page_ranges(pages)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid slide ranges: {pages}")
 
     # Create temporary directory for processing
     with tempfile.TemporaryDirectory() as temp_dir:
         if True:
             # Save uploaded PPTX file
             pptx_path = os.path.join(temp_dir, "presentation.pptx")
-            with open(pptx_path, "wb") as f:
-                pptx_content = await pptx_file.read()
-                f.write(pptx_content)
+            await save_upload_file(pptx_file, pptx_path, MAX_UPLOAD_SIZE_MB)
 
             # Install fonts if provided
             if fonts:
                 await _install_fonts(fonts, temp_dir)
 
-            # Extract slide XMLs from PPTX
-            slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+            # Read and parse slide XMLs from PPTX once, in memory
+            slides = await asyncio.to_thread(_load_slide_xmls, pptx_path)
 
             # Convert PPTX to PDF
-            pdf_path = await _convert_pptx_to_pdf(pptx_path, temp_dir)
+            pdf_path = await _convert_pptx_to_pdf(
+                pptx_path,
+                temp_dir,
+                _get_font_aliases(get_raw_fonts(slides)),
+                fonts_installed=bool(fonts),
+            )
 
-            # Generate screenshots using LibreOffice
+            # Generate screenshots from the converted PDF pages, not cached as
+            # LibreOffice stamps every conversion with a new creation date
+            page_numbers = await asyncio.to_thread(
+                DocumentsLoader.get_page_numbers_from_ranges, pdf_path, page_ranges
+            )
             screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
-                pdf_path, temp_dir
+                pdf_path, temp_dir, page_numbers, use_cache=False
             )
             print(f"Screenshot paths: {screenshot_paths}")
 
             # Analyze fonts across all slides
-            font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
+            font_analysis = await analyze_fonts_in_all_slides(slides)
             print(
                 f"Font analysis completed: {len(font_analysis.internally_supported_fonts)} supported, {len(font_analysis.not_supported_fonts)} not supported"
             )
@@ -358,11 +298,15 @@ async def process_pptx_slides(
 
             slides_data = []
 
-            for i, (xml_content, screenshot_path) in enumerate(
-                zip(slide_xmls, screenshot_paths), 1
-            ):
+            slide_numbers = page_numbers or range(1, len(screenshot_paths) + 1)
+            for i, screenshot_path in zip(slide_numbers, screenshot_paths):
+                if i > len(slides):
+                    break
+                slide = slides[i - 1]
+
                 # Move screenshot to permanent location
-                screenshot_filename = f"slide_{i}.png"
+                extension = os.path.splitext(screenshot_path)[1]
+                screenshot_filename = f"slide_{i}{extension}"
                 permanent_screenshot_path = os.path.join(
                     presentation_images_dir, screenshot_filename
                 )
@@ -381,16 +325,15 @@ async def process_pptx_slides(
                     screenshot_url = "/static/images/placeholder.jpg"
 
                 # Compute normalized fonts for this slide
-                raw_slide_fonts = extract_fonts_from_oxml(xml_content)
                 normalized_fonts = sorted(
-                    {normalize_font_family_name(f) for f in raw_slide_fonts if f}
+                    {normalize_font_family_name(f) for f in slide.raw_fonts}
                 )
 
                 slides_data.append(
                     SlideData(
                         slide_number=i,
                         screenshot_url=screenshot_url,
-                        xml_content=xml_content,
+                        xml_content=slide.xml_content,
                         normalized_fonts=normalized_fonts,
                     )
                 )
@@ -424,15 +367,13 @@ async def process_pptx_fonts(
     with tempfile.TemporaryDirectory() as temp_dir:
         # Save uploaded PPTX file
         pptx_path = os.path.join(temp_dir, "presentation.pptx")
-        with open(pptx_path, "wb") as f:
-            pptx_content = await pptx_file.read()
-            f.write(pptx_content)
+        await save_upload_file(pptx_file, pptx_path, MAX_UPLOAD_SIZE_MB)
 
-        # Extract slide XMLs from PPTX
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+        # Read and parse slide XMLs from PPTX
+        slides = await asyncio.to_thread(_load_slide_xmls, pptx_path)
 
         # Analyze fonts across all slides (same logic as in /pptx-slides)
-        font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
+        font_analysis = await analyze_fonts_in_all_slides(slides)
 
         return PptxFontsResponse(
             success=True,
@@ -440,42 +381,14 @@ async def process_pptx_fonts(
         )
 
 
-def _create_font_alias_config(raw_fonts: List[str]) -> str:
-    """Create a temporary fontconfig configuration that aliases variant family names to normalized root families.
-    Returns the path to the config file.
-    """
-    # Build mapping from raw -> normalized where different
+def _get_font_aliases(raw_fonts: List[str]) -> Dict[str, str]:
+    """Map variant family names to their normalized root families where they differ."""
     mappings: Dict[str, str] = {}
     for f in raw_fonts:
         normalized = normalize_font_family_name(f)
         if normalized and normalized != f:
             mappings[f] = normalized
-    # Create config only if we have mappings
-    fd, fonts_conf_path = tempfile.mkstemp(prefix="fonts_alias_", suffix=".conf")
-    os.close(fd)
-    with open(fonts_conf_path, "w", encoding="utf-8") as cfg:
-        cfg.write(
-            """<?xml version='1.0'?>
-<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">
-<fontconfig>
-  <include>/etc/fonts/fonts.conf</include>
-"""
-        )
-        for src, dst in mappings.items():
-            cfg.write(
-                f"""
-  <match target="pattern">
-    <test name="family" compare="eq">
-      <string>{src}</string>
-    </test>
-    <edit name="family" mode="assign" binding="strong">
-      <string>{dst}</string>
-    </edit>
-  </match>
-"""
-            )
-        cfg.write("\n</fontconfig>\n")
-    return fonts_conf_path
+    return mappings
 
 
 async def _install_fonts(fonts: List[UploadFile], temp_dir: str) -> None:
@@ -486,9 +399,7 @@ async def _install_fonts(fonts: List[UploadFile], temp_dir: str) -> None:
     for font_file in fonts:
         # Save font file
         font_path = os.path.join(fonts_dir, font_file.filename)
-        with open(font_path, "wb") as f:
-            font_content = await font_file.read()
-            f.write(font_content)
+        await save_upload_file(font_file, font_path, MAX_FONT_UPLOAD_SIZE_MB)
 
         # Install font (copy to system fonts directory)
         try:
@@ -507,103 +418,78 @@ async def _install_fonts(fonts: List[UploadFile], temp_dir: str) -> None:
         print(f"Warning: Failed to refresh font cache: {e}")
 
 
-def _extract_slide_xmls(pptx_path: str, temp_dir: str) -> List[str]:
-    """Extract slide XML content from PPTX file."""
-    slide_xmls = []
-    extract_dir = os.path.join(temp_dir, "pptx_extract")
-
-    try:
-        # Unzip PPTX file
-        with zipfile.ZipFile(pptx_path, "r") as zip_ref:
-            zip_ref.extractall(extract_dir)
-
-        # Look for slides in ppt/slides/ directory
-        slides_dir = os.path.join(extract_dir, "ppt", "slides")
+_SLIDE_PART_PATTERN = re.compile(r"^ppt/slides/slide(\d+)\.xml$")
 
-        if not os.path.exists(slides_dir):
-            raise Exception("No slides directory found in PPTX file")
 
-        # Get all slide XML files and sort them numerically
-        slide_files = [
-            f
-            for f in os.listdir(slides_dir)
-            if f.startswith("slide") and f.endswith(".xml")
-        ]
-        slide_files.sort(key=lambda x: int(x.replace("slide", "").replace(".xml", "")))
+def get_raw_fonts(slides: List[PptxSlideXml]) -> List[str]:
+    """Unique font families referenced across all slides."""
+    return list({font for slide in slides for font in slide.raw_fonts})
 
-        # Read XML content from each slide
-        for slide_file in slide_files:
-            slide_path = os.path.join(slides_dir, slide_file)
-            with open(slide_path, "r", encoding="utf-8") as f:
-                slide_xmls.append(f.read())
 
-        return slide_xmls
+def _load_slide_xmls(pptx_path: str) -> List[PptxSlideXml]:
+    """Read slide XMLs from the PPTX without extracting it and parse each one once."""
+    try:
+        with zipfile.ZipFile(pptx_path, "r") as zip_ref:
+            slide_parts = []
+            for name in zip_ref.namelist():
+                match = _SLIDE_PART_PATTERN.match(name)
+                if match:
+                    slide_parts.append((int(match.group(1)), name))
+            if not slide_parts:
+                raise Exception("No slides directory found in PPTX file")
+
+            slides = []
+            for _, name in sorted(slide_parts):
+                xml_bytes = zip_ref.read(name)
+                try:
+                    raw_fonts = extract_fonts_from_root(etree.fromstring(xml_bytes))
+                except etree.XMLSyntaxError as e:
+                    print(f"Error extracting fonts from OXML: {e}")
+                    raw_fonts = []
+                slides.append(
+                    PptxSlideXml(
+                        xml_content=xml_bytes.decode("utf-8"), raw_fonts=raw_fonts
+                    )
+                )
+            return slides
 
     except Exception as e:
         raise Exception(f"Failed to extract slide XMLs: {str(e)}")
 
 
-async def _convert_pptx_to_pdf(pptx_path: str, temp_dir: str) -> str:
-    """Generate PNG screenshots of PPTX slides using LibreOffice + ImageMagick."""
+async def _convert_pptx_to_pdf(
+    pptx_path: str,
+    temp_dir: str,
+    font_aliases: Dict[str, str],
+    fonts_installed: bool = False,
+) -> str:
+    """
+    Convert the PPTX to PDF on the persistent LibreOffice instances.
+    font_aliases force variant families to resolve to normalized root families.
+    """
     screenshots_dir = os.path.join(temp_dir, "screenshots")
     os.makedirs(screenshots_dir, exist_ok=True)
 
     try:
-        # First, get the number of slides by extracting XMLs
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
-        slide_count = len(slide_xmls)
-
-        # Build font alias config to force variant families to resolve to normalized root families
-        raw_fonts: List[str] = []
-        for xml in slide_xmls:
-            raw_fonts.extend(extract_fonts_from_oxml(xml))
-        raw_fonts = list({f for f in raw_fonts if f})
-        fonts_conf_path = _create_font_alias_config(raw_fonts)
-        env = os.environ.copy()
-        env["FONTCONFIG_FILE"] = fonts_conf_path
-
-        print(f"Found {slide_count} slides in presentation")
-
         # Step 1: Convert PPTX to PDF using LibreOffice
         print("Starting LibreOffice PDF conversion...")
-        pdf_filename = "temp_presentation.pdf"
-        pdf_path = os.path.join(screenshots_dir, pdf_filename)
-
         try:
-            result = subprocess.run(
-                [
-                    "libreoffice",
-                    "--headless",
-                    "--convert-to",
-                    "pdf",
-                    "--outdir",
-                    screenshots_dir,
-                    pptx_path,
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-                timeout=500,
-                env=env,
+            pdf_path = await LIBREOFFICE_SERVICE.convert_to_pdf(
+                pptx_path,
+                screenshots_dir,
+                font_aliases=font_aliases,
+                fonts_installed=fonts_installed,
+            )
+        except asyncio.TimeoutError:
+            raise Exception(
+                f"LibreOffice PDF conversion timed out after {LIBREOFFICE_SERVICE.timeout} seconds"
             )
 
-            print(f"LibreOffice PDF conversion output: {result.stdout}")
-            if result.stderr:
-                print(f"LibreOffice PDF conversion warnings: {result.stderr}")
-        except subprocess.TimeoutExpired:
-            raise Exception("LibreOffice PDF conversion timed out after 120 seconds")
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if e.stderr else str(e)
-            raise Exception(f"LibreOffice PDF conversion failed: {error_msg}")
-
-        # Find the generated PDF file (LibreOffice uses original filename)
-        pdf_files = [f for f in os.listdir(screenshots_dir) if f.endswith(".pdf")]
-        if not pdf_files:
+        if not os.path.exists(pdf_path):
             raise Exception("LibreOffice failed to generate PDF file")
 
-        actual_pdf_path = os.path.join(screenshots_dir, pdf_files[0])
-        print(f"Generated PDF: {actual_pdf_path}")
-        return actual_pdf_path
+        print(f"Generated PDF: {pdf_path}")
+        return pdf_path
 
     except Exception as e:
         # Re-raise the specific exceptions we've already handled
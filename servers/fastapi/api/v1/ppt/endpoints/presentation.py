@@ -5,19 +5,31 @@ import math
 import os
 import random
 import traceback
-from typing import Annotated, List, Literal, Optional, Tuple
+from typing import Annotated, Dict, List, Literal, Optional, Tuple
 import dirtyjson
 import aiohttp
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    HTTPException,
+    Path,
+    Response,
+)
 from fastapi.responses import StreamingResponse
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
+from constants.documents import POWERPOINT_TYPES
 from constants.presentation import DEFAULT_TEMPLATES
 from enums.webhook_event import WebhookEvent
 from models.api_error_model import APIErrorModel
 from models.generate_presentation_request import GeneratePresentationRequest
-from models.presentation_and_path import PresentationPathAndEditPath
+from models.presentation_and_path import (
+    PresentationPathAndEditPath,
+    PresentationPathsAndEditPath,
+)
 from models.presentation_from_template import EditPresentationRequest
 from models.presentation_outline_model import (
     PresentationOutlineModel,
@@ -33,23 +45,27 @@ from models.presentation_with_slides import (
 )
 from models.sql.template import TemplateModel
 
+from services.document_context_service import DocumentContextService
+from services.document_index_service import build_document_index
 from services.documents_loader import DocumentsLoader
 from services.webhook_service import WebhookService
 from utils.get_layout_by_name import get_layout_by_name
 from services.image_generation_service import ImageGenerationService
 from utils.dict_utils import deep_update
-from utils.export_utils import export_presentation
+from utils.export_utils import export_presentation, get_pptx_model, stream_pptx
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from models.sql.slide import SlideModel
 from models.sse_response import SSECompleteResponse, SSEErrorResponse, SSEResponse
 
-from services.database import get_async_session
+from services.database import async_session_maker, get_async_session
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.concurrent_service import CONCURRENT_SERVICE
 
 
 get_sql_session = get_async_session
 from models.sql.presentation import PresentationModel
+from services.export_cache_service import EXPORT_CACHE_SERVICE
+from services.pptx_export_service import PPTX_EXPORT_SERVICE
 from services.pptx_presentation_creator import PptxPresentationCreator
 from models.sql.async_presentation_generation_status import (
     AsyncPresentationGenerationTaskModel,
@@ -72,11 +88,6 @@ from utils.process_slides import (
 import uuid
 
 
-async def generate_document_summary(*args, **kwargs) -> str:
-    """Provide a placeholder summary helper used by tests."""
-    return "summary"
-
-
 PRESENTATION_ROUTER = APIRouter(prefix="/presentation", tags=["Presentation"])
 
 
@@ -133,6 +144,7 @@ async def delete_presentation(
 
     await sql_session.delete(presentation)
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(id)
 
 
 @PRESENTATION_ROUTER.post("/create", response_model=PresentationModel)
@@ -289,6 +301,23 @@ async def stream_presentation(
         layout = presentation.get_layout()
         outline = presentation.get_presentation_outline()
 
+        slide_document_contexts = [None] * len(structure.slides)
+        document_index = None
+        if presentation.file_paths:
+            # Parsed documents are cached, so this reuses the outline step's parse
+            documents_loader = DocumentsLoader(file_paths=presentation.file_paths)
+            try:
+                await documents_loader.load_documents()
+                document_index = await build_document_index(
+                    documents_loader.documents
+                )
+            except HTTPException as e:
+                print(f"Slides will be generated without documents: {e.detail}")
+        if document_index:
+            slide_document_contexts = await document_index.get_slide_contexts(
+                [outline.slides[i].content for i in range(len(structure.slides))]
+            )
+
         # These tasks will be gathered and awaited after all slides are generated
         async_assets_generation_tasks = []
 
@@ -308,6 +337,7 @@ async def stream_presentation(
                     presentation.tone,
                     presentation.verbosity,
                     presentation.instructions,
+                    slide_document_contexts[i],
                 )
             except HTTPException as e:
                 yield SSEErrorResponse(detail=e.detail).to_string()
@@ -403,6 +433,7 @@ async def update_presentation(
         sql_session.add_all(slides)
 
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(presentation.id)
 
     return PresentationWithSlides(
         **presentation.model_dump(),
@@ -413,21 +444,52 @@ async def update_presentation(
 @PRESENTATION_ROUTER.post("/export/pptx", response_model=str)
 async def export_presentation_as_pptx(
     pptx_model: Annotated[PptxPresentationModel, Body()],
+    response: Response,
 ):
     temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
 
     pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-    await pptx_creator.create_ppt()
 
     export_directory = get_exports_directory()
     pptx_path = os.path.join(
         export_directory, f"{pptx_model.name or uuid.uuid4()}.pptx"
     )
-    pptx_creator.save(pptx_path)
+    timings = await PPTX_EXPORT_SERVICE.export(pptx_creator, pptx_path)
+    response.headers["Server-Timing"] = timings.server_timing
 
     return pptx_path
 
 
+@PRESENTATION_ROUTER.post(
+    "/export/pptx/download",
+    response_class=StreamingResponse,
+    responses={200: {"content": {POWERPOINT_TYPES[0]: {}}}},
+)
+async def download_presentation_as_pptx(
+    pptx_model: Annotated[PptxPresentationModel, Body()],
+    persist: bool = False,
+):
+    return await stream_pptx(pptx_model, pptx_model.name, persist)
+
+
+@PRESENTATION_ROUTER.get(
+    "/download/{id}",
+    response_class=StreamingResponse,
+    responses={200: {"content": {POWERPOINT_TYPES[0]: {}}}},
+)
+async def download_presentation(
+    id: uuid.UUID,
+    persist: bool = False,
+    sql_session: AsyncSession = Depends(get_sql_session),
+):
+    presentation = await sql_session.get(PresentationModel, id)
+    if not presentation:
+        raise HTTPException(status_code=404, detail="Presentation not found")
+
+    pptx_model = await get_pptx_model(id)
+    return await stream_pptx(pptx_model, presentation.title, persist)
+
+
 @PRESENTATION_ROUTER.post("/export", response_model=PresentationPathAndEditPath)
 async def export_presentation_as_pptx_or_pdf(
     id: Annotated[uuid.UUID, Body(description="Presentation ID to export")],
@@ -441,18 +503,160 @@ async def export_presentation_as_pptx_or_pdf(
     if not presentation:
         raise HTTPException(status_code=404, detail="Presentation not found")
 
-    presentation_and_path = await export_presentation(
-        id,
-        presentation.title or str(uuid.uuid4()),
-        export_as,
-    )
+    paths = await export_presentation_in_formats(presentation, [export_as], sql_session)
 
     return PresentationPathAndEditPath(
-        **presentation_and_path.model_dump(),
+        presentation_id=id,
+        path=paths[export_as],
+        edit_path=f"/presentation?id={id}",
+    )
+
+
+async def export_presentation_in_formats(
+    presentation: PresentationModel,
+    formats: List[Literal["pptx", "pdf"]],
+    sql_session: AsyncSession,
+) -> Dict[str, str]:
+    """Exports the presentation in every format concurrently, reusing cached exports"""
+    slides = await sql_session.scalars(
+        select(SlideModel).where(SlideModel.presentation == presentation.id)
+    )
+    slides = slides.all()
+    title = presentation.title or str(uuid.uuid4())
+
+    async def export_in_format(export_as: Literal["pptx", "pdf"]) -> str:
+        presentation_and_path = await EXPORT_CACHE_SERVICE.get_or_export(
+            presentation,
+            slides,
+            export_as,
+            lambda: export_presentation(presentation.id, title, export_as),
+        )
+        return presentation_and_path.path
+
+    paths = await asyncio.gather(*[export_in_format(each) for each in formats])
+    return dict(zip(formats, paths))
+
+
+async def get_presentation_for_multi_format_export(
+    id: uuid.UUID,
+    formats: List[Literal["pptx", "pdf"]],
+    sql_session: AsyncSession,
+) -> PresentationModel:
+    if not formats:
+        raise HTTPException(status_code=400, detail="No export format provided")
+
+    presentation = await sql_session.get(PresentationModel, id)
+    if not presentation:
+        raise HTTPException(status_code=404, detail="Presentation not found")
+    return presentation
+
+
+@PRESENTATION_ROUTER.post(
+    "/export/multiple", response_model=PresentationPathsAndEditPath
+)
+async def export_presentation_in_multiple_formats(
+    id: Annotated[uuid.UUID, Body(description="Presentation ID to export")],
+    export_as: Annotated[
+        List[Literal["pptx", "pdf"]],
+        Body(description="Formats to export the presentation as"),
+    ] = ["pptx", "pdf"],
+    sql_session: AsyncSession = Depends(get_sql_session),
+):
+    formats = list(dict.fromkeys(export_as))
+    presentation = await get_presentation_for_multi_format_export(
+        id, formats, sql_session
+    )
+    paths = await export_presentation_in_formats(presentation, formats, sql_session)
+
+    return PresentationPathsAndEditPath(
+        presentation_id=id,
+        paths=paths,
         edit_path=f"/presentation?id={id}",
     )
 
 
+async def export_presentation_in_multiple_formats_handler(
+    id: uuid.UUID,
+    formats: List[Literal["pptx", "pdf"]],
+    task_id: str,
+):
+    # The request session is closed once the response is sent
+    async with async_session_maker() as sql_session:
+        async_status = await sql_session.get(
+            AsyncPresentationGenerationTaskModel, task_id
+        )
+        try:
+            presentation = await sql_session.get(PresentationModel, id)
+
+            async_status.status = "processing"
+            async_status.message = f"Exporting presentation as {', '.join(formats)}"
+            async_status.updated_at = datetime.now()
+            sql_session.add(async_status)
+            await sql_session.commit()
+
+            paths = await export_presentation_in_formats(
+                presentation, formats, sql_session
+            )
+            response = PresentationPathsAndEditPath(
+                presentation_id=id,
+                paths=paths,
+                edit_path=f"/presentation?id={id}",
+            )
+
+            async_status.status = "completed"
+            async_status.message = "Presentation export completed"
+            async_status.data = response.model_dump(mode="json")
+            async_status.updated_at = datetime.now()
+            sql_session.add(async_status)
+            await sql_session.commit()
+
+        except Exception as e:
+            if not isinstance(e, HTTPException):
+                traceback.print_exc()
+                e = HTTPException(status_code=500, detail="Presentation export failed")
+
+            async_status.status = "error"
+            async_status.message = "Presentation export failed"
+            async_status.error = APIErrorModel.from_exception(e).model_dump(
+                mode="json"
+            )
+            async_status.updated_at = datetime.now()
+            sql_session.add(async_status)
+            await sql_session.commit()
+
+
+@PRESENTATION_ROUTER.post(
+    "/export/multiple/async", response_model=AsyncPresentationGenerationTaskModel
+)
+async def export_presentation_in_multiple_formats_async(
+    id: Annotated[uuid.UUID, Body(description="Presentation ID to export")],
+    background_tasks: BackgroundTasks,
+    export_as: Annotated[
+        List[Literal["pptx", "pdf"]],
+        Body(description="Formats to export the presentation as"),
+    ] = ["pptx", "pdf"],
+    sql_session: AsyncSession = Depends(get_sql_session),
+):
+    formats = list(dict.fromkeys(export_as))
+    await get_presentation_for_multi_format_export(id, formats, sql_session)
+
+    async_status = AsyncPresentationGenerationTaskModel(
+        status="pending",
+        message="Queued for export",
+        data=None,
+    )
+    sql_session.add(async_status)
+    await sql_session.commit()
+
+    background_tasks.add_task(
+        export_presentation_in_multiple_formats_handler,
+        id,
+        formats,
+        async_status.id,
+    )
+    return async_status
+
+
 async def check_if_api_request_is_valid(
     request: GeneratePresentationRequest,
     sql_session: AsyncSession = Depends(get_sql_session),
@@ -504,6 +708,7 @@ async def generate_presentation_handler(
 ):
     try:
         using_slides_markdown = False
+        document_index = None
 
         if request.slides_markdown:
             using_slides_markdown = True
@@ -520,11 +725,18 @@ async def generate_presentation_handler(
                 await sql_session.commit()
 
             if request.files:
-                documents_loader = DocumentsLoader(file_paths=request.files)
+                documents_loader = DocumentsLoader(
+                    file_paths=request.files, pdf_engine=request.pdf_engine
+                )
                 await documents_loader.load_documents()
                 documents = documents_loader.documents
                 if documents:
-                    additional_context = "\n\n".join(documents)
+                    # Slides retrieve from the full documents, not the outline context
+                    document_index = await build_document_index(documents)
+
+                    additional_context = (
+                        await DocumentContextService().get_summarized_context(documents)
+                    )
 
             # Finding number of slides to generate by considering table of contents
             n_slides_to_generate = request.n_slides
@@ -688,6 +900,15 @@ async def generate_presentation_handler(
         slide_layout_indices = presentation_structure.slides
         slide_layouts = [layout_model.slides[idx] for idx in slide_layout_indices]
 
+        slide_document_contexts = [None] * len(slide_layouts)
+        if document_index:
+            slide_document_contexts = await document_index.get_slide_contexts(
+                [
+                    presentation_outlines.slides[i].content
+                    for i in range(len(slide_layouts))
+                ]
+            )
+
         # Schedule slide content generation and asset fetching in batches of 10
         batch_size = 10
         for start in range(0, len(slide_layouts), batch_size):
@@ -704,6 +925,7 @@ async def generate_presentation_handler(
                     request.tone.value,
                     request.verbosity.value,
                     request.instructions,
+                    slide_document_contexts[i],
                 )
                 for i in range(start, end)
             ]
@@ -909,6 +1131,7 @@ async def edit_presentation_with_new_content(
 
     sql_session.add_all(new_slides)
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(presentation.id)
 
     presentation_and_path = await export_presentation(
         presentation.id, presentation.title or str(uuid.uuid4()), data.export_as
@@ -949,6 +1172,9 @@ async def derive_presentation_from_existing_one(
     sql_session.add(new_presentation)
     sql_session.add_all(new_slides)
     await sql_session.commit()
+    # The derived export shares the title and so the file of the original
+    EXPORT_CACHE_SERVICE.invalidate(presentation.id)
+    EXPORT_CACHE_SERVICE.invalidate(new_presentation.id)
 
     presentation_and_path = await export_presentation(
         new_presentation.id, new_presentation.title or str(uuid.uuid4()), data.export_as
@@ -6,6 +6,7 @@ import uuid
 from models.sql.presentation import PresentationModel
 from models.sql.slide import SlideModel
 from services.database import get_async_session
+from services.export_cache_service import EXPORT_CACHE_SERVICE
 from services.image_generation_service import ImageGenerationService
 from utils.asset_directory_utils import get_images_directory
 from utils.llm_calls.edit_slide import get_edited_slide_content
@@ -58,6 +59,7 @@ async def edit_slide(
     slide.speaker_note = edited_slide_content.get("__speaker_note__", "")
     sql_session.add_all(new_assets)
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(presentation.id)
 
     return slide
 
@@ -86,5 +88,6 @@ async def edit_slide_html(
     sql_session.add(slide)
     slide.html_content = edited_slide_html
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(slide.presentation)
 
     return slide
@@ -15,6 +15,12 @@ JPEG_MIME_TYPES = ["image/jpeg"]
 WEBP_MIME_TYPES = ["image/webp"]
 
 
+MAX_UPLOAD_SIZE_MB = 100
+MAX_IMAGE_UPLOAD_SIZE_MB = 20
+MAX_FONT_UPLOAD_SIZE_MB = 20
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
 UPLOAD_ACCEPTED_FILE_TYPES = (
     PDF_MIME_TYPES + TEXT_MIME_TYPES + POWERPOINT_TYPES + WORD_TYPES
 )
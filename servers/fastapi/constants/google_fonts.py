@@ -0,0 +1,223 @@
+# Widely used Google Fonts families, answered without a network request.
+# Point GOOGLE_FONTS_FAMILIES_FILE at a full family list for offline deployments.
+GOOGLE_FONTS_FAMILIES = frozenset(
+    {
+        "ABeeZee",
+        "Abel",
+        "Abril Fatface",
+        "Acme",
+        "Albert Sans",
+        "Alegreya",
+        "Alegreya Sans",
+        "Alfa Slab One",
+        "Almarai",
+        "Amatic SC",
+        "Anton",
+        "Archivo",
+        "Archivo Black",
+        "Archivo Narrow",
+        "Arimo",
+        "Arvo",
+        "Asap",
+        "Assistant",
+        "Baloo 2",
+        "Barlow",
+        "Barlow Condensed",
+        "Barlow Semi Condensed",
+        "Be Vietnam Pro",
+        "Bebas Neue",
+        "Bitter",
+        "Black Ops One",
+        "Bree Serif",
+        "Bricolage Grotesque",
+        "Bungee",
+        "Cabin",
+        "Cairo",
+        "Cardo",
+        "Catamaran",
+        "Caveat",
+        "Chivo",
+        "Cinzel",
+        "Comfortaa",
+        "Commissioner",
+        "Cormorant",
+        "Cormorant Garamond",
+        "Courgette",
+        "Cousine",
+        "Crete Round",
+        "Crimson Pro",
+        "Crimson Text",
+        "Dancing Script",
+        "DM Mono",
+        "DM Sans",
+        "DM Serif Display",
+        "DM Serif Text",
+        "Domine",
+        "Dosis",
+        "EB Garamond",
+        "Encode Sans",
+        "Epilogue",
+        "Exo",
+        "Exo 2",
+        "Figtree",
+        "Fira Code",
+        "Fira Mono",
+        "Fira Sans",
+        "Fira Sans Condensed",
+        "Fjalla One",
+        "Fraunces",
+        "Fredoka",
+        "Geist",
+        "Geist Mono",
+        "Great Vibes",
+        "Hanken Grotesk",
+        "Heebo",
+        "Hind",
+        "Hind Siliguri",
+        "IBM Plex Mono",
+        "IBM Plex Sans",
+        "IBM Plex Sans Arabic",
+        "IBM Plex Serif",
+        "Inconsolata",
+        "Indie Flower",
+        "Instrument Sans",
+        "Instrument Serif",
+        "Inter",
+        "Inter Tight",
+        "JetBrains Mono",
+        "Josefin Sans",
+        "Josefin Slab",
+        "Jost",
+        "Kalam",
+        "Kanit",
+        "Karla",
+        "Kaushan Script",
+        "Kumbh Sans",
+        "Lato",
+        "League Spartan",
+        "Lexend",
+        "Lexend Deca",
+        "Libre Baskerville",
+        "Libre Franklin",
+        "Lilita One",
+        "Literata",
+        "Lobster",
+        "Lobster Two",
+        "Lora",
+        "M PLUS Rounded 1c",
+        "Manrope",
+        "Marcellus",
+        "Martel",
+        "Maven Pro",
+        "Merriweather",
+        "Merriweather Sans",
+        "Montserrat",
+        "Montserrat Alternates",
+        "Mukta",
+        "Mulish",
+        "Nanum Gothic",
+        "Nanum Myeongjo",
+        "Newsreader",
+        "Noticia Text",
+        "Noto Kufi Arabic",
+        "Noto Naskh Arabic",
+        "Noto Sans",
+        "Noto Sans Arabic",
+        "Noto Sans Bengali",
+        "Noto Sans Devanagari",
+        "Noto Sans Display",
+        "Noto Sans HK",
+        "Noto Sans Hebrew",
+        "Noto Sans JP",
+        "Noto Sans KR",
+        "Noto Sans Mono",
+        "Noto Sans SC",
+        "Noto Sans TC",
+        "Noto Sans Thai",
+        "Noto Serif",
+        "Noto Serif JP",
+        "Noto Serif KR",
+        "Noto Serif SC",
+        "Noto Serif TC",
+        "Nunito",
+        "Nunito Sans",
+        "Old Standard TT",
+        "Onest",
+        "Open Sans",
+        "Orbitron",
+        "Oswald",
+        "Outfit",
+        "Overpass",
+        "Oxygen",
+        "Pacifico",
+        "Passion One",
+        "Patua One",
+        "Permanent Marker",
+        "Philosopher",
+        "Play",
+        "Playfair Display",
+        "Playfair Display SC",
+        "Plus Jakarta Sans",
+        "Poiret One",
+        "Poppins",
+        "Prata",
+        "Prompt",
+        "PT Mono",
+        "PT Sans",
+        "PT Sans Caption",
+        "PT Sans Narrow",
+        "PT Serif",
+        "Public Sans",
+        "Questrial",
+        "Quicksand",
+        "Rajdhani",
+        "Raleway",
+        "Readex Pro",
+        "Red Hat Display",
+        "Red Hat Mono",
+        "Red Hat Text",
+        "Righteous",
+        "Roboto",
+        "Roboto Condensed",
+        "Roboto Flex",
+        "Roboto Mono",
+        "Roboto Serif",
+        "Roboto Slab",
+        "Rubik",
+        "Russo One",
+        "Sacramento",
+        "Saira",
+        "Sarabun",
+        "Satisfy",
+        "Schibsted Grotesk",
+        "Sen",
+        "Shadows Into Light",
+        "Signika",
+        "Sofia Sans",
+        "Sora",
+        "Source Code Pro",
+        "Source Sans 3",
+        "Source Serif 4",
+        "Space Grotesk",
+        "Space Mono",
+        "Spectral",
+        "Staatliches",
+        "Syne",
+        "Tajawal",
+        "Teko",
+        "Tenor Sans",
+        "Tinos",
+        "Titillium Web",
+        "Ubuntu",
+        "Ubuntu Condensed",
+        "Ubuntu Mono",
+        "Unbounded",
+        "Urbanist",
+        "Varela Round",
+        "Vollkorn",
+        "Work Sans",
+        "Yanone Kaffeesatz",
+        "Yeseva One",
+        "Zilla Slab",
+    }
+)
@@ -9,3 +9,23 @@ DEFAULT_ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
 DEFAULT_CUSTOM_MODEL = "glm4.6"
 DEFAULT_CUSTOM_LLM_URL = "https://api.z.ai/api/paas/v4"
 DEFAULT_COGVIEW_MODEL = "CogView-4-250304"
+
+# Token budget for uploaded document context passed to outline generation
+DEFAULT_DOCUMENT_CONTEXT_TOKEN_BUDGET = 16000
+DOCUMENT_CONTEXT_TOKEN_BUDGETS_BY_PROVIDER = {
+    "openai": 64000,
+    "google": 128000,
+    "anthropic": 64000,
+    "ollama": 6000,
+    "custom": 16000,
+    "z.ai": 32000,
+}
+DOCUMENT_CONTEXT_TOKEN_BUDGETS_BY_MODEL = {
+    "gpt-4.1": 128000,
+    "gpt-4.1-mini": 128000,
+    "gpt-4o": 48000,
+    "gpt-4o-mini": 48000,
+    "models/gemini-2.5-flash": 200000,
+    "models/gemini-2.5-pro": 200000,
+    "glm4.6": 64000,
+}
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class PageImageFormat(str, Enum):
+    PNG = "png"
+    WEBP = "webp"
+    JPEG = "jpeg"
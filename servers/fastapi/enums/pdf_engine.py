@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class PdfEngine(str, Enum):
+    AUTO = "auto"
+    DOCLING = "docling"
+    FAST = "fast"
@@ -1,6 +1,7 @@
 from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
+from enums.pdf_engine import PdfEngine
 from enums.tone import Tone
 from enums.verbosity import Verbosity
 
@@ -34,6 +35,10 @@ class GeneratePresentationRequest(BaseModel):
     files: Optional[List[str]] = Field(
         default=None, description="Files to use for the presentation"
     )
+    pdf_engine: PdfEngine = Field(
+        default=PdfEngine.AUTO,
+        description="Engine used to extract text from PDF files. 'auto' uses the fast engine for text-only PDFs and Docling for complex layouts",
+    )
     export_as: Literal["pptx", "pdf"] = Field(
         default="pptx", description="Export format"
     )
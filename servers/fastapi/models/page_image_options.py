@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+from enums.page_image_format import PageImageFormat
+
+
+class PageImageOptions(BaseModel):
+    resolution: int = 150
+    format: PageImageFormat = PageImageFormat.PNG
+    # Only used by lossy formats
+    quality: int = 85
+
+    @property
+    def extension(self) -> str:
+        return "jpg" if self.format == PageImageFormat.JPEG else self.format.value
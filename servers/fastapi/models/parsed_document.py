@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class ParsedDocument(BaseModel):
+    markdown: str
+    engine: str
+    pages: int = 0
+    seconds: float = 0.0
+    saved_init_seconds: float = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        if not self.seconds:
+            return 0.0
+        return self.pages / self.seconds
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class PptxExportTimings(BaseModel):
+    queue_wait_ms: float
+    build_ms: float
+
+    @property
+    def server_timing(self) -> str:
+        return (
+            f"pptx-queue;dur={self.queue_wait_ms:.1f}, "
+            f"pptx-build;dur={self.build_ms:.1f}"
+        )
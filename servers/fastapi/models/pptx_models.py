@@ -145,6 +145,49 @@ class PptxPictureBoxModel(PptxShapeModel):
     picture: PptxPictureModel
 
 
+class PptxPictureTransformModel(BaseModel):
+    width: int
+    height: int
+    clip: bool = True
+    opacity: Optional[float] = None
+    invert: bool = False
+    border_radius: Optional[List[int]] = None
+    shape: Optional[PptxBoxShapeEnum] = None
+    object_fit: Optional[PptxObjectFitModel] = None
+    # Resolution pictures are downscaled to, or clipped and fitted at
+    dpi: int = 150
+    quality: int = 85
+
+    @property
+    def has_effects(self) -> bool:
+        return bool(
+            self.clip
+            or self.border_radius
+            or self.invert
+            or self.opacity
+            or self.object_fit
+            or self.shape
+        )
+
+    @classmethod
+    def from_picture_box(
+        cls, picture_model: PptxPictureBoxModel, dpi: int = 150, quality: int = 85
+    ) -> "PptxPictureTransformModel":
+        """Image processing needed to embed a picture box at its rendered size"""
+        return cls(
+            width=picture_model.position.width,
+            height=picture_model.position.height,
+            clip=picture_model.clip,
+            opacity=picture_model.opacity,
+            invert=picture_model.invert,
+            border_radius=picture_model.border_radius,
+            shape=picture_model.shape,
+            object_fit=picture_model.object_fit,
+            dpi=dpi,
+            quality=quality,
+        )
+
+
 class PptxConnectorModel(PptxShapeModel):
     shape_type: Literal["connector"] = "connector"
     type: MSO_CONNECTOR_TYPE = MSO_CONNECTOR_TYPE.STRAIGHT
@@ -1,3 +1,4 @@
+from typing import Dict
 from pydantic import BaseModel
 import uuid
 
@@ -9,3 +10,9 @@ class PresentationAndPath(BaseModel):
 
 class PresentationPathAndEditPath(PresentationAndPath):
     edit_path: str
+
+
+class PresentationPathsAndEditPath(BaseModel):
+    presentation_id: uuid.UUID
+    paths: Dict[str, str]
+    edit_path: str
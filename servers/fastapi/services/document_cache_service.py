@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils.asset_directory_utils import get_cache_directory
+from utils.file_utils import get_file_hash
+from utils.get_env import get_document_cache_max_mb_env
+from utils.keyed_lock import KeyedLock
+from utils.parsers import parse_int_or_none
+
+# Bump when parser output changes so stale entries are not reused
+DOCUMENT_CACHE_VERSION = 1
+
+# Hashes computed while streaming uploads, so parsing does not read the file again
+MAX_REMEMBERED_FILE_HASHES = 1024
+
+DEFAULT_DOCUMENT_CACHE_MAX_MB = 1000
+
+
+class DocumentCacheService:
+    """
+    On-disk cache of parsed documents keyed by file content hash and parser options.
+    Concurrent requests for the same key wait for a single parse instead of repeating it.
+    Least recently used entries are evicted once the cache grows over DOCUMENT_CACHE_MAX_MB.
+    """
+
+    def __init__(self):
+        self._locks = KeyedLock()
+        self._file_hashes: Dict[str, Tuple[int, int, str]] = {}
+
+    @property
+    def max_bytes(self) -> int:
+        max_mb = (
+            parse_int_or_none(get_document_cache_max_mb_env())
+            or DEFAULT_DOCUMENT_CACHE_MAX_MB
+        )
+        return max_mb * 1024 * 1024
+
+    def get_cache_key(self, file_hash: str, options: dict) -> str:
+        options_json = json.dumps(
+            {"version": DOCUMENT_CACHE_VERSION, **options}, sort_keys=True
+        )
+        options_hash = hashlib.sha256(options_json.encode("utf-8")).hexdigest()
+        return f"{file_hash}_{options_hash[:16]}"
+
+    def get_entry_dir(self, key: str) -> str:
+        return os.path.join(get_cache_directory("documents"), key)
+
+    def remember_file_hash(self, file_path: str, file_hash: str):
+        stat = os.stat(file_path)
+        self._file_hashes.pop(file_path, None)
+        self._file_hashes[file_path] = (stat.st_mtime_ns, stat.st_size, file_hash)
+        if len(self._file_hashes) > MAX_REMEMBERED_FILE_HASHES:
+            self._file_hashes.pop(next(iter(self._file_hashes)))
+
+    def get_file_hash(self, file_path: str) -> str:
+        stat = os.stat(file_path)
+        remembered = self._file_hashes.get(file_path)
+        if remembered and remembered[:2] == (stat.st_mtime_ns, stat.st_size):
+            return remembered[2]
+        return get_file_hash(file_path)
+
+    async def get_cache_key_for_file(self, file_path: str, options: dict) -> str:
+        file_hash = await asyncio.to_thread(self.get_file_hash, file_path)
+        return self.get_cache_key(file_hash, options)
+
+    def touch(self, key: str):
+        """Marks an entry as recently used for eviction"""
+        try:
+            os.utime(self.get_entry_dir(key))
+        except OSError:
+            pass
+
+    def read_markdown(self, key: str) -> Optional[str]:
+        markdown_path = os.path.join(self.get_entry_dir(key), "document.md")
+        if not os.path.exists(markdown_path):
+            return None
+        with open(markdown_path, "r", encoding="utf-8") as f:
+            markdown = f.read()
+        self.touch(key)
+        return markdown
+
+    def write_markdown(self, key: str, markdown: str):
+        entry_dir = self.get_entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+        temp_path = os.path.join(entry_dir, f"{uuid.uuid4()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(markdown)
+        os.replace(temp_path, os.path.join(entry_dir, "document.md"))
+        self.touch(key)
+        self.evict()
+
+    def read_page_images(self, key: str) -> Optional[List[str]]:
+        entry_dir = self.get_entry_dir(key)
+        manifest_path = os.path.join(entry_dir, "images.json")
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, "r") as f:
+            image_names = json.load(f)
+        image_paths = [os.path.join(entry_dir, name) for name in image_names]
+        if not all(os.path.exists(path) for path in image_paths):
+            return None
+        self.touch(key)
+        return image_paths
+
+    def write_page_images(self, key: str, image_paths: List[str]) -> List[str]:
+        entry_dir = self.get_entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+        image_names = []
+        for image_path in image_paths:
+            image_name = os.path.basename(image_path)
+            shutil.copy2(image_path, os.path.join(entry_dir, image_name))
+            image_names.append(image_name)
+
+        temp_path = os.path.join(entry_dir, f"{uuid.uuid4()}.tmp")
+        with open(temp_path, "w") as f:
+            json.dump(image_names, f)
+        os.replace(temp_path, os.path.join(entry_dir, "images.json"))
+        self.touch(key)
+        self.evict()
+        return [os.path.join(entry_dir, name) for name in image_names]
+
+    def get_entry_size(self, entry_dir: str) -> int:
+        size = 0
+        for entry in os.scandir(entry_dir):
+            if entry.is_file():
+                size += entry.stat().st_size
+        return size
+
+    def evict(self):
+        cache_dir = get_cache_directory("documents")
+        entries = []
+        total_bytes = 0
+        for entry in os.scandir(cache_dir):
+            if not entry.is_dir():
+                continue
+            try:
+                size = self.get_entry_size(entry.path)
+                entries.append((entry.stat().st_mtime, size, entry.name))
+            except OSError:
+                continue
+            total_bytes += size
+
+        if total_bytes <= self.max_bytes:
+            return
+
+        for _, size, key in sorted(entries):
+            # Entries being read or written by a request are kept
+            if key in self._locks:
+                continue
+            shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
+            total_bytes -= size
+            if total_bytes <= self.max_bytes:
+                break
+
+    def link_page_images(self, image_paths: List[str], output_dir: str) -> List[str]:
+        """Links (or copies) cached page images so eviction cannot remove them mid request"""
+        output_paths = []
+        for image_path in image_paths:
+            output_path = os.path.join(
+                output_dir, f"{uuid.uuid4()}{os.path.splitext(image_path)[1]}"
+            )
+            try:
+                os.link(image_path, output_path)
+            except OSError:
+                shutil.copyfile(image_path, output_path)
+            output_paths.append(output_path)
+        return output_paths
+
+    async def get_or_create_markdown(
+        self,
+        file_path: str,
+        options: dict,
+        create: Callable[[], Awaitable[str]],
+    ) -> str:
+        key = await self.get_cache_key_for_file(file_path, options)
+        async with self._locks(key):
+            markdown = await asyncio.to_thread(self.read_markdown, key)
+            if markdown is not None:
+                print(f"Using cached markdown for {os.path.basename(file_path)}")
+                return markdown
+
+            markdown = await create()
+            await asyncio.to_thread(self.write_markdown, key, markdown)
+            return markdown
+
+    async def get_or_create_page_images(
+        self,
+        file_path: str,
+        options: dict,
+        create: Callable[[], Awaitable[List[str]]],
+        output_dir: str,
+    ) -> List[str]:
+        key = await self.get_cache_key_for_file(file_path, options)
+        async with self._locks(key):
+            image_paths = await asyncio.to_thread(self.read_page_images, key)
+            if image_paths is not None:
+                print(f"Using cached page images for {os.path.basename(file_path)}")
+                return await asyncio.to_thread(
+                    self.link_page_images, image_paths, output_dir
+                )
+
+            # Rendered into output_dir, only copies are stored in the cache
+            image_paths = await create()
+            await asyncio.to_thread(self.write_page_images, key, image_paths)
+            return image_paths
+
+
+DOCUMENT_CACHE_SERVICE = DocumentCacheService()
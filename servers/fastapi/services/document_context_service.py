@@ -0,0 +1,184 @@
+import asyncio
+import math
+from typing import List, Optional
+
+from models.document_chunk import DocumentChunk
+from services.score_based_chunker import ScoreBasedChunker
+from utils.llm_provider import get_document_context_token_budget
+
+# Rough average for English text across the supported tokenizers
+CHARS_PER_TOKEN = 4
+
+# Documents this many times over budget are summarized instead of trimmed
+SUMMARIZE_ABOVE_BUDGET_RATIO = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts text to max_tokens, preferring a paragraph, line or sentence boundary."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= 0:
+        return ""
+
+    truncated = text[:max_chars]
+    min_boundary = int(max_chars * 0.8)
+    for separator in ("\n\n", "\n", ". "):
+        boundary = truncated.rfind(separator)
+        if boundary >= min_boundary:
+            return truncated[: boundary + len(separator)].rstrip()
+    return truncated.rstrip()
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """Groups paragraphs into chunks of at most max_tokens, splitting oversized paragraphs."""
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for paragraph in text.split("\n\n"):
+        while estimate_tokens(paragraph) > max_tokens:
+            head = truncate_to_tokens(paragraph, max_tokens)
+            paragraph = paragraph[len(head) :].lstrip()
+            if current:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            chunks.append(head)
+
+        paragraph_tokens = estimate_tokens(paragraph)
+        if current and current_tokens + paragraph_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        if paragraph.strip():
+            current.append(paragraph)
+            current_tokens += paragraph_tokens
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+class DocumentContextService:
+    """
+    Builds the additional context for outline generation from parsed documents
+    within a token budget. Documents that do not fit are reduced to their
+    highest scoring sections using ScoreBasedChunker.
+    """
+
+    def __init__(self, token_budget: Optional[int] = None):
+        self.token_budget = token_budget or get_document_context_token_budget()
+        self.chunker = ScoreBasedChunker()
+
+    def should_summarize(self, document: str) -> bool:
+        return (
+            estimate_tokens(document) > self.token_budget * SUMMARIZE_ABOVE_BUDGET_RATIO
+        )
+
+    def get_document_budgets(self, documents: List[str]) -> List[int]:
+        """Splits the budget so small documents stay whole and large ones share the rest."""
+        budgets = [0] * len(documents)
+        remaining_budget = self.token_budget
+        pending = sorted(range(len(documents)), key=lambda i: len(documents[i]))
+
+        while pending:
+            share = remaining_budget // len(pending)
+            index = pending.pop(0)
+            budgets[index] = min(estimate_tokens(documents[index]), share)
+            remaining_budget -= budgets[index]
+
+        return budgets
+
+    def get_scored_chunks(self, document: str) -> List[DocumentChunk]:
+        headings = self.chunker.extract_headings(document)
+        if not headings:
+            return []
+
+        heading_scores = self.chunker.score_headings(headings)
+        chunks = self.chunker.get_chunks_from_headings(
+            document, headings, heading_scores, top_k=len(headings)
+        )
+
+        # Text before the first heading usually holds the title and abstract
+        preamble = document[: document.find(headings[0])].strip()
+        if preamble:
+            chunks.insert(
+                0,
+                DocumentChunk(
+                    heading="",
+                    content=preamble,
+                    heading_index=-1,
+                    score=max(heading_scores) + 1,
+                ),
+            )
+        return chunks
+
+    def select_from_document(self, document: str, token_budget: int) -> str:
+        if estimate_tokens(document) <= token_budget:
+            return document
+
+        chunks = self.get_scored_chunks(document)
+        if not chunks:
+            return truncate_to_tokens(document, token_budget)
+
+        selected: List[tuple[int, str]] = []
+        remaining_budget = token_budget
+        ranked_chunks = sorted(
+            enumerate(chunks), key=lambda each: (-each[1].score, each[0])
+        )
+        for position, chunk in ranked_chunks:
+            if remaining_budget <= 0:
+                break
+            chunk_text = (
+                f"{chunk.heading}\n{chunk.content}" if chunk.heading else chunk.content
+            )
+            chunk_tokens = estimate_tokens(chunk_text)
+            if chunk_tokens > remaining_budget:
+                # Only worth truncating if a meaningful part of the section fits
+                if remaining_budget < min(chunk_tokens, 200):
+                    continue
+                chunk_text = truncate_to_tokens(chunk_text, remaining_budget)
+                chunk_tokens = estimate_tokens(chunk_text)
+            selected.append((position, chunk_text))
+            remaining_budget -= chunk_tokens
+
+        # Keep sections in their original document order
+        selected.sort(key=lambda each: each[0])
+        return "\n\n".join(chunk_text for _, chunk_text in selected)
+
+    def select(self, documents: List[str]) -> str:
+        total_tokens = sum(estimate_tokens(document) for document in documents)
+        if total_tokens <= self.token_budget:
+            return "\n\n".join(documents)
+
+        print(
+            f"Documents have ~{total_tokens} tokens, selecting context within {self.token_budget} tokens"
+        )
+        budgets = self.get_document_budgets(documents)
+        return "\n\n".join(
+            self.select_from_document(document, budget)
+            for document, budget in zip(documents, budgets)
+        )
+
+    async def get_context(self, documents: List[str]) -> str:
+        return await asyncio.to_thread(self.select, documents)
+
+    async def summarize_documents(self, documents: List[str]) -> List[str]:
+        """Replaces documents far over budget with their summaries, concurrently."""
+        # Imported here as generate_document_summary imports this module
+        from utils.llm_calls.generate_document_summary import (
+            generate_document_summary,
+        )
+
+        async def summarize(document: str) -> str:
+            if not self.should_summarize(document):
+                return document
+            return await generate_document_summary(document, self.token_budget)
+
+        return await asyncio.gather(*[summarize(document) for document in documents])
+
+    async def get_summarized_context(self, documents: List[str]) -> str:
+        return await self.get_context(await self.summarize_documents(documents))
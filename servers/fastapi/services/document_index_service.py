@@ -0,0 +1,98 @@
+import asyncio
+from typing import List, Optional
+
+import numpy as np
+
+from services.document_context_service import split_into_chunks
+from services.embedding_service import get_embedding_function
+from utils.get_env import get_document_retrieval_passages_env
+from utils.parsers import parse_int_or_none
+
+# MiniLM truncates inputs at 256 word pieces, passages are kept below that
+PASSAGE_TOKENS = 200
+DEFAULT_PASSAGES_PER_SLIDE = 3
+MIN_PASSAGE_SIMILARITY = 0.2
+EMBEDDING_BATCH_SIZE = 64
+
+
+def get_passages_per_slide() -> int:
+    passages = parse_int_or_none(get_document_retrieval_passages_env())
+    if passages is None:
+        return DEFAULT_PASSAGES_PER_SLIDE
+    return max(passages, 0)
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    embedding_function = get_embedding_function()
+    embeddings = []
+    for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+        embeddings.extend(
+            embedding_function(texts[start : start + EMBEDDING_BATCH_SIZE])
+        )
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+class DocumentIndex:
+    """
+    In-memory vector index over passages of uploaded documents, embedded with the
+    same ONNX MiniLM model used for icon search. Each slide gets only the passages
+    closest to its outline instead of the whole document.
+    """
+
+    def __init__(self, passages: List[str], embeddings: np.ndarray):
+        self.passages = passages
+        self.embeddings = embeddings
+
+    @classmethod
+    def from_documents(cls, documents: List[str]) -> Optional["DocumentIndex"]:
+        passages = [
+            passage
+            for document in documents
+            for passage in split_into_chunks(document, PASSAGE_TOKENS)
+        ]
+        if not passages:
+            return None
+        return cls(passages, embed_texts(passages))
+
+    def search(self, queries: List[str], k: int) -> List[List[str]]:
+        """Top k passages for every query, in document order."""
+        if not queries or k <= 0:
+            return [[] for _ in queries]
+
+        similarities = embed_texts(queries) @ self.embeddings.T
+        k = min(k, len(self.passages))
+        results = []
+        for query_similarities in similarities:
+            top_indices = np.argpartition(-query_similarities, k - 1)[:k]
+            top_indices = sorted(
+                index
+                for index in top_indices
+                if query_similarities[index] >= MIN_PASSAGE_SIMILARITY
+            )
+            results.append([self.passages[index] for index in top_indices])
+        return results
+
+    async def get_slide_contexts(
+        self, outlines: List[str], k: Optional[int] = None
+    ) -> List[Optional[str]]:
+        k = get_passages_per_slide() if k is None else k
+        results = await asyncio.to_thread(self.search, outlines, k)
+        return ["\n\n".join(passages) or None for passages in results]
+
+
+async def build_document_index(documents: List[str]) -> Optional[DocumentIndex]:
+    """Returns None when retrieval is disabled or the index could not be built."""
+    if not get_passages_per_slide() or not any(documents):
+        return None
+    try:
+        document_index = await asyncio.to_thread(
+            DocumentIndex.from_documents, documents
+        )
+    except Exception as e:
+        print(f"Could not build document index: {e}")
+        return None
+    if document_index:
+        print(f"Indexed {len(document_index.passages)} document passages")
+    return document_index
@@ -0,0 +1,37 @@
+import mimetypes
+import time
+
+from constants.documents import PDF_MIME_TYPES
+from enums.pdf_engine import PdfEngine
+from models.parsed_document import ParsedDocument
+from services.docling_service import parse_with_docling
+from services.pdf_text_service import extract_pdf_markdown, is_text_dominant_pdf
+
+
+def parse_document_in_worker(file_path: str, engine: PdfEngine) -> ParsedDocument:
+    """
+    Entry point used by DOCUMENT_PROCESS_POOL workers.
+    PDFs use the requested engine, AUTO picks the fast engine for text dominant PDFs
+    and keeps Docling for complex layouts. Other formats always use Docling.
+    """
+    if mimetypes.guess_type(file_path)[0] not in PDF_MIME_TYPES:
+        return parse_with_docling(file_path)
+
+    if engine == PdfEngine.AUTO:
+        engine = (
+            PdfEngine.FAST if is_text_dominant_pdf(file_path) else PdfEngine.DOCLING
+        )
+
+    if engine == PdfEngine.FAST:
+        start = time.perf_counter()
+        markdown, pages = extract_pdf_markdown(file_path)
+        if markdown.strip():
+            return ParsedDocument(
+                markdown=markdown,
+                engine=PdfEngine.FAST.value,
+                pages=pages,
+                seconds=time.perf_counter() - start,
+            )
+        print(f"Fast engine found no text in {file_path}, falling back to Docling")
+
+    return parse_with_docling(file_path)
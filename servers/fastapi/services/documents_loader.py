@@ -1,8 +1,9 @@
+import math
 import mimetypes
 from fastapi import HTTPException
 import os, asyncio
-from typing import List, Optional, Tuple
-import pdfplumber
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
 
 from constants.documents import (
     PDF_MIME_TYPES,
@@ -10,18 +11,40 @@ from constants.documents import (
     TEXT_MIME_TYPES,
     WORD_TYPES,
 )
-from services.docling_service import DoclingService
+from enums.page_image_format import PageImageFormat
+from enums.pdf_engine import PdfEngine
+from models.page_image_options import PageImageOptions
+from models.parsed_document import ParsedDocument
+from services.document_cache_service import DOCUMENT_CACHE_SERVICE
+from services.document_parser_worker import parse_document_in_worker
+from services.pdf_page_renderer import get_pdf_page_count, render_pdf_pages
+from services.process_pool_service import (
+    DOCUMENT_PROCESS_POOL,
+    PAGE_IMAGE_PROCESS_POOL,
+)
+from utils.get_env import (
+    get_document_parser_timeout_env,
+    get_page_image_format_env,
+    get_page_image_quality_env,
+    get_page_image_resolution_env,
+)
+from utils.parsers import expand_page_ranges, parse_int_or_none
+
+DEFAULT_DOCUMENT_PARSE_TIMEOUT = 300
 
 
 class DocumentsLoader:
 
-    def __init__(self, file_paths: List[str]):
-        self._file_paths = file_paths
+    # Cumulative pages and seconds per engine, used to report throughput
+    engine_stats: Dict[str, Dict[str, float]] = {}
 
-        self.docling_service = DoclingService()
+    def __init__(self, file_paths: List[str], pdf_engine: PdfEngine = PdfEngine.AUTO):
+        self._file_paths = file_paths
+        self._pdf_engine = pdf_engine
 
         self._documents: List[str] = []
         self._images: List[List[str]] = []
+        self._saved_init_seconds = 0.0
 
     @property
     def documents(self):
@@ -31,6 +54,19 @@ class DocumentsLoader:
     def images(self):
         return self._images
 
+    @property
+    def saved_init_seconds(self):
+        """Converter initialization time avoided by reusing warm pool workers"""
+        return self._saved_init_seconds
+
+    @classmethod
+    def get_engine_throughput(cls) -> Dict[str, float]:
+        """Pages per second parsed by each engine since startup"""
+        return {
+            engine: (stats["pages"] / stats["seconds"] if stats["seconds"] else 0.0)
+            for engine, stats in cls.engine_stats.items()
+        }
+
     async def load_documents(
         self,
         temp_dir: Optional[str] = None,
@@ -39,35 +75,51 @@ class DocumentsLoader:
     ):
         """If load_images is True, temp_dir must be provided"""
 
-        documents: List[str] = []
-        images: List[str] = []
-
         for file_path in self._file_paths:
             if not os.path.exists(file_path):
                 raise HTTPException(
                     status_code=404, detail=f"File {file_path} not found"
                 )
 
-            document = ""
-            imgs = []
+        # Files are parsed in parallel, gather keeps the results in input order
+        results = await asyncio.gather(
+            *[
+                self.load_document(file_path, load_text, load_images, temp_dir)
+                for file_path in self._file_paths
+            ]
+        )
 
-            mime_type = mimetypes.guess_type(file_path)[0]
-            if mime_type in PDF_MIME_TYPES:
-                document, imgs = await self.load_pdf(
-                    file_path, load_text, load_images, temp_dir
-                )
-            elif mime_type in TEXT_MIME_TYPES:
-                document = await self.load_text(file_path)
-            elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
-            elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
+        self._documents = [document for document, _ in results]
+        self._images = [imgs for _, imgs in results]
 
-            documents.append(document)
-            images.append(imgs)
+        if self._saved_init_seconds:
+            print(
+                f"Reused warm document converter, saved {self._saved_init_seconds:.2f}s of initialization"
+            )
 
-        self._documents = documents
-        self._images = images
+    async def load_document(
+        self,
+        file_path: str,
+        load_text: bool,
+        load_images: bool,
+        temp_dir: Optional[str] = None,
+    ) -> Tuple[str, List[str]]:
+        document = ""
+        imgs = []
+
+        mime_type = mimetypes.guess_type(file_path)[0]
+        if mime_type in PDF_MIME_TYPES:
+            document, imgs = await self.load_pdf(
+                file_path, load_text, load_images, temp_dir, self._pdf_engine
+            )
+        elif mime_type in TEXT_MIME_TYPES:
+            document = await self.load_text(file_path)
+        elif mime_type in POWERPOINT_TYPES:
+            document = await self.load_powerpoint(file_path)
+        elif mime_type in WORD_TYPES:
+            document = await self.load_msword(file_path)
+
+        return document, imgs
 
     async def load_pdf(
         self,
@@ -75,12 +127,13 @@ class DocumentsLoader:
         load_text: bool,
         load_images: bool,
         temp_dir: Optional[str] = None,
+        engine: PdfEngine = PdfEngine.AUTO,
     ) -> Tuple[str, List[str]]:
         image_paths = []
         document: str = ""
 
         if load_text:
-            document = self.docling_service.parse_to_markdown(file_path)
+            document = await self.parse_to_markdown(file_path, engine)
 
         if load_images:
             image_paths = await self.get_page_images_from_pdf_async(file_path, temp_dir)
@@ -91,25 +144,197 @@ class DocumentsLoader:
         with open(file_path, "r") as file:
             return await asyncio.to_thread(file.read)
 
-    def load_msword(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_msword(self, file_path: str) -> str:
+        return await self.parse_to_markdown(file_path, PdfEngine.DOCLING)
 
-    def load_powerpoint(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_powerpoint(self, file_path: str) -> str:
+        return await self.parse_to_markdown(file_path, PdfEngine.DOCLING)
+
+    async def parse_to_markdown(self, file_path: str, engine: PdfEngine) -> str:
+        return await DOCUMENT_CACHE_SERVICE.get_or_create_markdown(
+            file_path,
+            {"parser": engine.value, "do_ocr": False},
+            lambda: self._parse_to_markdown(file_path, engine),
+        )
+
+    async def _parse_to_markdown(self, file_path: str, engine: PdfEngine) -> str:
+        file_name = os.path.basename(file_path)
+        timeout = (
+            parse_int_or_none(get_document_parser_timeout_env())
+            or DEFAULT_DOCUMENT_PARSE_TIMEOUT
+        )
+        try:
+            parsed_document: ParsedDocument = await DOCUMENT_PROCESS_POOL.run(
+                parse_document_in_worker, file_path, engine, timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=504,
+                detail=f"Parsing {file_name} timed out after {timeout} seconds",
+            )
+        except MemoryError:
+            # Raised inside the worker when an allocation hits its memory cap
+            raise HTTPException(
+                status_code=413,
+                detail=f"Parsing {file_name} exceeded the memory limit",
+            )
+        except BrokenProcessPool:
+            # The worker died (crash in a native parser, OOM killer, shutdown),
+            # which says nothing about the size of the file
+            raise HTTPException(
+                status_code=500,
+                detail=f"Parsing {file_name} failed, the parser process exited unexpectedly",
+            )
+
+        self.record_engine_stats(file_name, parsed_document)
+
+        # Previously every loader built its own converter, so one init is saved per request
+        self._saved_init_seconds = max(
+            self._saved_init_seconds, parsed_document.saved_init_seconds
+        )
+        return parsed_document.markdown
+
+    @classmethod
+    def record_engine_stats(cls, file_name: str, parsed_document: ParsedDocument):
+        stats = cls.engine_stats.setdefault(
+            parsed_document.engine, {"pages": 0, "seconds": 0.0}
+        )
+        stats["pages"] += parsed_document.pages
+        stats["seconds"] += parsed_document.seconds
+        print(
+            f"Parsed {file_name} with {parsed_document.engine} engine: "
+            f"{parsed_document.pages} pages in {parsed_document.seconds:.2f}s "
+            f"({parsed_document.pages_per_second:.1f} pages/sec, "
+            f"{cls.get_engine_throughput()[parsed_document.engine]:.1f} pages/sec since startup)"
+        )
+
+    @classmethod
+    def get_page_image_options(cls) -> PageImageOptions:
+        options = PageImageOptions()
+        resolution = parse_int_or_none(get_page_image_resolution_env())
+        if resolution:
+            options.resolution = resolution
+        image_format = (get_page_image_format_env() or "").lower()
+        if image_format in ("jpg", "jpeg"):
+            options.format = PageImageFormat.JPEG
+        elif image_format == PageImageFormat.WEBP.value:
+            options.format = PageImageFormat.WEBP
+        quality = parse_int_or_none(get_page_image_quality_env())
+        if quality:
+            options.quality = min(max(quality, 1), 100)
+        return options
+
+    @classmethod
+    def get_page_numbers(
+        cls, file_path: str, page_numbers: Optional[List[int]] = None
+    ) -> List[int]:
+        page_count = get_pdf_page_count(file_path)
+        if not page_numbers:
+            return list(range(1, page_count + 1))
+        out_of_range = [each for each in page_numbers if each > page_count]
+        if out_of_range:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Page {out_of_range[0]} is out of range, document has {page_count} pages",
+            )
+        return page_numbers
+
+    @classmethod
+    def get_page_numbers_from_ranges(
+        cls, file_path: str, page_ranges: Optional[List[Tuple[int, int]]]
+    ) -> Optional[List[int]]:
+        """Expands requested page ranges against the page count of the PDF."""
+        if not page_ranges:
+            return None
+        try:
+            return expand_page_ranges(page_ranges, get_pdf_page_count(file_path))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     @classmethod
-    def get_page_images_from_pdf(cls, file_path: str, temp_dir: str) -> List[str]:
-        with pdfplumber.open(file_path) as pdf:
-            images = []
-            for page in pdf.pages:
-                img = page.to_image(resolution=150)
-                image_path = os.path.join(temp_dir, f"page_{page.page_number}.png")
-                img.save(image_path)
-                images.append(image_path)
-            return images
+    def get_page_images_from_pdf(
+        cls,
+        file_path: str,
+        temp_dir: str,
+        page_numbers: Optional[List[int]] = None,
+        options: Optional[PageImageOptions] = None,
+    ) -> List[str]:
+        return render_pdf_pages(
+            file_path,
+            cls.get_page_numbers(file_path, page_numbers),
+            temp_dir,
+            options or cls.get_page_image_options(),
+        )
 
     @classmethod
-    async def get_page_images_from_pdf_async(cls, file_path: str, temp_dir: str):
-        return await asyncio.to_thread(
-            cls.get_page_images_from_pdf, file_path, temp_dir
+    async def get_page_images_from_pdf_async(
+        cls,
+        file_path: str,
+        temp_dir: str,
+        page_numbers: Optional[List[int]] = None,
+        options: Optional[PageImageOptions] = None,
+        use_cache: bool = True,
+    ) -> List[str]:
+        """
+        Renders pages (all, or the given 1-based page numbers) on PAGE_IMAGE_PROCESS_POOL.
+        Pages are split into contiguous batches, one per worker, and returned in page order.
+        use_cache should be False for PDFs that are never the same bytes twice.
+        """
+        options = options or cls.get_page_image_options()
+        page_numbers = await asyncio.to_thread(
+            cls.get_page_numbers, file_path, page_numbers
+        )
+        if not use_cache:
+            return await cls._render_page_images(
+                file_path, temp_dir, page_numbers, options
+            )
+        return await DOCUMENT_CACHE_SERVICE.get_or_create_page_images(
+            file_path,
+            {
+                "renderer": "pdfplumber",
+                **options.model_dump(mode="json"),
+                "pages": page_numbers,
+            },
+            lambda: cls._render_page_images(file_path, temp_dir, page_numbers, options),
+            temp_dir,
+        )
+
+    @classmethod
+    async def _render_page_images(
+        cls,
+        file_path: str,
+        temp_dir: str,
+        page_numbers: List[int],
+        options: PageImageOptions,
+    ) -> List[str]:
+        if not page_numbers:
+            return []
+        batch_size = math.ceil(len(page_numbers) / PAGE_IMAGE_PROCESS_POOL.max_workers)
+        batches = [
+            page_numbers[i : i + batch_size]
+            for i in range(0, len(page_numbers), batch_size)
+        ]
+        timeout = (
+            parse_int_or_none(get_document_parser_timeout_env())
+            or DEFAULT_DOCUMENT_PARSE_TIMEOUT
         )
+        try:
+            results = await asyncio.gather(
+                *[
+                    PAGE_IMAGE_PROCESS_POOL.run(
+                        render_pdf_pages,
+                        file_path,
+                        batch,
+                        temp_dir,
+                        options,
+                        timeout=timeout,
+                    )
+                    for batch in batches
+                ]
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=504,
+                detail=f"Rendering {os.path.basename(file_path)} timed out after {timeout} seconds",
+            )
+        return [image_path for batch_paths in results for image_path in batch_paths]
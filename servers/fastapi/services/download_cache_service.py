@@ -0,0 +1,142 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Optional
+
+from utils.asset_directory_utils import get_cache_directory
+from utils.file_utils import get_file_hash
+from utils.get_env import get_download_cache_max_mb_env
+from utils.keyed_lock import KeyedLock
+from utils.parsers import parse_int_or_none
+
+DEFAULT_DOWNLOAD_CACHE_MAX_MB = 500
+
+
+class DownloadCacheService:
+    """
+    Persistent content-addressed cache of downloaded assets.
+    URLs map to blobs named by content hash, so identical files fetched from
+    different URLs are stored once. Least recently used blobs are evicted once
+    the cache grows over DOWNLOAD_CACHE_MAX_MB.
+    """
+
+    def __init__(self):
+        self._locks = KeyedLock()
+
+    @property
+    def max_bytes(self) -> int:
+        max_mb = (
+            parse_int_or_none(get_download_cache_max_mb_env())
+            or DEFAULT_DOWNLOAD_CACHE_MAX_MB
+        )
+        return max_mb * 1024 * 1024
+
+    def get_key(self, url: str, headers: Optional[dict] = None) -> str:
+        headers_json = json.dumps(headers or {}, sort_keys=True)
+        return hashlib.sha256(f"{url}\n{headers_json}".encode("utf-8")).hexdigest()
+
+    def get_urls_dir(self) -> str:
+        urls_dir = os.path.join(get_cache_directory("downloads"), "urls")
+        os.makedirs(urls_dir, exist_ok=True)
+        return urls_dir
+
+    def get_blobs_dir(self) -> str:
+        blobs_dir = os.path.join(get_cache_directory("downloads"), "blobs")
+        os.makedirs(blobs_dir, exist_ok=True)
+        return blobs_dir
+
+    def read(self, key: str) -> Optional[str]:
+        entry_path = os.path.join(self.get_urls_dir(), f"{key}.json")
+        if not os.path.exists(entry_path):
+            return None
+        with open(entry_path, "r") as f:
+            blob_name = json.load(f)["blob"]
+        blob_path = os.path.join(self.get_blobs_dir(), blob_name)
+        if not os.path.exists(blob_path):
+            return None
+        # Marks the blob as recently used for eviction
+        os.utime(blob_path)
+        return blob_path
+
+    def write(self, key: str, file_path: str) -> str:
+        extension = os.path.splitext(file_path)[1]
+        blob_name = f"{get_file_hash(file_path)}{extension}"
+        blob_path = os.path.join(self.get_blobs_dir(), blob_name)
+        if not os.path.exists(blob_path):
+            temp_path = f"{blob_path}.{uuid.uuid4()}.tmp"
+            shutil.copyfile(file_path, temp_path)
+            os.replace(temp_path, blob_path)
+
+        entry_path = os.path.join(self.get_urls_dir(), f"{key}.json")
+        temp_path = f"{entry_path}.{uuid.uuid4()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"blob": blob_name}, f)
+        os.replace(temp_path, entry_path)
+
+        self.evict()
+        return blob_path
+
+    def evict(self):
+        blobs_dir = self.get_blobs_dir()
+        blobs = []
+        total_bytes = 0
+        for entry in os.scandir(blobs_dir):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                blobs.append((stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+
+        if total_bytes <= self.max_bytes:
+            return
+
+        # URL entries of evicted blobs are treated as misses by read
+        for _, size, path in sorted(blobs):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_bytes -= size
+            if total_bytes <= self.max_bytes:
+                break
+
+    def copy_to(self, blob_path: str, save_directory: str) -> str:
+        """Links (or copies) a cached blob so eviction cannot remove it mid export"""
+        os.makedirs(save_directory, exist_ok=True)
+        save_path = os.path.join(
+            save_directory, f"{uuid.uuid4()}{os.path.splitext(blob_path)[1]}"
+        )
+        try:
+            os.link(blob_path, save_path)
+        except OSError:
+            shutil.copyfile(blob_path, save_path)
+        return save_path
+
+    async def get_or_download(
+        self, url: str, save_directory: str, headers: Optional[dict] = None
+    ) -> Optional[str]:
+        # Imported here as download_helpers imports this service
+        from utils.download_helpers import download_file
+
+        key = self.get_key(url, headers)
+        async with self._locks(key):
+            blob_path = await asyncio.to_thread(self.read, key)
+            if blob_path:
+                return await asyncio.to_thread(self.copy_to, blob_path, save_directory)
+
+            # Downloaded and hashed in a private directory, so the blob stored under
+            # this url's key always holds this url's bytes
+            with tempfile.TemporaryDirectory(
+                dir=get_cache_directory("downloads")
+            ) as download_directory:
+                file_path = await download_file(url, download_directory, headers)
+                if not file_path:
+                    return None
+                blob_path = await asyncio.to_thread(self.write, key, file_path)
+                return await asyncio.to_thread(self.copy_to, blob_path, save_directory)
+
+
+DOWNLOAD_CACHE_SERVICE = DownloadCacheService()
@@ -0,0 +1,22 @@
+import threading
+from typing import Optional
+
+from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+_EMBEDDING_FUNCTION: Optional[ONNXMiniLM_L6_V2] = None
+_EMBEDDING_FUNCTION_LOCK = threading.Lock()
+
+
+def get_embedding_function() -> ONNXMiniLM_L6_V2:
+    """
+    Returns the process wide ONNX MiniLM embedder, downloading the model on first use.
+    Icon search and document retrieval share it so the model is loaded once.
+    """
+    global _EMBEDDING_FUNCTION
+    with _EMBEDDING_FUNCTION_LOCK:
+        if _EMBEDDING_FUNCTION is None:
+            embedding_function = ONNXMiniLM_L6_V2()
+            embedding_function.DOWNLOAD_PATH = "chroma/models"
+            embedding_function._download_model_if_not_exists()
+            _EMBEDDING_FUNCTION = embedding_function
+    return _EMBEDDING_FUNCTION
@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from typing import Awaitable, Callable, Iterable, Optional
+
+from models.presentation_and_path import PresentationAndPath
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from utils.asset_directory_utils import get_cache_directory
+from utils.keyed_lock import KeyedLock
+
+# Bump when export output changes so stale entries are not reused
+EXPORT_CACHE_VERSION = 1
+
+
+class ExportCacheService:
+    """
+    Remembers the last export of each presentation per format, keyed by a hash of
+    its title, layout and slides. Entries are dropped when the presentation is
+    changed and ignored if the exported file was overwritten since.
+    """
+
+    def __init__(self):
+        self._locks = KeyedLock()
+
+    def get_content_hash(
+        self,
+        presentation: PresentationModel,
+        slides: Iterable[SlideModel],
+        export_as: str,
+    ) -> str:
+        content = {
+            "version": EXPORT_CACHE_VERSION,
+            "export_as": export_as,
+            "title": presentation.title,
+            "layout": presentation.layout,
+            "slides": [
+                {
+                    "layout_group": slide.layout_group,
+                    "layout": slide.layout,
+                    "index": slide.index,
+                    "content": slide.content,
+                    "html_content": slide.html_content,
+                    "speaker_note": slide.speaker_note,
+                    "properties": slide.properties,
+                }
+                for slide in sorted(slides, key=lambda slide: slide.index)
+            ],
+        }
+        content_json = json.dumps(content, sort_keys=True, default=str)
+        return hashlib.sha256(content_json.encode("utf-8")).hexdigest()
+
+    def get_entry_path(self, presentation_id: uuid.UUID, export_as: str) -> str:
+        return os.path.join(
+            get_cache_directory("exports"), f"{presentation_id}_{export_as}.json"
+        )
+
+    def read(
+        self, presentation_id: uuid.UUID, export_as: str, content_hash: str
+    ) -> Optional[str]:
+        entry_path = self.get_entry_path(presentation_id, export_as)
+        if not os.path.exists(entry_path):
+            return None
+        with open(entry_path, "r") as f:
+            entry = json.load(f)
+        if entry["hash"] != content_hash or not os.path.exists(entry["path"]):
+            return None
+        # Exports are named by title, another presentation may have replaced the file
+        stat = os.stat(entry["path"])
+        if [stat.st_mtime_ns, stat.st_size] != entry["stat"]:
+            return None
+        return entry["path"]
+
+    def write(
+        self, presentation_id: uuid.UUID, export_as: str, content_hash: str, path: str
+    ):
+        stat = os.stat(path)
+        entry_path = self.get_entry_path(presentation_id, export_as)
+        temp_path = f"{entry_path}.{uuid.uuid4()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(
+                {
+                    "hash": content_hash,
+                    "path": path,
+                    "stat": [stat.st_mtime_ns, stat.st_size],
+                },
+                f,
+            )
+        os.replace(temp_path, entry_path)
+
+    def invalidate(self, presentation_id: uuid.UUID):
+        for export_as in ("pptx", "pdf"):
+            try:
+                os.remove(self.get_entry_path(presentation_id, export_as))
+            except FileNotFoundError:
+                pass
+
+    async def get_or_export(
+        self,
+        presentation: PresentationModel,
+        slides: Iterable[SlideModel],
+        export_as: str,
+        export: Callable[[], Awaitable[PresentationAndPath]],
+    ) -> PresentationAndPath:
+        content_hash = self.get_content_hash(presentation, slides, export_as)
+        lock_key = f"{presentation.id}_{export_as}"
+        async with self._locks(lock_key):
+            path = await asyncio.to_thread(
+                self.read, presentation.id, export_as, content_hash
+            )
+            if path:
+                print(f"Using cached {export_as} export of {presentation.id}")
+                return PresentationAndPath(presentation_id=presentation.id, path=path)
+
+            presentation_and_path = await export()
+            if os.path.exists(presentation_and_path.path):
+                await asyncio.to_thread(
+                    self.write,
+                    presentation.id,
+                    export_as,
+                    content_hash,
+                    presentation_and_path.path,
+                )
+            return presentation_and_path
+
+
+EXPORT_CACHE_SERVICE = ExportCacheService()
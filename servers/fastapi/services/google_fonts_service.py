@@ -0,0 +1,175 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Dict, Iterable, Optional, Set
+
+import aiohttp
+
+from constants.google_fonts import GOOGLE_FONTS_FAMILIES
+from services.http_session_service import HTTP_SESSION_SERVICE
+from utils.asset_directory_utils import get_cache_directory
+from utils.get_env import (
+    get_google_fonts_families_file_env,
+    get_google_fonts_offline_env,
+)
+from utils.parsers import parse_bool_or_none
+
+# Families rarely leave Google Fonts, while a missing family may be added later
+AVAILABLE_TTL_SECONDS = 30 * 24 * 60 * 60
+UNAVAILABLE_TTL_SECONDS = 24 * 60 * 60
+REQUEST_TIMEOUT_SECONDS = 10
+# Oldest lookups are dropped beyond this, uploads can carry arbitrary font names
+MAX_CACHED_FAMILIES = 10000
+
+
+def get_google_fonts_url(font_name: str) -> str:
+    formatted_name = font_name.replace(" ", "+")
+    return f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
+
+
+class GoogleFontsService:
+    """
+    Answers whether font families are available on Google Fonts.
+    Bundled families are answered locally, other lookups are cached on disk with a
+    TTL for both available and unavailable results. Network errors are not cached.
+    In offline mode only bundled and cached families are reported as available.
+    """
+
+    def __init__(self):
+        self._cache: Optional[Dict[str, dict]] = None
+        self._families: Optional[Set[str]] = None
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    @property
+    def offline(self) -> bool:
+        return parse_bool_or_none(get_google_fonts_offline_env()) or False
+
+    def get_cache_path(self) -> str:
+        return os.path.join(get_cache_directory("google_fonts"), "availability.json")
+
+    def get_families(self) -> Set[str]:
+        if self._families is None:
+            families = set(GOOGLE_FONTS_FAMILIES)
+            families_file = get_google_fonts_families_file_env()
+            if families_file:
+                try:
+                    with open(families_file, "r", encoding="utf-8") as f:
+                        families.update(line.strip() for line in f if line.strip())
+                except OSError as e:
+                    print(f"Error reading Google Fonts families file: {e}")
+            self._families = families
+        return self._families
+
+    def load_cache(self) -> Dict[str, dict]:
+        if self._cache is None:
+            try:
+                with open(self.get_cache_path(), "r") as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError):
+                self._cache = {}
+        return self._cache
+
+    def is_expired(self, entry: dict) -> bool:
+        ttl = AVAILABLE_TTL_SECONDS if entry["available"] else UNAVAILABLE_TTL_SECONDS
+        return time.time() - entry["checked_at"] > ttl
+
+    def prune_cache(self, cache: Dict[str, dict]):
+        """Removes expired entries, then the oldest ones over MAX_CACHED_FAMILIES"""
+        for font_name in [
+            name for name, entry in cache.items() if self.is_expired(entry)
+        ]:
+            del cache[font_name]
+        if len(cache) > MAX_CACHED_FAMILIES:
+            oldest = sorted(cache, key=lambda name: cache[name]["checked_at"])
+            for font_name in oldest[: len(cache) - MAX_CACHED_FAMILIES]:
+                del cache[font_name]
+
+    def save_cache(self, cache: Dict[str, dict]):
+        cache_path = self.get_cache_path()
+        temp_path = f"{cache_path}.{uuid.uuid4()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(temp_path, cache_path)
+
+    def get_cached(self, font_name: str) -> Optional[bool]:
+        entry = self.load_cache().get(font_name)
+        if not entry:
+            return None
+        if not self.offline and self.is_expired(entry):
+            return None
+        return entry["available"]
+
+    async def fetch_availability(self, font_name: str) -> Optional[bool]:
+        """Returns None when Google Fonts could not be reached."""
+        try:
+            session = await HTTP_SESSION_SERVICE.get_session()
+            async with session.head(
+                get_google_fonts_url(font_name),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+            ) as response:
+                # Rate limits and server errors say nothing about the family
+                if response.status == 429 or response.status >= 500:
+                    return None
+                return response.status == 200
+        except Exception as e:
+            print(f"Error checking Google Font availability for {font_name}: {e}")
+            return None
+
+    def _discard_pending(self, font_name: str, task: asyncio.Task):
+        # A newer lookup may have replaced the finished one, which must stay shared
+        if self._pending.get(font_name) is task:
+            del self._pending[font_name]
+
+    async def is_available(self, font_name: str) -> bool:
+        return (await self.check_availability([font_name]))[font_name]
+
+    async def check_availability(self, font_names: Iterable[str]) -> Dict[str, bool]:
+        font_names = list(dict.fromkeys(font_names))
+        families = self.get_families()
+
+        results: Dict[str, bool] = {}
+        to_fetch = []
+        for font_name in font_names:
+            if font_name in families:
+                results[font_name] = True
+                continue
+            cached = self.get_cached(font_name)
+            if cached is not None:
+                results[font_name] = cached
+            elif self.offline:
+                results[font_name] = False
+            else:
+                to_fetch.append(font_name)
+
+        if not to_fetch:
+            return results
+
+        # Concurrent uploads share a single request per family
+        tasks = []
+        for font_name in to_fetch:
+            if font_name not in self._pending:
+                task = asyncio.create_task(self.fetch_availability(font_name))
+                task.add_done_callback(
+                    lambda task, font_name=font_name: self._discard_pending(
+                        font_name, task
+                    )
+                )
+                self._pending[font_name] = task
+            tasks.append(self._pending[font_name])
+        fetched = await asyncio.gather(*tasks)
+
+        cache = self.load_cache()
+        for font_name, available in zip(to_fetch, fetched):
+            results[font_name] = bool(available)
+            if available is not None:
+                cache[font_name] = {"available": available, "checked_at": time.time()}
+        self.prune_cache(cache)
+        # Snapshot, other lookups may update the cache while it is written
+        await asyncio.to_thread(self.save_cache, dict(cache))
+
+        return results
+
+
+GOOGLE_FONTS_SERVICE = GoogleFontsService()
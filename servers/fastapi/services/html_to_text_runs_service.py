@@ -1,5 +1,5 @@
 from html.parser import HTMLParser
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from models.pptx_models import PptxFontModel, PptxTextRunModel
 
@@ -10,27 +10,45 @@ class InlineHTMLToRunsParser(HTMLParser):
         self.base_font = base_font
         self.tag_stack: List[str] = []
         self.text_runs: List[PptxTextRunModel] = []
+        self._fonts: Dict[Tuple[bool, ...], PptxFontModel] = {}
 
     def _current_font(self) -> PptxFontModel:
-        font_json = self.base_font.model_dump()
-        is_bold = any(tag in ("strong", "b") for tag in self.tag_stack)
-        is_italic = any(tag in ("em", "i") for tag in self.tag_stack)
-        is_underline = any(tag == "u" for tag in self.tag_stack)
-        is_strike = any(tag in ("s", "strike", "del") for tag in self.tag_stack)
-        is_code = any(tag == "code" for tag in self.tag_stack)
+        font_state = (
+            any(tag in ("strong", "b") for tag in self.tag_stack),
+            any(tag in ("em", "i") for tag in self.tag_stack),
+            any(tag == "u" for tag in self.tag_stack),
+            any(tag in ("s", "strike", "del") for tag in self.tag_stack),
+            any(tag == "code" for tag in self.tag_stack),
+        )
+        # Each formatting state is derived once, runs get their own shallow copy so
+        # editing one run's font later does not change the others
+        font = self._fonts.get(font_state)
+        if font is None:
+            font = self._derive_font(*font_state)
+            self._fonts[font_state] = font
+        return font.model_copy()
 
+    def _derive_font(
+        self,
+        is_bold: bool,
+        is_italic: bool,
+        is_underline: bool,
+        is_strike: bool,
+        is_code: bool,
+    ) -> PptxFontModel:
+        font_update = {}
         if is_bold:
-            font_json["font_weight"] = 700
+            font_update["font_weight"] = 700
         if is_italic:
-            font_json["italic"] = True
+            font_update["italic"] = True
         if is_underline:
-            font_json["underline"] = True
+            font_update["underline"] = True
         if is_strike:
-            font_json["strike"] = True
+            font_update["strike"] = True
         if is_code:
-            font_json["name"] = "Courier New"
+            font_update["name"] = "Courier New"
 
-        return PptxFontModel(**font_json)
+        return self.base_font.model_copy(update=font_update)
 
     def handle_starttag(self, tag, attrs):
         tag = tag.lower()
@@ -61,5 +79,3 @@ def parse_html_text_to_text_runs(
     parser = InlineHTMLToRunsParser(base_font if base_font else PptxFontModel())
     parser.feed(normalized_text)
     return parser.text_runs
-
-
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+MAX_CONNECTIONS = 100
+MAX_CONNECTIONS_PER_HOST = 10
+
+
+class HttpSessionService:
+    """
+    Shared aiohttp session so asset downloads reuse pooled keep-alive connections
+    instead of opening a new session and connection for every file.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._session
+        # Sessions are bound to the loop they were created in
+        if session is None or session.closed or self._loop is not loop:
+            stale_session, stale_loop = session, self._loop
+            session = aiohttp.ClientSession(
+                trust_env=True,
+                connector=aiohttp.TCPConnector(
+                    limit=MAX_CONNECTIONS, limit_per_host=MAX_CONNECTIONS_PER_HOST
+                ),
+            )
+            self._session = session
+            self._loop = loop
+            if stale_session is not None:
+                await self._close_stale_session(stale_session, stale_loop)
+        return session
+
+    async def _close_stale_session(
+        self,
+        session: aiohttp.ClientSession,
+        loop: Optional[asyncio.AbstractEventLoop],
+    ):
+        """Closes a session replaced because it was created in another loop"""
+        if session.closed:
+            return
+        if (
+            loop is not None
+            and loop.is_running()
+            and loop is not asyncio.get_running_loop()
+        ):
+            # Still serving another thread, its connections are closed there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        # Sockets of a closed loop can no longer be closed through it, closing the
+        # session still releases the connector and its pooled connections
+        await session.close()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+HTTP_SESSION_SERVICE = HttpSessionService()
@@ -2,7 +2,8 @@ import asyncio
 import json
 import chromadb
 from chromadb.config import Settings
-from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+from services.embedding_service import get_embedding_function
 
 
 class IconFinderService:
@@ -26,9 +27,7 @@ class IconFinderService:
         self._initialized = True
 
     def _initialize_icons_collection(self):
-        self.embedding_function = ONNXMiniLM_L6_V2()
-        self.embedding_function.DOWNLOAD_PATH = "chroma/models"
-        self.embedding_function._download_model_if_not_exists()
+        self.embedding_function = get_embedding_function()
         try:
             self.collection = self.client.get_collection(
                 self.collection_name, embedding_function=self.embedding_function
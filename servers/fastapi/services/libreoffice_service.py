@@ -0,0 +1,484 @@
+import asyncio
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+import uuid
+import zipfile
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+from utils.get_env import (
+    get_libreoffice_max_conversions_env,
+    get_libreoffice_pool_size_env,
+    get_libreoffice_timeout_env,
+)
+from utils.parsers import parse_int_or_none
+
+DEFAULT_POOL_SIZE = 1
+DEFAULT_MAX_CONVERSIONS = 50
+DEFAULT_CONVERSION_TIMEOUT = 500
+INSTANCE_START_TIMEOUT = 60
+HEALTH_CHECK_TIMEOUT = 10
+
+# Debian installs the UNO bridge for the system python, outside of a virtualenv
+UNO_PATHS = ["/usr/lib/python3/dist-packages", "/usr/lib/libreoffice/program"]
+
+PDF_EXPORT_FILTERS = {
+    ".ppt": "impress_pdf_Export",
+    ".pptx": "impress_pdf_Export",
+    ".odp": "impress_pdf_Export",
+    ".doc": "writer_pdf_Export",
+    ".docx": "writer_pdf_Export",
+    ".odt": "writer_pdf_Export",
+    ".xls": "calc_pdf_Export",
+    ".xlsx": "calc_pdf_Export",
+    ".ods": "calc_pdf_Export",
+}
+
+# Packages whose font references are typeface attributes, aliased per job by rewriting
+FONT_ALIASED_PACKAGE_EXTENSIONS = {".pptx"}
+
+
+def import_uno():
+    """Returns the uno module, or None when the UNO bridge is not installed."""
+    try:
+        import uno
+
+        return uno
+    except ImportError:
+        pass
+
+    for path in UNO_PATHS:
+        if os.path.isdir(path) and path not in sys.path:
+            sys.path.append(path)
+    try:
+        import uno
+
+        return uno
+    except ImportError:
+        return None
+
+
+def get_soffice_binary() -> str:
+    return shutil.which("soffice") or shutil.which("libreoffice") or "libreoffice"
+
+
+def write_font_alias_config(path: str, font_aliases: Dict[str, str]):
+    """
+    Fontconfig file aliasing variant family names to their normalized root families.
+    Names come from uploaded files, so they are escaped before going into the XML.
+    """
+    with open(path, "w", encoding="utf-8") as cfg:
+        cfg.write("""<?xml version='1.0'?>
+<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">
+<fontconfig>
+  <include>/etc/fonts/fonts.conf</include>
+""")
+        for src, dst in font_aliases.items():
+            cfg.write(f"""
+  <match target="pattern">
+    <test name="family" compare="eq">
+      <string>{escape(src)}</string>
+    </test>
+    <edit name="family" mode="assign" binding="strong">
+      <string>{escape(dst)}</string>
+    </edit>
+  </match>
+""")
+        cfg.write("\n</fontconfig>\n")
+
+
+def _alias_typefaces(xml_bytes: bytes, font_aliases: Dict[str, str]) -> bytes:
+    try:
+        root = etree.fromstring(xml_bytes)
+    except etree.XMLSyntaxError:
+        return xml_bytes
+    aliased = False
+    for element in root.xpath("//*[@typeface]"):
+        alias = font_aliases.get(element.get("typeface"))
+        if alias:
+            element.set("typeface", alias)
+            aliased = True
+    if not aliased:
+        return xml_bytes
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def write_font_aliased_package(
+    input_path: str, output_path: str, font_aliases: Dict[str, str]
+):
+    """Copies a PPTX with every typeface in font_aliases renamed to its alias."""
+    with zipfile.ZipFile(input_path) as source, zipfile.ZipFile(
+        output_path, "w", zipfile.ZIP_DEFLATED
+    ) as target:
+        for item in source.infolist():
+            data = source.read(item)
+            if item.filename.endswith(".xml") and b"typeface=" in data:
+                data = _alias_typefaces(data, font_aliases)
+            target.writestr(item, data)
+
+
+def _get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _make_property(uno, name: str, value):
+    prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+class LibreOfficeInstance:
+    """A headless soffice process accepting UNO connections on a local socket."""
+
+    def __init__(self, uno, font_aliases: Dict[str, str], font_generation: int):
+        self.uno = uno
+        self.font_aliases = font_aliases
+        self.font_generation = font_generation
+        self.port = _get_free_port()
+        self.profile_dir = tempfile.mkdtemp(prefix="soffice_profile_")
+        self.conversions = 0
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._desktop = None
+
+    def has_font_aliases(self, font_aliases: Dict[str, str]) -> bool:
+        return all(
+            self.font_aliases.get(src) == dst for src, dst in font_aliases.items()
+        )
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    def _connect(self):
+        local_context = self.uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        context = resolver.resolve(
+            f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+        )
+        self._desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    async def start(self):
+        # Lives in the profile directory so it is removed together with the instance
+        font_config_path = os.path.join(self.profile_dir, "fonts.conf")
+        write_font_alias_config(font_config_path, self.font_aliases)
+        env = os.environ.copy()
+        env["FONTCONFIG_FILE"] = font_config_path
+        self._process = await asyncio.create_subprocess_exec(
+            get_soffice_binary(),
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--norestore",
+            "--nofirststartwizard",
+            f"-env:UserInstallation=file://{self.profile_dir}",
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+        )
+
+        deadline = time.monotonic() + INSTANCE_START_TIMEOUT
+        while True:
+            if not self.is_running:
+                raise Exception("LibreOffice exited while starting")
+            try:
+                await asyncio.to_thread(self._connect)
+                print(f"LibreOffice instance listening on port {self.port}")
+                return
+            except Exception:
+                if time.monotonic() > deadline:
+                    await self.stop()
+                    raise Exception("LibreOffice did not start in time")
+                await asyncio.sleep(0.25)
+
+    async def is_healthy(self) -> bool:
+        if not self.is_running or self._desktop is None:
+            return False
+        try:
+            await asyncio.wait_for(
+                asyncio.to_thread(self._desktop.getComponents), HEALTH_CHECK_TIMEOUT
+            )
+            return True
+        except Exception:
+            return False
+
+    def _convert(self, input_path: str, output_path: str, filter_name: str):
+        uno = self.uno
+        document = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(input_path)),
+            "_blank",
+            0,
+            (_make_property(uno, "Hidden", True),),
+        )
+        if document is None:
+            raise Exception(f"LibreOffice could not open {input_path}")
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(os.path.abspath(output_path)),
+                (_make_property(uno, "FilterName", filter_name),),
+            )
+        finally:
+            document.close(True)
+
+    async def convert(
+        self, input_path: str, output_path: str, filter_name: str, timeout: float
+    ):
+        self.conversions += 1
+        try:
+            await asyncio.wait_for(
+                asyncio.to_thread(self._convert, input_path, output_path, filter_name),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            # Killing soffice also releases the thread blocked on the UNO call
+            await self.stop()
+            raise
+
+    async def stop(self):
+        if self.is_running:
+            self._process.kill()
+            await self._process.wait()
+        self._desktop = None
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class LibreOfficeService:
+    """
+    Converts office documents to PDF on a pool of long-lived headless soffice instances,
+    avoiding the multi-second cold start of a new process per conversion. Instances are
+    health checked before use, killed on timeout or cancellation and recycled after
+    max_conversions jobs or after fonts are installed. Font aliases of PPTX files are
+    applied to a copy of the file, so any instance converts them; other formats need an
+    instance whose fontconfig was started with the aliases. Without the UNO bridge, or
+    with a pool size of 0, each conversion runs a one-shot soffice subprocess instead.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        max_conversions: Optional[int] = None,
+        timeout: Optional[int] = None,
+    ):
+        self.pool_size = DEFAULT_POOL_SIZE if pool_size is None else pool_size
+        self.max_conversions = max_conversions or DEFAULT_MAX_CONVERSIONS
+        self.timeout = timeout or DEFAULT_CONVERSION_TIMEOUT
+        self._uno = None
+        self._uno_checked = False
+        # One slot per instance, held for a whole conversion including its startup
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[LibreOfficeInstance] = []
+        self._instances: List[LibreOfficeInstance] = []
+        self._font_generation = 0
+        self._one_shot_semaphore: Optional[asyncio.Semaphore] = None
+
+    def get_uno(self):
+        if not self._uno_checked:
+            self._uno_checked = True
+            self._uno = import_uno()
+            if self._uno is None and self.pool_size > 0:
+                print("UNO bridge not found, converting with one-shot LibreOffice")
+        return self._uno
+
+    def fonts_installed(self):
+        """Running instances do not see newly installed fonts, they restart on next use."""
+        self._font_generation += 1
+
+    async def _is_reusable(
+        self, instance: LibreOfficeInstance, font_aliases: Dict[str, str]
+    ) -> bool:
+        return (
+            instance.font_generation == self._font_generation
+            and instance.conversions < self.max_conversions
+            and instance.has_font_aliases(font_aliases)
+            and await instance.is_healthy()
+        )
+
+    async def _acquire(self, font_aliases: Dict[str, str]) -> LibreOfficeInstance:
+        """Takes an idle instance that fits the job or starts one. Caller holds a slot."""
+        while self._idle:
+            instance = self._idle.pop()
+            try:
+                if await self._is_reusable(instance, font_aliases):
+                    return instance
+            except BaseException:
+                # Cancelled mid check, the instance is neither idle nor in use anymore
+                await self._discard(instance)
+                raise
+            # Stale fonts, worn out or unresponsive, a fresh instance takes its place
+            await self._discard(instance)
+
+        # Aliases of this job only, names from other uploads never reach its fontconfig
+        instance = LibreOfficeInstance(self._uno, font_aliases, self._font_generation)
+        self._instances.append(instance)
+        try:
+            await instance.start()
+        except BaseException:
+            await self._discard(instance)
+            raise
+        return instance
+
+    async def _discard(self, instance: LibreOfficeInstance):
+        if instance in self._instances:
+            self._instances.remove(instance)
+        await instance.stop()
+
+    async def _convert_with_pool(
+        self,
+        input_path: str,
+        output_path: str,
+        filter_name: str,
+        font_aliases: Dict[str, str],
+        timeout: float,
+    ):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        # Waiting for a free instance counts against the same time limit
+        await asyncio.wait_for(self._slots.acquire(), timeout)
+
+        instance = None
+        reusable = False
+        try:
+            instance = await self._acquire(font_aliases)
+            try:
+                await instance.convert(input_path, output_path, filter_name, timeout)
+                reusable = True
+            except asyncio.TimeoutError:
+                raise
+            except Exception:
+                # The document may have crashed soffice, check before reuse
+                reusable = await instance.is_healthy()
+                raise
+        finally:
+            # Timed out or cancelled conversions may still be running inside soffice
+            if instance is not None:
+                if reusable and instance.is_running:
+                    self._idle.append(instance)
+                else:
+                    await self._discard(instance)
+            # Frees the slot even when the instance is gone, so a waiter starts a new one
+            self._slots.release()
+
+    async def _convert_one_shot(
+        self,
+        input_path: str,
+        output_dir: str,
+        font_aliases: Dict[str, str],
+        timeout: float,
+    ) -> str:
+        if self._one_shot_semaphore is None:
+            self._one_shot_semaphore = asyncio.Semaphore(max(1, self.pool_size))
+
+        fd, font_config_path = tempfile.mkstemp(prefix="fonts_alias_", suffix=".conf")
+        os.close(fd)
+        write_font_alias_config(font_config_path, font_aliases)
+        env = os.environ.copy()
+        env["FONTCONFIG_FILE"] = font_config_path
+
+        try:
+            async with self._one_shot_semaphore:
+                process = await asyncio.create_subprocess_exec(
+                    get_soffice_binary(),
+                    "--headless",
+                    "--convert-to",
+                    "pdf",
+                    "--outdir",
+                    output_dir,
+                    input_path,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=env,
+                )
+                try:
+                    stdout, stderr = await asyncio.wait_for(
+                        process.communicate(), timeout
+                    )
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    raise
+        finally:
+            os.remove(font_config_path)
+
+        print(f"LibreOffice PDF conversion output: {stdout.decode(errors='ignore')}")
+        if process.returncode != 0:
+            raise Exception(
+                f"LibreOffice PDF conversion failed: {stderr.decode(errors='ignore')}"
+            )
+        if stderr:
+            print(
+                f"LibreOffice PDF conversion warnings: {stderr.decode(errors='ignore')}"
+            )
+        return os.path.join(
+            output_dir, f"{os.path.splitext(os.path.basename(input_path))[0]}.pdf"
+        )
+
+    async def convert_to_pdf(
+        self,
+        input_path: str,
+        output_dir: str,
+        font_aliases: Optional[Dict[str, str]] = None,
+        fonts_installed: bool = False,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Converts input_path to a PDF in output_dir and returns its path.
+        Raises asyncio.TimeoutError if the conversion takes longer than timeout seconds.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        font_aliases = font_aliases or {}
+        timeout = timeout or self.timeout
+
+        if self.pool_size <= 0 or self.get_uno() is None:
+            return await self._convert_one_shot(
+                input_path, output_dir, font_aliases, timeout
+            )
+
+        if fonts_installed:
+            self.fonts_installed()
+        extension = os.path.splitext(input_path)[1].lower()
+        output_path = os.path.join(output_dir, f"{uuid.uuid4()}.pdf")
+        filter_name = PDF_EXPORT_FILTERS.get(extension, "impress_pdf_Export")
+        if not font_aliases or extension not in FONT_ALIASED_PACKAGE_EXTENSIONS:
+            await self._convert_with_pool(
+                input_path, output_path, filter_name, font_aliases, timeout
+            )
+            return output_path
+
+        # Aliases applied to this job only, so instances are reused across uploads
+        with tempfile.TemporaryDirectory(prefix="font_aliased_") as aliased_dir:
+            aliased_path = os.path.join(aliased_dir, os.path.basename(input_path))
+            await asyncio.to_thread(
+                write_font_aliased_package, input_path, aliased_path, font_aliases
+            )
+            await self._convert_with_pool(
+                aliased_path, output_path, filter_name, {}, timeout
+            )
+        return output_path
+
+    async def shutdown(self):
+        instances, self._instances = self._instances, []
+        self._idle = []
+        await asyncio.gather(
+            *[instance.stop() for instance in instances], return_exceptions=True
+        )
+
+
+LIBREOFFICE_SERVICE = LibreOfficeService(
+    pool_size=parse_int_or_none(get_libreoffice_pool_size_env()),
+    max_conversions=parse_int_or_none(get_libreoffice_max_conversions_env()),
+    timeout=parse_int_or_none(get_libreoffice_timeout_env()),
+)
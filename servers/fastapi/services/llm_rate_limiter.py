@@ -0,0 +1,43 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from enums.llm_provider import LLMProvider
+from utils.get_env import get_llm_max_concurrent_requests_env
+from utils.llm_provider import get_llm_provider
+from utils.parsers import parse_int_or_none
+
+# Local models serve one request at a time, hosted APIs tolerate more
+DEFAULT_MAX_CONCURRENT_REQUESTS = {
+    LLMProvider.OLLAMA: 1,
+    LLMProvider.OPENAI: 8,
+    LLMProvider.GOOGLE: 8,
+    LLMProvider.ANTHROPIC: 4,
+    LLMProvider.CUSTOM: 4,
+    LLMProvider.ZAI: 4,
+}
+
+
+class LLMRateLimiter:
+    """Caps the number of in-flight LLM requests per provider for fan-out workloads."""
+
+    def __init__(self):
+        self._semaphores: Dict[LLMProvider, asyncio.Semaphore] = {}
+
+    def get_max_concurrent_requests(self, provider: LLMProvider) -> int:
+        return parse_int_or_none(
+            get_llm_max_concurrent_requests_env()
+        ) or DEFAULT_MAX_CONCURRENT_REQUESTS.get(provider, 4)
+
+    @asynccontextmanager
+    async def limit(self):
+        provider = get_llm_provider()
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(
+                self.get_max_concurrent_requests(provider)
+            )
+        async with self._semaphores[provider]:
+            yield
+
+
+LLM_RATE_LIMITER = LLMRateLimiter()
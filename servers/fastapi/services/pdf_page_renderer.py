@@ -0,0 +1,49 @@
+import os
+from typing import List
+
+import pdfplumber
+from PIL import Image
+
+from enums.page_image_format import PageImageFormat
+from models.page_image_options import PageImageOptions
+
+
+def get_pdf_page_count(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def save_page_image(image: Image.Image, image_path: str, options: PageImageOptions):
+    if options.format == PageImageFormat.PNG:
+        image.save(image_path, format="PNG")
+    elif options.format == PageImageFormat.WEBP:
+        image.save(image_path, format="WEBP", quality=options.quality, method=4)
+    else:
+        image.convert("RGB").save(
+            image_path, format="JPEG", quality=options.quality, optimize=True
+        )
+
+
+def render_pdf_pages(
+    file_path: str,
+    page_numbers: List[int],
+    output_dir: str,
+    options: PageImageOptions,
+) -> List[str]:
+    """
+    Renders the given 1-based pages of a PDF into output_dir and returns the image paths.
+    Entry point used by PAGE_IMAGE_PROCESS_POOL workers, each worker gets a contiguous
+    batch of pages so the PDF is opened once per batch.
+    """
+    image_paths = []
+    with pdfplumber.open(file_path) as pdf:
+        for page_number in page_numbers:
+            page = pdf.pages[page_number - 1]
+            image = page.to_image(resolution=options.resolution).original
+            image_path = os.path.join(
+                output_dir, f"page_{page_number}.{options.extension}"
+            )
+            save_page_image(image, image_path, options)
+            image_paths.append(image_path)
+            page.flush_cache()
+    return image_paths
@@ -0,0 +1,119 @@
+from collections import Counter
+from typing import List, Tuple
+
+import pdfplumber
+
+# Pages sampled to decide whether a PDF is simple enough for the fast engine
+POLICY_SAMPLE_PAGES = 5
+MIN_CHARS_PER_PAGE = 200
+MAX_IMAGE_AREA_RATIO = 0.25
+MAX_RULING_LINES_PER_PAGE = 40
+
+HEADING_SIZE_RATIO = 1.15
+MAX_HEADING_LENGTH = 120
+
+
+def is_text_dominant_pdf(file_path: str) -> bool:
+    """
+    True when sampled pages are mostly running text, meaning no scanned pages,
+    large figures or ruled tables that need Docling's layout pipeline.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        pages = pdf.pages
+        if not pages:
+            return False
+
+        step = max(1, len(pages) // POLICY_SAMPLE_PAGES)
+        for page in pages[::step][:POLICY_SAMPLE_PAGES]:
+            if len(page.chars) < MIN_CHARS_PER_PAGE:
+                return False
+
+            page_area = float(page.width * page.height) or 1.0
+            image_area = sum(
+                float(image["width"] * image["height"]) for image in page.images
+            )
+            if image_area / page_area > MAX_IMAGE_AREA_RATIO:
+                return False
+
+            if len(page.lines) + len(page.rects) > MAX_RULING_LINES_PER_PAGE:
+                return False
+
+    return True
+
+
+def _get_line_size(line: dict) -> float:
+    sizes = [
+        round(char["size"], 1) for char in line.get("chars", []) if char["text"].strip()
+    ]
+    if not sizes:
+        return 0.0
+    return Counter(sizes).most_common(1)[0][0]
+
+
+def _is_bold_line(line: dict) -> bool:
+    chars = [char for char in line.get("chars", []) if char["text"].strip()]
+    return bool(chars) and all("bold" in char["fontname"].lower() for char in chars)
+
+
+def extract_pdf_markdown(file_path: str) -> Tuple[str, int]:
+    """
+    Extracts text from a PDF with pdfplumber and marks headings using font size heuristics:
+    lines noticeably larger than the body text become headings, ranked by size.
+    Returns the markdown and the number of pages.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        page_lines: List[List[Tuple[str, float, bool]]] = []
+        size_counts: Counter = Counter()
+
+        for page in pdf.pages:
+            lines = []
+            for line in page.extract_text_lines(return_chars=True):
+                text = line["text"].strip()
+                if not text:
+                    continue
+                size = _get_line_size(line)
+                size_counts[size] += len(text)
+                lines.append((text, size, _is_bold_line(line)))
+            page_lines.append(lines)
+            # Parsed page objects hold every char, release them as we go
+            page.flush_cache()
+
+        page_count = len(pdf.pages)
+
+    if not size_counts:
+        return "", page_count
+
+    body_size = size_counts.most_common(1)[0][0]
+    heading_sizes = sorted(
+        {size for size in size_counts if size >= body_size * HEADING_SIZE_RATIO},
+        reverse=True,
+    )
+    heading_levels = {
+        size: min(index + 1, 3) for index, size in enumerate(heading_sizes)
+    }
+
+    blocks: List[str] = []
+    paragraph: List[str] = []
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.append(" ".join(paragraph))
+            paragraph.clear()
+
+    for lines in page_lines:
+        for text, size, is_bold in lines:
+            level = heading_levels.get(size)
+            if level is None and is_bold and size >= body_size:
+                level = 4
+            if level and len(text) <= MAX_HEADING_LENGTH:
+                flush_paragraph()
+                blocks.append(f"{'#' * level} {text}")
+                continue
+
+            paragraph.append(text)
+            # A line ending a sentence usually ends the paragraph in extracted text
+            if text.endswith((".", "!", "?", ":")):
+                flush_paragraph()
+        flush_paragraph()
+
+    return "\n\n".join(blocks), page_count
@@ -0,0 +1,295 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from models.pptx_models import PptxBoxShapeEnum, PptxPictureTransformModel
+from services.process_pool_service import PPTX_IMAGE_PROCESS_POOL
+from utils.asset_directory_utils import get_cache_directory
+from utils.file_utils import get_file_hash
+from utils.get_env import get_pptx_image_cache_persist_env
+from utils.image_utils import (
+    clip_image,
+    create_circle_image,
+    fit_image,
+    invert_image,
+    round_image_corners,
+    set_image_opacity,
+)
+from utils.parsers import parse_bool_or_none
+
+# Bump when transforms change so persisted images are not reused
+PICTURE_TRANSFORM_VERSION = 3
+
+# Below this many images (or with a single worker) the pool costs more than it saves
+MIN_IMAGES_FOR_POOL = 2
+PICTURE_TRANSFORM_TIMEOUT = 120
+
+
+# Sources in these formats are photos, re-encoded as JPEG when fully opaque
+PHOTO_FORMATS = {"JPEG", "MPO", "WEBP"}
+# Pillow reads only the header of these (EMF included), they are embedded as is
+VECTOR_FORMATS = {"WMF"}
+
+
+def has_transparency(image: Image.Image) -> bool:
+    if image.mode in ("RGBA", "LA"):
+        return image.getchannel("A").getextrema()[0] < 255
+    return image.mode == "P" and "transparency" in image.info
+
+
+def save_picture(
+    image: Image.Image, output_dir: str, source_format: Optional[str], quality: int
+) -> str:
+    if source_format in PHOTO_FORMATS and not has_transparency(image):
+        output_path = os.path.join(output_dir, f"{uuid.uuid4()}.jpg")
+        image.convert("RGB").save(
+            output_path, format="JPEG", quality=quality, optimize=True
+        )
+    else:
+        output_path = os.path.join(output_dir, f"{uuid.uuid4()}.png")
+        image.save(output_path, format="PNG")
+    return output_path
+
+
+def downscale_picture(
+    image: Image.Image, transform: PptxPictureTransformModel
+) -> Optional[Image.Image]:
+    """Image resized to cover its box at transform.dpi, None if it is not larger"""
+    if transform.width <= 0 or transform.height <= 0:
+        return None
+
+    # Box sizes are in points, 72 per inch
+    target_width = transform.width * transform.dpi / 72
+    target_height = transform.height * transform.dpi / 72
+    scale = max(target_width / image.width, target_height / image.height)
+    if scale >= 1:
+        return None
+
+    if image.mode not in ("RGB", "RGBA", "L"):
+        image = image.convert("RGBA")
+    return image.resize(
+        (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+        Image.LANCZOS,
+    )
+
+
+def get_render_scale(image: Image.Image, transform: PptxPictureTransformModel) -> float:
+    """
+    Pixels per point pictures with effects are rendered at: transform.dpi, limited to
+    what the source can cover without upscaling, and never below the 72 dpi box size.
+    """
+    if transform.width <= 0 or transform.height <= 0:
+        return 1.0
+    source_scale = min(image.width / transform.width, image.height / transform.height)
+    return max(1.0, min(transform.dpi / 72, source_scale))
+
+
+def apply_picture_transform(
+    image_path: str, transform: PptxPictureTransformModel, output_dir: str
+) -> Optional[str]:
+    """
+    Processes image_path for its picture box and saves the result to output_dir.
+    Pictures without effects that already fit their box are returned as is.
+    """
+    try:
+        image = Image.open(image_path)
+    except:
+        print(f"Could not open image: {image_path}")
+        return None
+
+    source_format = image.format
+    if source_format in VECTOR_FORMATS:
+        return image_path
+    if not transform.has_effects:
+        downscaled_image = downscale_picture(image, transform)
+        if downscaled_image is None:
+            return image_path
+        return save_picture(
+            downscaled_image, output_dir, source_format, transform.quality
+        )
+
+    # Box sizes and radii are in points, scaled so effects are rendered at the target dpi
+    scale = get_render_scale(image, transform)
+    width = round(transform.width * scale)
+    height = round(transform.height * scale)
+    border_radius = transform.border_radius and [
+        round(radius * scale) for radius in transform.border_radius
+    ]
+
+    image = image.convert("RGBA")
+    # ? Applying border radius twice to support both clip and object fit
+    if transform.border_radius:
+        image = round_image_corners(image, transform.border_radius)
+    if transform.object_fit:
+        image = fit_image(image, width, height, transform.object_fit)
+    elif transform.clip:
+        image = clip_image(image, width, height)
+    if border_radius:
+        image = round_image_corners(image, border_radius)
+    if transform.shape == PptxBoxShapeEnum.CIRCLE:
+        image = create_circle_image(image)
+    if transform.invert:
+        image = invert_image(image)
+    if transform.opacity:
+        image = set_image_opacity(image, transform.opacity)
+    return save_picture(image, output_dir, source_format, transform.quality)
+
+
+class PictureTransformCache:
+    """
+    Processed pictures keyed by source image hash, transform parameters and box size.
+    Repeated logos and backgrounds are processed once per export, and when
+    PPTX_IMAGE_CACHE_PERSIST is enabled, once across exports.
+    """
+
+    def __init__(self, temp_dir: str, persist: Optional[bool] = None):
+        self._temp_dir = temp_dir
+        self._persist = (
+            persist
+            if persist is not None
+            else bool(parse_bool_or_none(get_pptx_image_cache_persist_env()))
+        )
+        self._file_hashes: Dict[str, str] = {}
+        self._processed: Dict[str, Optional[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        # Sizes of processed sources and of what is embedded instead
+        self.source_bytes = 0
+        self.embedded_bytes = 0
+
+    def get_file_hash(self, image_path: str) -> Optional[str]:
+        if image_path not in self._file_hashes:
+            try:
+                self._file_hashes[image_path] = get_file_hash(image_path)
+            except OSError:
+                return None
+        return self._file_hashes[image_path]
+
+    def get_key(
+        self, image_path: str, transform: PptxPictureTransformModel
+    ) -> Optional[str]:
+        file_hash = self.get_file_hash(image_path)
+        if not file_hash:
+            return None
+        transform_json = transform.model_dump_json()
+        return hashlib.sha256(
+            f"{PICTURE_TRANSFORM_VERSION}:{file_hash}:{transform_json}".encode("utf-8")
+        ).hexdigest()
+
+    def get_persisted_path(self, key: str, extension: str) -> str:
+        return os.path.join(get_cache_directory("pictures"), f"{key}{extension}")
+
+    def get(self, key: str) -> Optional[str]:
+        if key in self._processed:
+            return self._processed[key]
+        if self._persist:
+            for extension in (".png", ".jpg"):
+                persisted_path = self.get_persisted_path(key, extension)
+                if os.path.exists(persisted_path):
+                    self._processed[key] = persisted_path
+                    return persisted_path
+        raise KeyError(key)
+
+    def set(self, key: str, image_path: str, processed_path: Optional[str]):
+        if processed_path and processed_path != image_path:
+            self.source_bytes += os.path.getsize(image_path)
+            self.embedded_bytes += os.path.getsize(processed_path)
+            if self._persist:
+                persisted_path = self.get_persisted_path(
+                    key, os.path.splitext(processed_path)[1]
+                )
+                temp_path = f"{persisted_path}.{uuid.uuid4()}.tmp"
+                shutil.copyfile(processed_path, temp_path)
+                os.replace(temp_path, persisted_path)
+        self._processed[key] = processed_path
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.source_bytes - self.embedded_bytes
+
+    def get_or_create(
+        self, image_path: str, transform: PptxPictureTransformModel
+    ) -> Optional[str]:
+        key = self.get_key(image_path, transform)
+        if key is None:
+            print(f"Could not open image: {image_path}")
+            return None
+
+        try:
+            processed_path = self.get(key)
+            self.hits += 1
+            return processed_path
+        except KeyError:
+            self.misses += 1
+
+        processed_path = apply_picture_transform(image_path, transform, self._temp_dir)
+        self.set(key, image_path, processed_path)
+        return processed_path
+
+    async def preprocess(
+        self, pictures: List[Tuple[str, PptxPictureTransformModel]]
+    ) -> None:
+        """
+        Processes every picture not cached yet on PPTX_IMAGE_PROCESS_POOL, so slides
+        are assembled from ready files. Failed pictures are left to get_or_create.
+        """
+        pending: Dict[str, Tuple[str, PptxPictureTransformModel]] = {}
+        for image_path, transform in pictures:
+            key = await asyncio.to_thread(self.get_key, image_path, transform)
+            if key is None or key in pending:
+                continue
+            try:
+                self.get(key)
+            except KeyError:
+                pending[key] = (image_path, transform)
+
+        if not pending:
+            return
+
+        # Bounds decoded images held in memory when processing in threads
+        semaphore = asyncio.Semaphore(PPTX_IMAGE_PROCESS_POOL.max_workers)
+
+        async def process(image_path, transform):
+            async with semaphore:
+                return await run_transform(image_path, transform)
+
+        async def run_transform(image_path, transform):
+            if (
+                len(pending) < MIN_IMAGES_FOR_POOL
+                or PPTX_IMAGE_PROCESS_POOL.max_workers < 2
+            ):
+                return await asyncio.to_thread(
+                    apply_picture_transform, image_path, transform, self._temp_dir
+                )
+            return await PPTX_IMAGE_PROCESS_POOL.run(
+                apply_picture_transform,
+                image_path,
+                transform,
+                self._temp_dir,
+                timeout=PICTURE_TRANSFORM_TIMEOUT,
+            )
+
+        keys = list(pending.keys())
+        results = await asyncio.gather(
+            *[process(*pending[key]) for key in keys],
+            return_exceptions=True,
+        )
+        for key, result in zip(keys, results):
+            if (
+                isinstance(result, asyncio.CancelledError)
+                and asyncio.current_task().cancelling()
+            ):
+                raise result
+            # Worker errors, timeouts and jobs cancelled by a pool recycle
+            if isinstance(result, (Exception, asyncio.CancelledError)):
+                print(f"Could not preprocess image {pending[key][0]}: {result!r}")
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            await asyncio.to_thread(self.set, key, pending[key][0], result)
+            self.misses += 1
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from typing import IO, Optional, Union
+
+from models.pptx_export_timings import PptxExportTimings
+from services.pptx_presentation_creator import PptxPresentationCreator
+from utils.get_env import get_pptx_export_concurrency_env
+from utils.parsers import parse_int_or_none
+
+DEFAULT_MAX_CONCURRENT_EXPORTS = 2
+
+
+class PptxExportService:
+    """
+    Assembles and saves PPTX files in worker threads so large exports do not block
+    the event loop. At most PPTX_EXPORT_CONCURRENCY builds run at once, others wait.
+    """
+
+    def __init__(self):
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def get_max_concurrent_exports(self) -> int:
+        return (
+            parse_int_or_none(get_pptx_export_concurrency_env())
+            or DEFAULT_MAX_CONCURRENT_EXPORTS
+        )
+
+    def _build_and_save(
+        self, pptx_creator: PptxPresentationCreator, pptx_path: Union[str, IO[bytes]]
+    ):
+        pptx_creator.build_ppt()
+        pptx_creator.save(pptx_path)
+
+    async def export(
+        self, pptx_creator: PptxPresentationCreator, pptx_path: Union[str, IO[bytes]]
+    ) -> PptxExportTimings:
+        """Builds the PPTX into pptx_path, which may be a file path or a binary stream"""
+        # Downloads and image preprocessing are already async or pooled
+        await pptx_creator.prepare_assets()
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.get_max_concurrent_exports())
+
+        queued_at = time.perf_counter()
+        async with self._semaphore:
+            started_at = time.perf_counter()
+            await asyncio.to_thread(self._build_and_save, pptx_creator, pptx_path)
+            finished_at = time.perf_counter()
+
+        timings = PptxExportTimings(
+            queue_wait_ms=(started_at - queued_at) * 1000,
+            build_ms=(finished_at - started_at) * 1000,
+        )
+        target = pptx_path if isinstance(pptx_path, str) else "stream"
+        print(
+            f"Exported PPTX to {target} after waiting {timings.queue_wait_ms:.0f} ms, "
+            f"built in {timings.build_ms:.0f} ms"
+        )
+        return timings
+
+
+PPTX_EXPORT_SERVICE = PptxExportService()
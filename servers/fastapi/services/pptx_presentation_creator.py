@@ -1,5 +1,8 @@
+import copy
+import io
 import os
-from typing import List, Optional
+import threading
+from typing import IO, Callable, Dict, List, Optional, Union
 from lxml import etree
 from services.html_to_text_runs_service import (
     parse_html_text_to_text_runs as parse_inline_html_to_runs,
@@ -9,9 +12,10 @@ from pptx import Presentation
 from pptx.shapes.autoshape import Shape
 from pptx.slide import Slide
 from pptx.text.text import _Paragraph, TextFrame, Font, _Run
+from pptx.dml.fill import FillFormat
+from pptx.dml.line import LineFormat
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 from lxml.etree import fromstring, tostring
-from PIL import Image
 from pptx.oxml.xmlchemy import OxmlElement
 
 from pptx.util import Pt
@@ -25,6 +29,7 @@ from models.pptx_models import (
     PptxFontModel,
     PptxParagraphModel,
     PptxPictureBoxModel,
+    PptxPictureTransformModel,
     PptxPositionModel,
     PptxPresentationModel,
     PptxShadowModel,
@@ -34,19 +39,36 @@ from models.pptx_models import (
     PptxTextBoxModel,
     PptxTextRunModel,
 )
+from services.picture_transform_service import PictureTransformCache
 from utils.download_helpers import download_files
-from utils.image_utils import (
-    clip_image,
-    create_circle_image,
-    fit_image,
-    invert_image,
-    round_image_corners,
-    set_image_opacity,
-)
-import uuid
+from utils.get_env import get_pptx_image_dpi_env, get_pptx_image_quality_env
+from utils.parsers import parse_int_or_none
 
 BLANK_SLIDE_LAYOUT = 6
 
+DEFAULT_PICTURE_DPI = 150
+DEFAULT_PICTURE_QUALITY = 85
+
+SLIDE_WIDTH = Pt(1280)
+SLIDE_HEIGHT = Pt(720)
+
+_base_presentation_blob: Optional[bytes] = None
+_base_presentation_lock = threading.Lock()
+
+
+def get_base_presentation() -> Presentation:
+    """New presentation cloned from the sized default template, packaged once per process"""
+    global _base_presentation_blob
+    with _base_presentation_lock:
+        if _base_presentation_blob is None:
+            ppt = Presentation()
+            ppt.slide_width = SLIDE_WIDTH
+            ppt.slide_height = SLIDE_HEIGHT
+            buffer = io.BytesIO()
+            ppt.save(buffer)
+            _base_presentation_blob = buffer.getvalue()
+    return Presentation(io.BytesIO(_base_presentation_blob))
+
 
 class PptxPresentationCreator:
 
@@ -56,9 +78,19 @@ class PptxPresentationCreator:
         self._ppt_model = ppt_model
         self._slide_models = ppt_model.slides
 
-        self._ppt = Presentation()
-        self._ppt.slide_width = Pt(1280)
-        self._ppt.slide_height = Pt(720)
+        self._picture_cache = PictureTransformCache(temp_dir)
+        self._picture_dpi = (
+            parse_int_or_none(get_pptx_image_dpi_env()) or DEFAULT_PICTURE_DPI
+        )
+        self._picture_quality = (
+            parse_int_or_none(get_pptx_image_quality_env()) or DEFAULT_PICTURE_QUALITY
+        )
+
+        self._ppt = get_base_presentation()
+
+        # Fonts, fills, strokes and shadows repeat across shapes, so their XML is
+        # built once with python-pptx and copied into every shape using them
+        self._xml_fragments: Dict[tuple, etree._Element] = {}
 
     def get_sub_element(self, parent, tagname, **kwargs):
         """Helper method to create XML elements"""
@@ -67,6 +99,15 @@ class PptxPresentationCreator:
         parent.append(element)
         return element
 
+    def get_xml_fragment(
+        self, key: tuple, build: Callable[[], etree._Element]
+    ) -> etree._Element:
+        fragment = self._xml_fragments.get(key)
+        if fragment is None:
+            fragment = build()
+            self._xml_fragments[key] = fragment
+        return copy.deepcopy(fragment)
+
     async def fetch_network_assets(self):
         image_urls = []
         models_with_network_asset: List[PptxPictureBoxModel] = []
@@ -102,7 +143,9 @@ class PptxPresentationCreator:
                         models_with_network_asset.append(each_shape)
 
         if image_urls:
-            image_paths = await download_files(image_urls, self._temp_dir)
+            image_paths = await download_files(
+                image_urls, self._temp_dir, use_cache=True
+            )
 
             for each_shape, each_image_path in zip(
                 models_with_network_asset, image_paths
@@ -111,9 +154,45 @@ class PptxPresentationCreator:
                     each_shape.picture.path = each_image_path
                     each_shape.picture.is_network = False
 
+    def get_picture_transform(
+        self, picture_model: PptxPictureBoxModel
+    ) -> PptxPictureTransformModel:
+        return PptxPictureTransformModel.from_picture_box(
+            picture_model, self._picture_dpi, self._picture_quality
+        )
+
+    def get_picture_transforms(self) -> List[tuple]:
+        pictures = []
+        shapes = list(self._ppt_model.shapes or [])
+        for slide_model in self._slide_models:
+            shapes.extend(slide_model.shapes)
+
+        for shape_model in shapes:
+            if type(shape_model) is PptxPictureBoxModel:
+                pictures.append(
+                    (shape_model.picture.path, self.get_picture_transform(shape_model))
+                )
+        return pictures
+
     async def create_ppt(self):
+        await self.prepare_assets()
+        self.build_ppt()
+
+    async def prepare_assets(self):
         await self.fetch_network_assets()
 
+        # Pillow work runs in parallel up front, slides are then assembled sequentially
+        pictures = self.get_picture_transforms()
+        await self._picture_cache.preprocess(pictures)
+        if pictures:
+            print(
+                f"Processed {self._picture_cache.misses} unique images "
+                f"for {len(pictures)} pictures, "
+                f"saved {self._picture_cache.bytes_saved / 1024 / 1024:.2f} MB"
+            )
+
+    def build_ppt(self):
+        """CPU bound slide assembly, run after prepare_assets"""
         for slide_model in self._slide_models:
             # Adding global shapes to slide
             if self._ppt_model.shapes:
@@ -177,47 +256,11 @@ class PptxPresentationCreator:
 
     def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
         image_path = picture_model.picture.path
-        if (
-            picture_model.clip
-            or picture_model.border_radius
-            or picture_model.invert
-            or picture_model.opacity
-            or picture_model.object_fit
-            or picture_model.shape
-        ):
-            try:
-                image = Image.open(image_path)
-            except:
-                print(f"Could not open image: {image_path}")
-                return
-
-            image = image.convert("RGBA")
-            # ? Applying border radius twice to support both clip and object fit
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.object_fit:
-                image = fit_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                    picture_model.object_fit,
-                )
-            elif picture_model.clip:
-                image = clip_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                )
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                image = create_circle_image(image)
-            if picture_model.invert:
-                image = invert_image(image)
-            if picture_model.opacity:
-                image = set_image_opacity(image, picture_model.opacity)
-            image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
-            image.save(image_path)
+        image_path = self._picture_cache.get_or_create(
+            image_path, self.get_picture_transform(picture_model)
+        )
+        if not image_path:
+            return
 
         margined_position = self.get_margined_position(
             picture_model.position, picture_model.margin
@@ -315,9 +358,22 @@ class PptxPresentationCreator:
         if not fill:
             shape.fill.background()
         else:
-            shape.fill.solid()
-            shape.fill.fore_color.rgb = RGBColor.from_string(fill.color)
-            self.set_fill_opacity(shape.fill, fill.opacity)
+            solid_fill = shape.fill._xPr.get_or_change_to_solidFill()
+            solid_fill.getparent().replace(
+                solid_fill,
+                self.get_xml_fragment(
+                    ("solidFill", *fill.model_dump().values()),
+                    lambda: self.build_solid_fill(fill),
+                ),
+            )
+
+    def build_solid_fill(self, fill_model: PptxFillModel):
+        sp_pr = OxmlElement("p:spPr")
+        fill = FillFormat.from_fill_parent(sp_pr)
+        fill.solid()
+        fill.fore_color.rgb = RGBColor.from_string(fill_model.color)
+        self.set_fill_opacity(fill, fill_model.opacity)
+        return sp_pr.solidFill
 
     def apply_stroke_to_shape(
         self, shape: Shape, stroke: Optional[PptxStrokeModel] = None
@@ -325,10 +381,23 @@ class PptxPresentationCreator:
         if not stroke or stroke.thickness == 0:
             shape.line.fill.background()
         else:
-            shape.line.fill.solid()
-            shape.line.fill.fore_color.rgb = RGBColor.from_string(stroke.color)
-            shape.line.width = Pt(stroke.thickness)
-            self.set_fill_opacity(shape.line.fill, stroke.opacity)
+            ln = shape._element.spPr.get_or_add_ln()
+            ln.getparent().replace(
+                ln,
+                self.get_xml_fragment(
+                    ("ln", *stroke.model_dump().values()),
+                    lambda: self.build_line(stroke),
+                ),
+            )
+
+    def build_line(self, stroke: PptxStrokeModel):
+        sp_pr = OxmlElement("p:spPr")
+        line = LineFormat(sp_pr)
+        line.fill.solid()
+        line.fill.fore_color.rgb = RGBColor.from_string(stroke.color)
+        line.width = Pt(stroke.thickness)
+        self.set_fill_opacity(line.fill, stroke.opacity)
+        return sp_pr.ln
 
     def apply_shadow_to_shape(
         self, shape: Shape, shadow: Optional[PptxShadowModel] = None
@@ -364,6 +433,17 @@ class PptxPresentationCreator:
                 sp_pr, f"{{{nsmap['a']}}}effectLst", nsmap=nsmap
             )
 
+        effect_list.append(
+            self.get_xml_fragment(
+                ("outerShdw", *(shadow.model_dump().values() if shadow else ())),
+                lambda: self.build_outer_shadow(shadow),
+            )
+        )
+
+    def build_outer_shadow(self, shadow: Optional[PptxShadowModel]):
+        nsmap = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+        effect_list = OxmlElement("a:effectLst")
+
         if shadow is None:
             # Apply shadow with zero values when shadow is None
             outer_shadow = etree.SubElement(
@@ -414,6 +494,8 @@ class PptxPresentationCreator:
                 nsmap=nsmap,
             )
 
+        return outer_shadow
+
     def set_fill_opacity(self, fill, opacity):
         if opacity is None or opacity >= 1.0:
             return
@@ -458,6 +540,23 @@ class PptxPresentationCreator:
         self.apply_font(paragraph.font, font)
 
     def apply_font(self, font: Font, font_model: PptxFontModel):
+        # Fonts are applied to freshly added runs and paragraphs, so the empty
+        # properties element is swapped for a copy of the prepared one
+        rPr = font._element
+        rPr.getparent().replace(
+            rPr,
+            self.get_xml_fragment(
+                (rPr.tag, *font_model.model_dump().values()),
+                lambda: self.build_font(rPr, font_model),
+            ),
+        )
+
+    def build_font(self, empty_rPr, font_model: PptxFontModel):
+        rPr = copy.deepcopy(empty_rPr)
+        self.apply_font_properties(Font(rPr), font_model)
+        return rPr
+
+    def apply_font_properties(self, font: Font, font_model: PptxFontModel):
         font.name = font_model.name
         font.color.rgb = RGBColor.from_string(font_model.color)
         font.italic = font_model.italic
@@ -478,8 +577,10 @@ class PptxPresentationCreator:
         except Exception as e:
             print(f"Could not apply strikethrough: {e}")
 
-    def save(self, path: str):
-        directory = os.path.dirname(path)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
+    def save(self, path: Union[str, IO[bytes]]):
+        """Saves to a file path or a writable binary stream"""
+        if isinstance(path, str):
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
         self._ppt.save(path)
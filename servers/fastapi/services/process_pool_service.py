@@ -0,0 +1,177 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from utils.get_env import (
+    get_document_parser_max_memory_mb_env,
+    get_document_parser_workers_env,
+    get_page_image_workers_env,
+    get_pptx_image_workers_env,
+)
+from utils.parsers import parse_int_or_none
+
+# Times a job is retried after a recycle it did not cause
+MAX_RESUBMITS = 2
+
+
+def _limit_worker_memory(max_memory_mb: Optional[int]):
+    if not max_memory_mb:
+        return
+    try:
+        import resource
+
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except Exception as e:
+        print(f"Could not set worker memory limit: {e}")
+
+
+def _initialize_worker(
+    max_memory_mb: Optional[int], initializer: Optional[Callable[[], Any]]
+):
+    _limit_worker_memory(max_memory_mb)
+    if initializer:
+        try:
+            initializer()
+        except Exception as e:
+            print(f"Could not initialize worker: {e}")
+
+
+def _noop():
+    return None
+
+
+def _warm_up_document_parser():
+    # Imported lazily so the API process does not need docling to create the pool
+    from services.docling_service import get_docling_service
+
+    get_docling_service()
+
+
+class ProcessPoolService:
+    """
+    Bounded pool of worker processes for CPU heavy work that must not run on the event loop.
+    Workers are spawned on first use (or by start), every worker is capped to max_memory_mb
+    of address space and runs initializer once so long-lived state stays warm across jobs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: Optional[int] = None,
+        max_memory_mb: Optional[int] = None,
+        initializer: Optional[Callable[[], Any]] = None,
+    ):
+        self.name = name
+        self.max_workers = max(1, max_workers or min(2, os.cpu_count() or 1))
+        self.max_memory_mb = max_memory_mb
+        self.initializer = initializer
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            print(f"Starting {self.name} process pool with {self.max_workers} workers")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_worker,
+                initargs=(self.max_memory_mb, self.initializer),
+            )
+        return self._executor
+
+    async def start(self):
+        """Spawns and initializes every worker ahead of the first job."""
+        executor = self._get_executor()
+        await asyncio.gather(
+            *[
+                asyncio.wrap_future(executor.submit(_noop))
+                for _ in range(self.max_workers)
+            ]
+        )
+        print(f"{self.name} process pool is warm")
+
+    async def run(
+        self,
+        callable: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Runs callable in a worker process and returns its result.
+        Raises asyncio.TimeoutError if it does not finish within timeout seconds,
+        in which case the pool is recycled so the stuck worker is killed.
+        Jobs that were cancelled or broken by a recycle caused by another job are
+        resubmitted to the fresh pool, up to MAX_RESUBMITS times.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        for attempt in range(MAX_RESUBMITS + 1):
+            executor = self._get_executor()
+            future = executor.submit(callable, *args)
+            remaining = None if deadline is None else max(0, deadline - loop.time())
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), remaining)
+            except asyncio.TimeoutError:
+                self.recycle(executor)
+                raise
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for exceeding memory) and took the pool
+                # down. Which job it ran is unknown, so every job is retried on a fresh
+                # pool and only a job that keeps breaking it fails.
+                if executor is self._executor:
+                    self.recycle(executor)
+                if attempt == MAX_RESUBMITS:
+                    raise
+            except asyncio.CancelledError:
+                # Only resubmit jobs cancelled by a recycle, not cancelled callers
+                if (
+                    asyncio.current_task().cancelling()
+                    or not future.cancelled()
+                    or attempt == MAX_RESUBMITS
+                ):
+                    raise
+            print(f"Resubmitting job to {self.name} process pool")
+
+    def recycle(self, executor: Optional[ProcessPoolExecutor] = None):
+        executor = executor or self._executor
+        if executor is None:
+            return
+        if executor is self._executor:
+            self._executor = None
+
+        print(f"Recycling {self.name} process pool")
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+DOCUMENT_PROCESS_POOL = ProcessPoolService(
+    "documents",
+    max_workers=parse_int_or_none(get_document_parser_workers_env()),
+    max_memory_mb=parse_int_or_none(get_document_parser_max_memory_mb_env()),
+    initializer=_warm_up_document_parser,
+)
+
+
+# Rendering is light on memory and scales with cores, no warm state is needed
+PAGE_IMAGE_PROCESS_POOL = ProcessPoolService(
+    "page images",
+    max_workers=parse_int_or_none(get_page_image_workers_env())
+    or min(4, os.cpu_count() or 1),
+)
+
+PPTX_IMAGE_PROCESS_POOL = ProcessPoolService(
+    "pptx images",
+    max_workers=parse_int_or_none(get_pptx_image_workers_env())
+    or min(4, os.cpu_count() or 1),
+)
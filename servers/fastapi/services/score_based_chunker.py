@@ -1,21 +1,30 @@
 import asyncio
-from typing import List
+import re
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Tuple
 
 from models.document_chunk import DocumentChunk
 
+# A markdown heading line, leading whitespace allowed. [^\S\n] keeps matches on one line.
+HEADING_LINE_PATTERN = re.compile(r"^[^\S\n]*#.*$", re.MULTILINE)
+
 
 class ScoreBasedChunker:
 
+    def find_heading_lines(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Single pass over text returning (heading, line start offset, content start offset)
+        for every heading line, without splitting the text into lines.
+        """
+        heading_lines = []
+        for match in HEADING_LINE_PATTERN.finditer(text):
+            heading_lines.append(
+                (match.group().strip(), match.start(), match.end() + 1)
+            )
+        return heading_lines
+
     def extract_headings(self, text: str) -> List[str]:
-        lines = text.split("\n")
-        headings = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith("#"):
-                headings.append(line)
-        
-        return headings
+        return [heading for heading, _, _ in self.find_heading_lines(text)]
 
     def score_headings(self, headings: List[str]) -> List[float]:
         heading_scores = []
@@ -24,9 +33,9 @@ class ScoreBasedChunker:
 
         for i, heading in enumerate(headings):
             score = 0.0
-            
+
             heading_level = len(heading) - len(heading.lstrip("#"))
-            
+
             if heading_level <= 3:
                 score += 10.0 - (heading_level - 1) * 2.0
             else:
@@ -111,36 +120,31 @@ class ScoreBasedChunker:
 
             selected_indices.sort()
 
-        lines = text.split("\n")
-        heading_positions = {}
-        
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            if line_stripped.startswith("#"):
-                for heading_idx, heading in enumerate(headings):
-                    if heading == line_stripped and heading_idx not in heading_positions:
-                        heading_positions[heading_idx] = i
-                        break
-        
+        # Each heading line takes the first unassigned heading with the same text
+        pending_indices: Dict[str, Deque[int]] = defaultdict(deque)
+        for heading_idx, heading in enumerate(headings):
+            pending_indices[heading].append(heading_idx)
+
+        heading_positions: Dict[int, Tuple[int, int]] = {}
+        for heading, line_start, content_start in self.find_heading_lines(text):
+            indices = pending_indices.get(heading)
+            if indices:
+                heading_positions[indices.popleft()] = (line_start, content_start)
+
         for i, heading_idx in enumerate(selected_indices):
             if heading_idx not in heading_positions:
                 continue
-                
+
             heading = headings[heading_idx]
-            heading_line_idx = heading_positions[heading_idx]
-            
+            _, content_start = heading_positions[heading_idx]
+
+            content_end = len(text)
             if i + 1 < len(selected_indices):
                 next_heading_idx = selected_indices[i + 1]
                 if next_heading_idx in heading_positions:
-                    next_heading_line_idx = heading_positions[next_heading_idx]
-                    content_end = next_heading_line_idx
-                else:
-                    content_end = len(lines)
-            else:
-                content_end = len(lines)
+                    content_end = heading_positions[next_heading_idx][0]
 
-            content_lines = lines[heading_line_idx + 1 : content_end]
-            content = "\n".join(content_lines).strip()
+            content = text[content_start:content_end].strip()
 
             chunk = DocumentChunk(
                 heading=heading,
@@ -149,7 +153,7 @@ class ScoreBasedChunker:
                 score=heading_scores[heading_idx],
             )
             chunks.append(chunk)
-            
+
         return chunks
 
     async def get_n_chunks(self, text: str, n: int) -> List[DocumentChunk]:
@@ -0,0 +1,11 @@
+import os
+
+import pytest
+
+# Set to true to run timing benchmarks, too slow and machine dependent for the default run
+BENCHMARK_ENV = "BENCHMARK"
+
+benchmark = pytest.mark.skipif(
+    os.getenv(BENCHMARK_ENV) != "true",
+    reason=f"set {BENCHMARK_ENV}=true to run benchmarks",
+)
@@ -0,0 +1,76 @@
+import asyncio
+import os
+
+import pytest
+
+from services.document_cache_service import DocumentCacheService
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setenv("DOCUMENT_CACHE_MAX_MB", "1")
+    return DocumentCacheService()
+
+
+def write_document(tmp_path, name: str, size: int) -> str:
+    file_path = str(tmp_path / name)
+    with open(file_path, "w") as f:
+        f.write(name * size)
+    return file_path
+
+
+def test_least_recently_used_entries_are_evicted(cache, tmp_path):
+    async def create():
+        return "x" * 400 * 1024
+
+    async def load(file_path):
+        return await cache.get_or_create_markdown(file_path, {}, create)
+
+    first = write_document(tmp_path, "first", 1)
+    second = write_document(tmp_path, "second", 1)
+    third = write_document(tmp_path, "third", 1)
+
+    def get_key(file_path):
+        return asyncio.run(cache.get_cache_key_for_file(file_path, {}))
+
+    asyncio.run(load(first))
+    asyncio.run(load(second))
+    # Written long ago, but reading it makes the second entry the least recently used
+    os.utime(cache.get_entry_dir(get_key(first)), (0, 0))
+    asyncio.run(load(first))
+    asyncio.run(load(third))
+
+    cached = [
+        cache.read_markdown(get_key(path)) is not None
+        for path in (first, second, third)
+    ]
+    assert cached == [True, False, True]
+    assert len(cache._locks) == 0
+
+
+def test_cached_page_images_are_linked_into_the_output_dir(cache, tmp_path):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    file_path = write_document(tmp_path, "deck", 1)
+
+    async def create():
+        image_path = str(output_dir / "page_1.png")
+        with open(image_path, "wb") as f:
+            f.write(b"png")
+        return [image_path]
+
+    async def load():
+        return await cache.get_or_create_page_images(
+            file_path, {}, create, str(output_dir)
+        )
+
+    created = asyncio.run(load())
+    cached = asyncio.run(load())
+
+    assert created == [str(output_dir / "page_1.png")]
+    assert len(cached) == 1 and cached != created
+    assert os.path.dirname(cached[0]) == str(output_dir)
+    with open(cached[0], "rb") as f:
+        assert f.read() == b"png"
+    assert len(cache._locks) == 0
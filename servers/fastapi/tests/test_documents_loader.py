@@ -0,0 +1,27 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import HTTPException
+
+import services.documents_loader as documents_loader
+from enums.pdf_engine import PdfEngine
+from services.documents_loader import DocumentsLoader
+
+
+@pytest.mark.parametrize(
+    "error, status_code",
+    [(MemoryError(), 413), (BrokenProcessPool("worker died"), 500)],
+)
+def test_parser_failures_map_to_status_codes(monkeypatch, error, status_code):
+    async def run(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(documents_loader.DOCUMENT_PROCESS_POOL, "run", run)
+    loader = DocumentsLoader(file_paths=[])
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(loader._parse_to_markdown("/tmp/report.pdf", PdfEngine.AUTO))
+
+    assert exc_info.value.status_code == status_code
+    assert "report.pdf" in exc_info.value.detail
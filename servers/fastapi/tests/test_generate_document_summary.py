@@ -0,0 +1,89 @@
+import asyncio
+
+import utils.llm_calls.generate_document_summary as document_summary
+from services.document_context_service import DocumentContextService, estimate_tokens
+
+
+def create_document(paragraphs: int) -> str:
+    return "\n\n".join("word " * 3000 for _ in range(paragraphs))
+
+
+def test_reduce_stops_when_summaries_do_not_shrink(monkeypatch):
+    calls = []
+
+    async def summarize_text(client, model, text, is_reduce=False):
+        calls.append(is_reduce)
+        # Reduce outputs as large as a whole group never combine into fewer groups
+        if is_reduce:
+            return "x" * (document_summary.CHUNK_TOKENS * 4 - 10)
+        return "y" * 2400
+
+    monkeypatch.setattr(document_summary, "summarize_text", summarize_text)
+    monkeypatch.setattr(document_summary, "LLMClient", lambda: None)
+    monkeypatch.setattr(document_summary, "get_model", lambda: "model")
+
+    summary = asyncio.run(
+        document_summary.generate_document_summary(create_document(40), 5000)
+    )
+
+    assert estimate_tokens(summary) <= 5000
+    assert calls.count(False) == 40
+    assert calls.count(True) <= 40
+
+
+def test_summaries_fill_the_token_budget(monkeypatch):
+    async def summarize_text(client, model, text, is_reduce=False):
+        return "summary " * 100
+
+    monkeypatch.setattr(document_summary, "summarize_text", summarize_text)
+    monkeypatch.setattr(document_summary, "LLMClient", lambda: None)
+    monkeypatch.setattr(document_summary, "get_model", lambda: "model")
+
+    # 10 chunk summaries of 200 tokens fit a 4000 token budget without reducing
+    summary = asyncio.run(
+        document_summary.generate_document_summary(create_document(10), 4000)
+    )
+    assert summary.count("summary") == 1000
+
+
+def test_documents_are_summarized_concurrently(monkeypatch):
+    running = []
+    max_running = []
+
+    async def generate_document_summary(document, max_tokens):
+        running.append(document)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(document)
+        return f"summary of {len(document)} chars"
+
+    monkeypatch.setattr(
+        document_summary, "generate_document_summary", generate_document_summary
+    )
+    service = DocumentContextService(token_budget=100)
+
+    documents = asyncio.run(service.summarize_documents(["a" * 5000] * 3 + ["short"]))
+
+    assert documents == ["summary of 5000 chars"] * 3 + ["short"]
+    assert max(max_running) == 3
+
+
+def test_summarized_context_fits_the_token_budget(monkeypatch):
+    summarized = []
+
+    async def generate_document_summary(document, max_tokens):
+        summarized.append((len(document), max_tokens))
+        return "summary " * max_tokens
+
+    monkeypatch.setattr(
+        document_summary, "generate_document_summary", generate_document_summary
+    )
+    service = DocumentContextService(token_budget=1000)
+
+    # Far over budget, over budget but trimmed by selection, and within budget
+    documents = [create_document(10), "word " * 1200, "short document"]
+    context = asyncio.run(service.get_summarized_context(documents))
+
+    assert summarized == [(len(documents[0]), 1000)]
+    assert estimate_tokens(context) <= 1000 + len(documents)
+    assert "short document" in context
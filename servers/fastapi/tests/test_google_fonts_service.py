@@ -0,0 +1,119 @@
+import asyncio
+import json
+import time
+
+import services.google_fonts_service as google_fonts_service
+from services.google_fonts_service import (
+    UNAVAILABLE_TTL_SECONDS,
+    GoogleFontsService,
+)
+
+
+def create_service(monkeypatch, tmp_path, responses: dict):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    service = GoogleFontsService()
+    requests = []
+
+    async def fetch_availability(font_name):
+        requests.append(font_name)
+        await asyncio.sleep(0.01)
+        return responses.get(font_name)
+
+    monkeypatch.setattr(service, "fetch_availability", fetch_availability)
+    return service, requests
+
+
+def test_bundled_and_cached_families_skip_network(monkeypatch, tmp_path):
+    service, requests = create_service(
+        monkeypatch, tmp_path, {"Custom Sans": False, "New Font": True}
+    )
+
+    results = asyncio.run(
+        service.check_availability(["Open Sans", "Custom Sans", "New Font"])
+    )
+    assert results == {"Open Sans": True, "Custom Sans": False, "New Font": True}
+    assert sorted(requests) == ["Custom Sans", "New Font"]
+
+    # A fresh instance reads the persisted results instead of asking again
+    service, requests = create_service(monkeypatch, tmp_path, {})
+    results = asyncio.run(service.check_availability(["Custom Sans", "New Font"]))
+    assert results == {"Custom Sans": False, "New Font": True}
+    assert requests == []
+
+
+def test_expired_and_failed_lookups(monkeypatch, tmp_path):
+    service, requests = create_service(monkeypatch, tmp_path, {"Custom Sans": True})
+    with open(service.get_cache_path(), "w") as f:
+        checked_at = time.time() - UNAVAILABLE_TTL_SECONDS - 1
+        json.dump({"Custom Sans": {"available": False, "checked_at": checked_at}}, f)
+
+    async def check_concurrently():
+        return await asyncio.gather(
+            service.check_availability(["Custom Sans", "Unreachable"]),
+            service.check_availability(["Custom Sans"]),
+        )
+
+    first, second = asyncio.run(check_concurrently())
+    assert first == {"Custom Sans": True, "Unreachable": False}
+    assert second == {"Custom Sans": True}
+    assert sorted(requests) == ["Custom Sans", "Unreachable"]
+    # Network failures are retried on the next lookup
+    assert "Unreachable" not in service.load_cache()
+
+
+def test_finished_lookup_keeps_a_newer_pending_lookup(monkeypatch, tmp_path):
+    service, _ = create_service(monkeypatch, tmp_path, {"New Font": True})
+
+    async def check_while_replaced():
+        check = asyncio.create_task(service.check_availability(["New Font"]))
+        await asyncio.sleep(0)
+        newer = asyncio.create_task(asyncio.sleep(0.05, result=True))
+        service._pending["New Font"] = newer
+        await check
+        # The finished lookup's callback leaves the newer lookup shared
+        assert service._pending["New Font"] is newer
+        await newer
+
+    asyncio.run(check_while_replaced())
+
+
+def test_offline_mode_uses_bundled_families_file(monkeypatch, tmp_path):
+    families_file = tmp_path / "families.txt"
+    families_file.write_text("Private Grotesk\n")
+    monkeypatch.setenv("GOOGLE_FONTS_OFFLINE", "true")
+    monkeypatch.setenv("GOOGLE_FONTS_FAMILIES_FILE", str(families_file))
+    service, requests = create_service(monkeypatch, tmp_path, {})
+
+    results = asyncio.run(
+        service.check_availability(["Private Grotesk", "Roboto", "Custom Sans"])
+    )
+    assert results == {"Private Grotesk": True, "Roboto": True, "Custom Sans": False}
+    assert requests == []
+
+
+def test_saved_cache_drops_expired_and_oldest_entries(monkeypatch, tmp_path):
+    monkeypatch.setattr(google_fonts_service, "MAX_CACHED_FAMILIES", 2)
+    service, _ = create_service(
+        monkeypatch, tmp_path, {"Font A": False, "Font B": False}
+    )
+    now = time.time()
+    with open(service.get_cache_path(), "w") as f:
+        json.dump(
+            {
+                "Expired": {
+                    "available": False,
+                    "checked_at": now - UNAVAILABLE_TTL_SECONDS - 1,
+                },
+                "Oldest": {"available": True, "checked_at": now - 10},
+                "Older": {"available": True, "checked_at": now - 5},
+            },
+            f,
+        )
+
+    asyncio.run(service.check_availability(["Font A"]))
+    with open(service.get_cache_path()) as f:
+        assert sorted(json.load(f)) == ["Font A", "Older"]
+
+    asyncio.run(service.check_availability(["Font B"]))
+    with open(service.get_cache_path()) as f:
+        assert sorted(json.load(f)) == ["Font A", "Font B"]
@@ -0,0 +1,111 @@
+import random
+import time
+
+from models.pptx_models import PptxFontModel
+from services.html_to_text_runs_service import (
+    InlineHTMLToRunsParser,
+    parse_html_text_to_text_runs,
+)
+from tests.benchmarks import benchmark
+
+SAMPLE_WORDS = [
+    "revenue",
+    "<b>growth</b>",
+    "<i>market</i>",
+    "<u>team</u>",
+    "<s>risk</s>",
+    "<code>x = 1</code>",
+    "<strong><em>plan</em></strong>",
+    "data &amp; insights",
+    "line<br>break",
+]
+
+
+def create_sample_paragraphs(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(SAMPLE_WORDS) for _ in range(40)) for _ in range(count)]
+
+
+class RevalidatingParser(InlineHTMLToRunsParser):
+    """Rebuilds and revalidates the font for every chunk, as the parser did before."""
+
+    def _current_font(self) -> PptxFontModel:
+        font_json = self.base_font.model_dump()
+        if any(tag in ("strong", "b") for tag in self.tag_stack):
+            font_json["font_weight"] = 700
+        if any(tag in ("em", "i") for tag in self.tag_stack):
+            font_json["italic"] = True
+        if any(tag == "u" for tag in self.tag_stack):
+            font_json["underline"] = True
+        if any(tag in ("s", "strike", "del") for tag in self.tag_stack):
+            font_json["strike"] = True
+        if any(tag == "code" for tag in self.tag_stack):
+            font_json["name"] = "Courier New"
+        return PptxFontModel(**font_json)
+
+
+def parse_with_revalidation(text: str, base_font: PptxFontModel):
+    parser = RevalidatingParser(base_font)
+    parser.feed(text.replace("\n", "<br>"))
+    return parser.text_runs
+
+
+def test_runs_match_previous_output():
+    base_font = PptxFontModel(name="Inter", size=18, color="333333")
+    for paragraph in create_sample_paragraphs(50):
+        runs = parse_html_text_to_text_runs(paragraph, base_font)
+        assert runs == parse_with_revalidation(paragraph, base_font)
+
+
+def test_base_font_is_not_modified():
+    base_font = PptxFontModel()
+    runs = parse_html_text_to_text_runs("<b>bold</b> plain", base_font)
+    assert runs[0].font.font_weight == 700
+    assert runs[1].font == base_font
+    assert base_font.font_weight == 400
+
+
+def test_fonts_are_derived_once_per_formatting_state():
+    derived = []
+
+    class CountingParser(InlineHTMLToRunsParser):
+        def _derive_font(self, *font_state):
+            derived.append(font_state)
+            return super()._derive_font(*font_state)
+
+    parser = CountingParser(PptxFontModel())
+    parser.feed(" ".join(create_sample_paragraphs(20)))
+
+    assert len(parser.text_runs) > 100
+    assert len(derived) == len(set(derived))
+
+
+def test_runs_do_not_share_fonts():
+    base_font = PptxFontModel()
+    runs = parse_html_text_to_text_runs("<b>one</b> two <b>three</b> four", base_font)
+    runs[0].font.color = "FF0000"
+    runs[1].font.size = 40
+
+    assert runs[2].font.color == "000000"
+    assert runs[2].font.font_weight == 700
+    assert runs[3].font.size == 16
+    assert base_font.size == 16
+
+
+@benchmark
+def test_paragraph_throughput_benchmark():
+    base_font = PptxFontModel(name="Inter", size=18, color="333333")
+    paragraphs = create_sample_paragraphs(2000)
+
+    timings = {}
+    for name, parse in (
+        ("revalidating", parse_with_revalidation),
+        ("memoized", parse_html_text_to_text_runs),
+    ):
+        start = time.perf_counter()
+        for paragraph in paragraphs:
+            parse(paragraph, base_font)
+        timings[name] = time.perf_counter() - start
+        print(f"{name}: {len(paragraphs) / timings[name]:.0f} paragraphs/s")
+
+    assert timings["memoized"] < timings["revalidating"]
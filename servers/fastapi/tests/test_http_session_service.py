@@ -0,0 +1,16 @@
+import asyncio
+
+from services.http_session_service import HttpSessionService
+
+
+def test_session_of_a_previous_loop_is_closed():
+    service = HttpSessionService()
+
+    first = asyncio.run(service.get_session())
+    second = asyncio.run(service.get_session())
+
+    assert first is not second
+    assert first.closed
+    assert not second.closed
+    asyncio.run(service.close())
+    assert second.closed
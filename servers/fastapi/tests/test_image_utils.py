@@ -0,0 +1,163 @@
+import random
+import time
+
+import pytest
+from PIL import Image, ImageDraw
+
+from utils.image_utils import (
+    create_circle_image,
+    invert_image,
+    round_image_corners,
+    set_image_opacity,
+)
+from tests.benchmarks import benchmark
+
+
+def create_sample_image(width: int, height: int, seed: int = 3) -> Image.Image:
+    """Noisy RGBA image with fully transparent, partly transparent and opaque pixels."""
+    rng = random.Random(seed)
+    image = Image.frombytes("RGBA", (width, height), rng.randbytes(width * height * 4))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, width // 4, height // 4), fill=(10, 20, 30, 0))
+    draw.rectangle((width // 2, height // 2, width, height), fill=(200, 100, 50, 255))
+    return image
+
+
+# Implementations replaced by Pillow band ops, kept to check the output is unchanged
+def invert_image_pixel_loop(img: Image.Image) -> Image.Image:
+    new_data = []
+    data = img.tobytes()
+    for r, g, b, a in zip(data[0::4], data[1::4], data[2::4], data[3::4]):
+        if a != 0:
+            new_data.append((255 - r, 255 - g, 255 - b, a))
+        else:
+            new_data.append((0, 0, 0, 0))
+    new_img = Image.new("RGBA", img.size)
+    new_img.putdata(new_data)
+    return new_img
+
+
+def round_image_corners_full_mask(image: Image.Image, radii) -> Image.Image:
+    w, h = image.size
+    max_radius = min(w // 2, h // 2)
+    rounded_mask = Image.new("L", image.size, 0)
+    rectangular_mask = Image.new("L", image.size, 255)
+    for i, radius in enumerate(min(radius, max_radius) for radius in radii):
+        if radius <= 0:
+            continue
+        circle = Image.new("L", (radius * 2, radius * 2), 0)
+        ImageDraw.Draw(circle).ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
+        if i == 0:
+            rounded_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+            rectangular_mask.paste(0, (0, 0, radius, radius))
+        elif i == 1:
+            rounded_mask.paste(
+                circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
+            )
+            rectangular_mask.paste(0, (w - radius, 0, w, radius))
+        elif i == 2:
+            rounded_mask.paste(
+                circle.crop((radius, radius, radius * 2, radius * 2)),
+                (w - radius, h - radius),
+            )
+            rectangular_mask.paste(0, (w - radius, h - radius, w, h))
+        else:
+            rounded_mask.paste(
+                circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
+            )
+            rectangular_mask.paste(0, (0, h - radius, radius, h))
+
+    corner_mask = Image.composite(rounded_mask, rectangular_mask, rounded_mask)
+    final_alpha = Image.composite(
+        image.getchannel("A"), Image.new("L", image.size, 0), corner_mask
+    )
+    result = Image.new("RGBA", image.size)
+    result.paste(image.convert("RGB"), (0, 0))
+    result.putalpha(final_alpha)
+    return result
+
+
+def create_circle_image_rgba_mask(image: Image.Image) -> Image.Image:
+    size = image.size
+    radius = min(size) // 2
+    center_x, center_y = size[0] // 2, size[1] // 2
+    mask = Image.new("RGBA", size, color=(0, 0, 0, 0))
+    ImageDraw.Draw(mask).ellipse(
+        (center_x - radius, center_y - radius, center_x + radius, center_y + radius),
+        fill=(255, 255, 255, 255),
+    )
+    return Image.composite(image, mask, mask)
+
+
+def set_image_opacity_lambda(image: Image.Image, opacity: float) -> Image.Image:
+    new_alpha = image.getchannel("A").point(lambda x: int(x * opacity))
+    result = Image.new("RGBA", image.size)
+    result.paste(image.convert("RGB"), (0, 0))
+    result.putalpha(new_alpha)
+    return result
+
+
+@pytest.mark.parametrize("size", [(1, 1), (37, 64), (128, 128), (301, 157)])
+def test_transforms_match_previous_output(size):
+    image = create_sample_image(*size)
+
+    assert invert_image(image).tobytes() == invert_image_pixel_loop(image).tobytes()
+    assert (
+        create_circle_image(image).tobytes()
+        == create_circle_image_rgba_mask(image).tobytes()
+    )
+    for opacity in (0.0, 0.33, 1.0):
+        assert (
+            set_image_opacity(image, opacity).tobytes()
+            == set_image_opacity_lambda(image, opacity).tobytes()
+        )
+    for radii in ([0, 0, 0, 0], [5, 10, 0, 200], [1000, 1000, 1000, 1000]):
+        assert (
+            round_image_corners(image, radii).tobytes()
+            == round_image_corners_full_mask(image, radii).tobytes()
+        )
+
+
+def test_round_image_corners_requires_four_radii():
+    with pytest.raises(ValueError):
+        round_image_corners(create_sample_image(10, 10), [1, 2, 3])
+
+
+def time_transform(transform) -> float:
+    start = time.perf_counter()
+    transform()
+    return time.perf_counter() - start
+
+
+@benchmark
+@pytest.mark.parametrize("side", [256, 1024, 2048])
+def test_transforms_benchmark(side):
+    image = create_sample_image(side, side)
+    radii = [40, 40, 40, 40]
+    # Current and previous implementation of each transform
+    transforms = {
+        "invert_image": (
+            lambda: invert_image(image),
+            lambda: invert_image_pixel_loop(image),
+        ),
+        "set_image_opacity": (
+            lambda: set_image_opacity(image, 0.5),
+            lambda: set_image_opacity_lambda(image, 0.5),
+        ),
+        "round_image_corners": (
+            lambda: round_image_corners(image, radii),
+            lambda: round_image_corners_full_mask(image, radii),
+        ),
+        "create_circle_image": (
+            lambda: create_circle_image(image),
+            lambda: create_circle_image_rgba_mask(image),
+        ),
+    }
+
+    for name, (transform, previous_transform) in transforms.items():
+        elapsed = time_transform(transform)
+        previous_elapsed = time_transform(previous_transform)
+        print(
+            f"{name} {side}x{side}: {elapsed * 1000:.1f} ms, "
+            f"previously {previous_elapsed * 1000:.1f} ms"
+        )
@@ -0,0 +1,25 @@
+import asyncio
+
+from utils.keyed_lock import KeyedLock
+
+
+def test_locks_serialize_per_key_and_are_released():
+    locks = KeyedLock()
+    events = []
+
+    async def hold(key: str, name: str):
+        async with locks(key):
+            events.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name} end")
+
+    async def run():
+        await asyncio.gather(
+            hold("a", "first"), hold("a", "second"), hold("b", "other")
+        )
+
+    asyncio.run(run())
+
+    assert events.index("first end") < events.index("second start")
+    assert events.index("other start") < events.index("first end")
+    assert len(locks) == 0
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import stat
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+
+import pytest
+
+import services.libreoffice_service as libreoffice_service
+from services.libreoffice_service import (
+    LibreOfficeInstance,
+    LibreOfficeService,
+    write_font_alias_config,
+)
+
+
+class StubInstance(LibreOfficeInstance):
+    """Runs conversions in-process, input file names select slow or crashing documents."""
+
+    started = []
+    converted = []
+
+    def __init__(self, uno, font_aliases, font_generation):
+        self.uno = uno
+        self.font_aliases = font_aliases
+        self.font_generation = font_generation
+        self.conversions = 0
+        self.running = False
+
+    @property
+    def is_running(self) -> bool:
+        return self.running
+
+    async def start(self):
+        self.running = True
+        StubInstance.started.append(self)
+
+    async def is_healthy(self) -> bool:
+        return self.running
+
+    def _convert(self, input_path, output_path, filter_name):
+        if "slow" in input_path:
+            time.sleep(0.3)
+        if "crash" in input_path:
+            self.running = False
+            raise Exception("LibreOffice crashed")
+        if "broken" in input_path:
+            raise Exception("LibreOffice could not open the file")
+        if zipfile.is_zipfile(input_path):
+            with zipfile.ZipFile(input_path) as package:
+                StubInstance.converted.append(package.read("ppt/slides/slide1.xml"))
+        with open(output_path, "w") as f:
+            f.write(filter_name)
+
+    async def stop(self):
+        self.running = False
+
+
+@pytest.fixture
+def service(monkeypatch):
+    StubInstance.started = []
+    StubInstance.converted = []
+    monkeypatch.setattr(libreoffice_service, "LibreOfficeInstance", StubInstance)
+    service = LibreOfficeService(pool_size=1, max_conversions=2, timeout=5)
+    service._uno_checked = True
+    service._uno = object()
+    return service
+
+
+def test_timeout_frees_the_slot_for_waiting_conversions(service, tmp_path):
+    async def convert_both():
+        return await asyncio.gather(
+            service.convert_to_pdf("slow.pptx", str(tmp_path), timeout=0.1),
+            service.convert_to_pdf("a.pptx", str(tmp_path)),
+            return_exceptions=True,
+        )
+
+    slow, other = asyncio.run(asyncio.wait_for(convert_both(), 2))
+
+    assert isinstance(slow, asyncio.TimeoutError)
+    assert os.path.exists(other)
+    assert len(StubInstance.started) == 2
+    assert not StubInstance.started[0].running
+    assert service._instances == [StubInstance.started[1]]
+
+
+def test_crashed_instance_is_replaced(service, tmp_path):
+    async def convert():
+        with pytest.raises(Exception, match="could not open"):
+            await service.convert_to_pdf("broken.pptx", str(tmp_path))
+        with pytest.raises(Exception, match="crashed"):
+            await service.convert_to_pdf("crash.pptx", str(tmp_path))
+        return await service.convert_to_pdf("a.pptx", str(tmp_path))
+
+    assert os.path.exists(asyncio.run(convert()))
+    # Failing documents only cost an instance when soffice itself went down
+    assert len(StubInstance.started) == 2
+    assert len(service._instances) == 1
+
+
+def test_cancelled_conversion_does_not_shrink_the_pool(service, tmp_path):
+    async def convert():
+        task = asyncio.create_task(service.convert_to_pdf("slow.pptx", str(tmp_path)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert service._instances == []
+        return await asyncio.wait_for(
+            service.convert_to_pdf("a.pptx", str(tmp_path)), 1
+        )
+
+    assert os.path.exists(asyncio.run(convert()))
+    assert len(StubInstance.started) == 2
+
+
+def test_instances_are_recycled_and_restarted_for_fonts(service, tmp_path):
+    # Font aliases of formats other than PPTX need an instance started with them
+    async def convert(**kwargs):
+        return await service.convert_to_pdf("a.odp", str(tmp_path), **kwargs)
+
+    async def convert_all():
+        await convert(font_aliases={"Inter Bold": "Inter"})
+        # Fewer aliases than the instance was started with, reused
+        await convert()
+        # max_conversions reached
+        await convert()
+        # Aliases the instance was not started with
+        await convert(font_aliases={"Lato Light": "Lato"})
+        # Newly installed fonts
+        await convert(fonts_installed=True)
+
+    asyncio.run(convert_all())
+
+    assert [instance.font_aliases for instance in StubInstance.started] == [
+        {"Inter Bold": "Inter"},
+        {},
+        {"Lato Light": "Lato"},
+        {},
+    ]
+    assert len(service._instances) == 1
+
+    asyncio.run(service.shutdown())
+    assert not any(instance.running for instance in StubInstance.started)
+
+
+def create_pptx(path, typeface):
+    with zipfile.ZipFile(path, "w") as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        package.writestr(
+            "ppt/slides/slide1.xml",
+            '<p:sld xmlns:p="p" xmlns:a="a">'
+            f'<a:latin typeface="{typeface}"/><a:t>typeface="{typeface}"</a:t>'
+            "</p:sld>",
+        )
+
+
+def test_uploads_with_different_fonts_reuse_one_instance(service, tmp_path):
+    inter_path = str(tmp_path / "inter.pptx")
+    lato_path = str(tmp_path / "lato.pptx")
+    create_pptx(inter_path, "Inter Bold")
+    create_pptx(lato_path, "Lato Light")
+
+    async def convert_both():
+        await service.convert_to_pdf(inter_path, str(tmp_path), {"Inter Bold": "Inter"})
+        await service.convert_to_pdf(lato_path, str(tmp_path), {"Lato Light": "Lato"})
+
+    asyncio.run(convert_both())
+
+    assert len(StubInstance.started) == 1
+    assert StubInstance.started[0].font_aliases == {}
+    # Only typeface attributes are aliased, text and the uploads are left untouched
+    assert [b'typeface="Inter"' in xml for xml in StubInstance.converted] == [
+        True,
+        False,
+    ]
+    assert b'<a:t>typeface="Inter Bold"</a:t>' in StubInstance.converted[0]
+    assert b'typeface="Lato"' in StubInstance.converted[1]
+    with zipfile.ZipFile(inter_path) as package:
+        assert b'typeface="Inter Bold"/>' in package.read("ppt/slides/slide1.xml")
+
+
+def test_font_alias_config_escapes_family_names(tmp_path):
+    config_path = str(tmp_path / "fonts.conf")
+    write_font_alias_config(config_path, {"Evil</string><dir>/ Bold": "Evil & Co"})
+
+    with open(config_path) as f:
+        # Skips the DOCTYPE line, which ElementTree cannot resolve
+        root = ET.fromstring("\n".join(f.read().splitlines()[2:]))
+    assert [element.text for element in root.iter("string")] == [
+        "Evil</string><dir>/ Bold",
+        "Evil & Co",
+    ]
+    assert root.find("dir") is None
+
+
+def test_falls_back_to_one_shot_conversion_without_uno(monkeypatch, tmp_path):
+    # Stands in for soffice: writes <outdir>/<name>.pdf like --convert-to does
+    soffice_path = tmp_path / "soffice"
+    soffice_path.write_text(
+        '#!/bin/sh\nname=$(basename "$6")\ntouch "$5/${name%.*}.pdf"\n'
+    )
+    soffice_path.chmod(soffice_path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(
+        libreoffice_service, "get_soffice_binary", lambda: str(soffice_path)
+    )
+    service = LibreOfficeService(pool_size=1)
+    monkeypatch.setattr(service, "get_uno", lambda: None)
+
+    output_dir = str(tmp_path / "out")
+    pdf_path = asyncio.run(
+        service.convert_to_pdf(
+            str(tmp_path / "deck.pptx"), output_dir, {"Inter Bold": "Inter"}
+        )
+    )
+
+    assert pdf_path == os.path.join(output_dir, "deck.pdf")
+    assert os.path.exists(pdf_path)
@@ -0,0 +1,22 @@
+import pytest
+
+from utils.parsers import expand_page_ranges, parse_page_ranges
+
+
+def test_page_ranges_are_not_expanded_while_parsing():
+    assert parse_page_ranges("5, 1-3,,2-1000000000") == [
+        (5, 5),
+        (1, 3),
+        (2, 1000000000),
+    ]
+    assert parse_page_ranges(" ") is None
+    for value in ("0", "3-1", "a-b"):
+        with pytest.raises(ValueError):
+            parse_page_ranges(value)
+
+
+def test_page_ranges_are_clamped_to_page_count():
+    page_ranges = parse_page_ranges("5, 1-3,2-1000000000")
+    assert expand_page_ranges(page_ranges, 6) == [1, 2, 3, 4, 5, 6]
+    with pytest.raises(ValueError, match="Page 8 is out of range"):
+        expand_page_ranges(parse_page_ranges("2,8-9"), 6)
@@ -0,0 +1,79 @@
+import asyncio
+
+from PIL import Image
+
+import services.picture_transform_service as picture_transform_service
+from models.pptx_models import PptxPictureTransformModel
+from services.picture_transform_service import (
+    PictureTransformCache,
+    apply_picture_transform,
+)
+
+
+def test_clipped_pictures_are_rendered_at_the_target_dpi(tmp_path):
+    image_path = str(tmp_path / "photo.png")
+    Image.new("RGB", (1000, 1000), "red").save(image_path)
+
+    transform = PptxPictureTransformModel(width=100, height=50, dpi=144)
+    output_path = apply_picture_transform(image_path, transform, str(tmp_path))
+
+    with Image.open(output_path) as image:
+        assert image.size == (200, 100)
+
+
+def test_clipped_pictures_are_not_upscaled_past_the_source(tmp_path):
+    image_path = str(tmp_path / "photo.png")
+    Image.new("RGB", (150, 150), "red").save(image_path)
+
+    transform = PptxPictureTransformModel(width=100, height=50, dpi=300)
+    output_path = apply_picture_transform(image_path, transform, str(tmp_path))
+
+    with Image.open(output_path) as image:
+        assert image.size == (150, 75)
+
+
+def test_vector_pictures_are_embedded_as_is(tmp_path):
+    # Placeable WMF header followed by a minimal metafile header
+    image_path = str(tmp_path / "logo.wmf")
+    with open(image_path, "wb") as f:
+        f.write(
+            b"\xd7\xcd\xc6\x9a\x00\x00\x00\x00\x00\x00\xe8\x03\xe8\x03\xe8\x03"
+            b"\x00\x00\x00\x00\x00\x00"
+            b"\x01\x00\x09\x00\x00\x03\x0c\x00\x00\x00\x00\x00\x03\x00\x00\x00\x00\x00"
+        )
+
+    transform = PptxPictureTransformModel(width=100, height=100, border_radius=[8])
+
+    assert apply_picture_transform(image_path, transform, str(tmp_path)) == image_path
+
+
+class FailingPool:
+    """Stands in for PPTX_IMAGE_PROCESS_POOL, workers fail on images named broken"""
+
+    max_workers = 2
+
+    async def run(self, callable, image_path, *args, timeout=None):
+        if "broken" in image_path:
+            raise ValueError("worker failed")
+        return callable(image_path, *args)
+
+
+def test_pictures_failed_in_the_pool_are_processed_in_process(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        picture_transform_service, "PPTX_IMAGE_PROCESS_POOL", FailingPool()
+    )
+    transform = PptxPictureTransformModel(width=50, height=50, dpi=72)
+    pictures = []
+    for name, color in (("photo.png", "red"), ("broken.png", "blue")):
+        image_path = str(tmp_path / name)
+        Image.new("RGB", (100, 100), color).save(image_path)
+        pictures.append((image_path, transform))
+    cache = PictureTransformCache(str(tmp_path), persist=False)
+
+    asyncio.run(cache.preprocess(pictures))
+    assert cache.misses == 1
+
+    processed_path = cache.get_or_create(pictures[1][0], transform)
+    assert cache.misses == 2
+    with Image.open(processed_path) as image:
+        assert image.size == (50, 50)
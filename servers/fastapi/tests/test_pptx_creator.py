@@ -2,12 +2,16 @@ import asyncio
 from models.pptx_models import (
     PptxAutoShapeBoxModel,
     PptxFillModel,
+    PptxFontModel,
+    PptxParagraphModel,
     PptxPositionModel,
     PptxPresentationModel,
     PptxSlideModel,
+    PptxTextBoxModel,
 )
 from services.pptx_presentation_creator import PptxPresentationCreator
 from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+from pptx.util import Pt
 
 
 pptx_model = PptxPresentationModel(
@@ -38,3 +42,26 @@ def test_pptx_creator():
     pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
     asyncio.run(pptx_creator.create_ppt())
     pptx_creator.save("debug/test.pptx")
+
+
+def test_pptx_creator_reuses_style_fragments():
+    textbox = PptxTextBoxModel(
+        position=PptxPositionModel(left=20, top=20, width=200, height=50),
+        paragraphs=[
+            PptxParagraphModel(text="<b>Bold</b> text", font=PptxFontModel(size=14))
+        ],
+    )
+    styled_model = PptxPresentationModel(
+        slides=[PptxSlideModel(shapes=[textbox, textbox.model_copy(deep=True)])]
+    )
+    pptx_creator = PptxPresentationCreator(styled_model, "/tmp/presenton")
+    asyncio.run(pptx_creator.create_ppt())
+
+    first, second = pptx_creator._ppt.slides[0].shapes
+    first_run = first.text_frame.paragraphs[0].runs[0]
+    second_run = second.text_frame.paragraphs[0].runs[0]
+    assert first_run.font.bold and first_run.font.size == Pt(14)
+
+    # Shapes get their own copy of a shared fragment
+    first_run.font.size = Pt(30)
+    assert second_run.font.size == Pt(14)
@@ -0,0 +1,243 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import resource
+import subprocess
+import tempfile
+import time
+
+import pytest
+from PIL import Image, ImageDraw
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE, MSO_CONNECTOR_TYPE
+
+from models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxBoxShapeEnum,
+    PptxConnectorModel,
+    PptxFillModel,
+    PptxFontModel,
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxParagraphModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxShadowModel,
+    PptxSlideModel,
+    PptxStrokeModel,
+    PptxTextBoxModel,
+)
+
+# Set to a file path to append results as JSON lines, e.g. to compare commits
+BENCHMARK_OUTPUT_ENV = "PPTX_BENCHMARK_OUTPUT"
+# Set to true to run the benchmarks without saving results
+BENCHMARK_ENV = "PPTX_BENCHMARK"
+
+# Each case spawns a process and builds a full deck, too slow for the default run
+pytestmark = pytest.mark.skipif(
+    not (os.getenv(BENCHMARK_OUTPUT_ENV) or os.getenv(BENCHMARK_ENV) == "true"),
+    reason=f"set {BENCHMARK_ENV}=true or {BENCHMARK_OUTPUT_ENV} to run benchmarks",
+)
+
+SAMPLE_WORDS = [
+    "revenue",
+    "<b>growth</b>",
+    "<i>market</i>",
+    "product",
+    "<u>team</u>",
+    "risk",
+    "<code>api</code>",
+    "data",
+]
+
+
+def create_sample_images(directory: str, count: int, seed: int) -> list:
+    """Gradient photos with shapes of varying size, some with transparency."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        width, height = rng.choice([(1600, 900), (1200, 1200), (800, 600)])
+        gradient = Image.linear_gradient("L").resize((width, height))
+        image = Image.merge(
+            "RGB",
+            (gradient, gradient.rotate(90), gradient.transpose(Image.FLIP_TOP_BOTTOM)),
+        )
+        draw = ImageDraw.Draw(image)
+        for _ in range(20):
+            left, top = rng.randrange(width), rng.randrange(height)
+            draw.ellipse(
+                (left, top, left + rng.randint(20, 300), top + rng.randint(20, 300)),
+                fill=tuple(rng.randrange(256) for _ in range(3)),
+            )
+        if i % 3 == 0:
+            image.putalpha(gradient)
+        extension = "png" if image.mode == "RGBA" else "jpg"
+        path = os.path.join(directory, f"image_{i}.{extension}")
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def create_text_slide(rng: random.Random) -> PptxSlideModel:
+    shapes = [
+        PptxTextBoxModel(
+            position=PptxPositionModel(left=60, top=40, width=1160, height=80),
+            paragraphs=[
+                PptxParagraphModel(
+                    text="Quarterly <b>review</b>",
+                    font=PptxFontModel(size=40, font_weight=700),
+                )
+            ],
+        )
+    ]
+    for column in range(3):
+        shapes.append(
+            PptxAutoShapeBoxModel(
+                type=MSO_AUTO_SHAPE_TYPE.ROUNDED_RECTANGLE,
+                position=PptxPositionModel(
+                    left=60 + column * 390, top=160, width=360, height=480
+                ),
+                fill=PptxFillModel(color="F4F4F5", opacity=0.9),
+                stroke=PptxStrokeModel(color="D4D4D8", thickness=1),
+                shadow=PptxShadowModel(radius=12, offset=4, opacity=0.2, angle=90),
+                border_radius=16,
+                paragraphs=[
+                    PptxParagraphModel(
+                        text=" ".join(
+                            rng.choice(SAMPLE_WORDS) for _ in range(rng.randint(20, 60))
+                        ),
+                        font=PptxFontModel(size=16, color="27272A"),
+                    )
+                    for _ in range(4)
+                ],
+            )
+        )
+    shapes.append(
+        PptxConnectorModel(
+            type=MSO_CONNECTOR_TYPE.STRAIGHT,
+            position=PptxPositionModel(left=60, top=140, width=1160, height=0),
+            thickness=1,
+            color="A1A1AA",
+        )
+    )
+    return PptxSlideModel(
+        background=PptxFillModel(color="FFFFFF"), note="Speaker notes", shapes=shapes
+    )
+
+
+def create_image_slide(rng: random.Random, image_paths: list) -> PptxSlideModel:
+    shapes = []
+    for index in range(4):
+        shapes.append(
+            PptxPictureBoxModel(
+                position=PptxPositionModel(
+                    left=40 + index * 300,
+                    top=120,
+                    width=280,
+                    height=rng.choice([280, 420]),
+                ),
+                clip=True,
+                opacity=rng.choice([None, 0.8]),
+                border_radius=rng.choice([None, [24, 24, 24, 24], [0, 40, 0, 40]]),
+                shape=rng.choice([None, PptxBoxShapeEnum.CIRCLE]),
+                object_fit=PptxObjectFitModel(
+                    fit=rng.choice([PptxObjectFitEnum.COVER, PptxObjectFitEnum.CONTAIN])
+                ),
+                picture=PptxPictureModel(
+                    is_network=False, path=rng.choice(image_paths)
+                ),
+            )
+        )
+    shapes.append(
+        PptxTextBoxModel(
+            position=PptxPositionModel(left=40, top=40, width=1200, height=60),
+            paragraphs=[
+                PptxParagraphModel(
+                    text="Gallery", font=PptxFontModel(size=32, font_weight=700)
+                )
+            ],
+        )
+    )
+    return PptxSlideModel(shapes=shapes)
+
+
+def create_synthetic_deck(
+    kind: str, n_slides: int, image_dir: str, seed: int = 11
+) -> PptxPresentationModel:
+    rng = random.Random(seed)
+    image_paths = (
+        create_sample_images(image_dir, 12, seed) if kind == "image_heavy" else []
+    )
+    if kind == "text_heavy":
+        slides = [create_text_slide(rng) for _ in range(n_slides)]
+    else:
+        slides = [create_image_slide(rng, image_paths) for _ in range(n_slides)]
+    return PptxPresentationModel(name=f"{kind}_{n_slides}", slides=slides)
+
+
+def run_export_benchmark(kind: str, n_slides: int) -> dict:
+    """Runs in a fresh process so peak memory belongs to this export alone."""
+    from services.pptx_presentation_creator import PptxPresentationCreator
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pptx_model = create_synthetic_deck(kind, n_slides, temp_dir)
+        pptx_path = os.path.join(temp_dir, "benchmark.pptx")
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        start = time.perf_counter()
+        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+        asyncio.run(pptx_creator.create_ppt())
+        pptx_creator.save(pptx_path)
+        elapsed = time.perf_counter() - start
+
+        return {
+            "kind": kind,
+            "slides": n_slides,
+            "seconds": round(elapsed, 3),
+            # ru_maxrss is in kilobytes on Linux
+            "peak_rss_mb": round(
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+            ),
+            "peak_rss_growth_mb": round(
+                (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before)
+                / 1024,
+                1,
+            ),
+            "size_kb": round(os.path.getsize(pptx_path) / 1024, 1),
+        }
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+@pytest.mark.parametrize("n_slides", [10, 50, 200])
+@pytest.mark.parametrize("kind", ["text_heavy", "image_heavy"])
+def test_pptx_export_benchmark(kind, n_slides, monkeypatch):
+    # Images are processed in a thread so their memory is measured in the same process
+    monkeypatch.setenv("PPTX_IMAGE_WORKERS", "1")
+    monkeypatch.setenv("PPTX_IMAGE_CACHE_PERSIST", "false")
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        result = pool.apply(run_export_benchmark, (kind, n_slides))
+
+    result["commit"] = get_commit()
+    print(json.dumps(result))
+    output_path = os.getenv(BENCHMARK_OUTPUT_ENV)
+    if output_path:
+        with open(output_path, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+    assert result["size_kb"] > 0
@@ -6,6 +6,7 @@ from fastapi import UploadFile
 import pytest
 
 from api.main import app
+from api.v1.ppt.endpoints.pptx_slides import _load_slide_xmls, get_raw_fonts
 
 
 client = TestClient(app)
@@ -108,6 +109,32 @@ def test_pptx_slides_processing():
             os.unlink(pptx_path)
 
 
+def test_load_slide_xmls_parses_slides_once_in_memory():
+    """Slides are read in numeric order and their fonts come from the same parse."""
+    pptx_path = create_sample_pptx()
+    slide_xml = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<p:sld xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">
+    <p:cSld><p:spTree><p:sp><p:txBody><a:p><a:r>
+        <a:rPr><a:latin typeface="Montserrat Bold"/><a:ea typeface="+mn-ea"/></a:rPr>
+        <a:t>Hello</a:t>
+    </a:r></a:p></p:txBody></p:sp></p:spTree></p:cSld>
+</p:sld>'''
+
+    try:
+        with zipfile.ZipFile(pptx_path, 'a') as zip_file:
+            zip_file.writestr('ppt/slides/slide10.xml', slide_xml)
+            zip_file.writestr('ppt/slides/_rels/slide10.xml.rels', '')
+
+        slides = _load_slide_xmls(pptx_path)
+
+        assert len(slides) == 2
+        assert slides[0].raw_fonts == []
+        assert slides[1].xml_content == slide_xml
+        assert get_raw_fonts(slides) == ['Montserrat Bold']
+    finally:
+        os.unlink(pptx_path)
+
+
 def test_invalid_file_type():
     """Test that non-PPTX files are rejected."""
     
@@ -1,9 +1,11 @@
+import re
 from unittest.mock import patch, AsyncMock, MagicMock
 import pytest
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_structure_model import PresentationStructureModel
+import api.v1.ppt.endpoints.presentation as presentation_endpoint
 from api.v1.ppt.endpoints.presentation import PRESENTATION_ROUTER
 
 class MockAiohttpResponse:
@@ -92,7 +94,7 @@ def patch_presentation_api(monkeypatch, mock_get_layout):
         patch('api.v1.ppt.endpoints.presentation.get_layout_by_name', new=AsyncMock(side_effect=mock_get_layout)),
         patch('api.v1.ppt.endpoints.presentation.TEMP_FILE_SERVICE.create_temp_dir', return_value='/tmp/mockdir'),
         patch('api.v1.ppt.endpoints.presentation.DocumentsLoader'),
-        patch('api.v1.ppt.endpoints.presentation.generate_document_summary', new_callable=AsyncMock, return_value="mock_summary"),
+        patch('api.v1.ppt.endpoints.presentation.DocumentContextService.get_summarized_context', new_callable=AsyncMock, return_value="mock_summary"),
         patch('api.v1.ppt.endpoints.presentation.generate_ppt_outline', side_effect=mock_generate_ppt_outline),
         patch('api.v1.ppt.endpoints.presentation.get_sql_session'),
         patch('api.v1.ppt.endpoints.presentation.get_slide_content_from_type_and_outline', new_callable=AsyncMock, return_value={"mock": "slide_content"}),
@@ -108,9 +110,11 @@ def patch_presentation_api(monkeypatch, mock_get_layout):
     docs_loader.return_value.load_documents = AsyncMock()
     docs_loader.return_value.documents = []
 
-    # Setup PptxPresentationCreator mock for pptx test
+    # Setup PptxPresentationCreator mock for pptx test, PPTX_EXPORT_SERVICE awaits
+    # prepare_assets and then builds and saves in a worker thread
     pptx_creator = mocks[9]
-    pptx_creator.return_value.create_ppt = AsyncMock()
+    pptx_creator.return_value.prepare_assets = AsyncMock()
+    pptx_creator.return_value.build_ppt = MagicMock()
     pptx_creator.return_value.save = MagicMock()
 
     yield
@@ -149,6 +153,22 @@ class TestPresentationGenerationAPI:
         assert "presentation_id" in response.json()
         assert "pptx" in response.json()["path"]
 
+    def test_export_as_pptx_reports_server_timing(self, client):
+        response = client.post(
+            "/api/v1/ppt/presentation/export/pptx",
+            json={"name": "Test", "slides": []}
+        )
+        assert response.status_code == 200
+        assert response.json() == "/tmp/exports/Test.pptx"
+        assert re.fullmatch(
+            r"pptx-queue;dur=\d+\.\d, pptx-build;dur=\d+\.\d",
+            response.headers["Server-Timing"],
+        )
+        pptx_creator = presentation_endpoint.PptxPresentationCreator.return_value
+        pptx_creator.prepare_assets.assert_awaited_once()
+        pptx_creator.build_ppt.assert_called_once()
+        pptx_creator.save.assert_called_once_with("/tmp/exports/Test.pptx")
+
     def test_generate_presentation_with_no_prompt(self, client):
         response = client.post(
             "/api/v1/ppt/presentation/generate",
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from services.process_pool_service import ProcessPoolService
+
+
+def sleep_and_return(seconds: float, value):
+    time.sleep(seconds)
+    return value
+
+
+def crash_worker():
+    os._exit(1)
+
+
+def test_timeout_does_not_fail_other_jobs():
+    pool = ProcessPoolService("test", max_workers=2)
+
+    async def run_jobs():
+        await pool.start()
+        return await asyncio.gather(
+            pool.run(sleep_and_return, 30, "stuck", timeout=1),
+            pool.run(sleep_and_return, 2, "running"),
+            pool.run(sleep_and_return, 0.1, "queued"),
+            pool.run(sleep_and_return, 0.1, "queued too"),
+            return_exceptions=True,
+        )
+
+    try:
+        stuck, *others = asyncio.run(run_jobs())
+    finally:
+        pool.shutdown()
+
+    assert isinstance(stuck, asyncio.TimeoutError)
+    assert others == ["running", "queued", "queued too"]
+
+
+def test_job_that_keeps_breaking_the_pool_fails():
+    pool = ProcessPoolService("test", max_workers=1)
+
+    async def run_jobs():
+        crashed = await asyncio.gather(pool.run(crash_worker), return_exceptions=True)
+        # The pool is replaced, later jobs run normally
+        return crashed[0], await pool.run(sleep_and_return, 0, "ok")
+
+    try:
+        crashed, result = asyncio.run(run_jobs())
+    finally:
+        pool.shutdown()
+
+    assert type(crashed).__name__ == "BrokenProcessPool"
+    assert result == "ok"
+
+
+def test_cancelled_caller_is_not_resubmitted():
+    pool = ProcessPoolService("test", max_workers=1)
+
+    async def run_jobs():
+        task = asyncio.create_task(pool.run(sleep_and_return, 0.5, "cancelled"))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    try:
+        asyncio.run(run_jobs())
+    finally:
+        pool.shutdown()
@@ -0,0 +1,114 @@
+import random
+import time
+
+from services.score_based_chunker import ScoreBasedChunker
+from tests.benchmarks import benchmark
+
+
+def create_sample_markdown(target_size: int, seed: int = 7) -> str:
+    """Markdown with nested and repeated headings, roughly target_size characters long."""
+    rng = random.Random(seed)
+    words = ["revenue", "growth", "market", "product", "team", "risk", "plan", "data"]
+    blocks = ["Title and abstract of the document."]
+    size = len(blocks[0])
+    section = 0
+    while size < target_size:
+        section += 1
+        level = rng.choice([1, 2, 2, 3, 3, 4])
+        # Repeated heading text must still map to its own position
+        title = (
+            f"Section {section % 50}" if rng.random() < 0.3 else f"Section {section}"
+        )
+        paragraph = " ".join(rng.choice(words) for _ in range(rng.randint(20, 120)))
+        block = f"{'#' * level} {title}\n{paragraph}\n\n  {paragraph[:40]}"
+        blocks.append(block)
+        size += len(block) + 2
+    return "\n\n".join(blocks)
+
+
+def get_chunks_line_scan(text, headings, selected_indices):
+    """Previous line based implementation, used as the reference output."""
+    lines = text.split("\n")
+    heading_positions = {}
+    for i, line in enumerate(lines):
+        line_stripped = line.strip()
+        if line_stripped.startswith("#"):
+            for heading_idx, heading in enumerate(headings):
+                if heading == line_stripped and heading_idx not in heading_positions:
+                    heading_positions[heading_idx] = i
+                    break
+
+    contents = []
+    for i, heading_idx in enumerate(selected_indices):
+        content_end = len(lines)
+        if i + 1 < len(selected_indices):
+            content_end = heading_positions[selected_indices[i + 1]]
+        contents.append(
+            "\n".join(lines[heading_positions[heading_idx] + 1 : content_end]).strip()
+        )
+    return contents
+
+
+def test_chunks_match_line_scan():
+    chunker = ScoreBasedChunker()
+    text = create_sample_markdown(20_000)
+    headings = chunker.extract_headings(text)
+    heading_scores = chunker.score_headings(headings)
+
+    for top_k in (1, 2, 10, len(headings)):
+        chunks = chunker.get_chunks_from_headings(
+            text, headings, heading_scores, top_k=top_k
+        )
+        selected_indices = [chunk.heading_index for chunk in chunks]
+        assert len(chunks) == min(top_k, len(headings))
+        assert [chunk.content for chunk in chunks] == get_chunks_line_scan(
+            text, headings, selected_indices
+        )
+
+
+def test_extract_headings_strips_indentation():
+    chunker = ScoreBasedChunker()
+    text = "intro\n  ## Indented  \n# Top\r\nbody\n#\nnot # heading"
+    assert chunker.extract_headings(text) == ["## Indented", "# Top", "#"]
+
+
+def time_chunking(chunker, text, get_contents):
+    start = time.perf_counter()
+    headings = chunker.extract_headings(text)
+    heading_scores = chunker.score_headings(headings)
+    contents = get_contents(text, headings, heading_scores)
+    return time.perf_counter() - start, headings, contents
+
+
+@benchmark
+def test_chunking_benchmark():
+    chunker = ScoreBasedChunker()
+
+    def get_contents(text, headings, heading_scores):
+        chunks = chunker.get_chunks_from_headings(
+            text, headings, heading_scores, top_k=len(headings)
+        )
+        return [chunk.content for chunk in chunks]
+
+    def get_contents_line_scan(text, headings, heading_scores):
+        return get_chunks_line_scan(text, headings, range(len(headings)))
+
+    # The line scan grows quadratically with the number of headings
+    text = create_sample_markdown(1024 * 1024)
+    elapsed, headings, contents = time_chunking(chunker, text, get_contents)
+    line_scan_elapsed, _, line_scan_contents = time_chunking(
+        chunker, text, get_contents_line_scan
+    )
+    print(
+        f"Chunked 1.0 MB with {len(headings)} headings in {elapsed:.2f}s, "
+        f"line scan {line_scan_elapsed:.2f}s ({line_scan_elapsed / elapsed:.0f}x)"
+    )
+    assert contents == line_scan_contents
+    assert elapsed < line_scan_elapsed
+
+    text = create_sample_markdown(10 * 1024 * 1024)
+    elapsed, headings, contents = time_chunking(chunker, text, get_contents)
+    print(
+        f"Chunked {len(text) / 1024 / 1024:.1f} MB with {len(headings)} headings in {elapsed:.2f}s"
+    )
+    assert len(contents) == len(headings)
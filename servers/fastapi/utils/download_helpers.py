@@ -1,13 +1,50 @@
 import asyncio
 import os
 import mimetypes
-from typing import List, Optional
+from typing import List, Mapping, Optional
 from urllib.parse import urlparse
 
-import aiohttp
-
 import uuid
 
+from services.download_cache_service import DOWNLOAD_CACHE_SERVICE
+from services.http_session_service import HTTP_SESSION_SERVICE
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def get_download_filename(url: str, response_headers: Mapping[str, str]) -> str:
+    parsed_url = urlparse(url)
+    filename = os.path.basename(parsed_url.path)
+    if filename and "." in filename:
+        return filename
+
+    # Taken from the GET response instead of a separate HEAD request
+    content_disposition = response_headers.get("Content-Disposition", "")
+    if "filename=" in content_disposition:
+        filename = os.path.basename(
+            content_disposition.split("filename=")[1].strip("\"'")
+        )
+    else:
+        content_type = response_headers.get("Content-Type", "")
+        if content_type:
+            extension = mimetypes.guess_extension(content_type.split(";")[0])
+            if extension:
+                filename = f"{uuid.uuid4()}{extension}"
+
+    return filename or str(uuid.uuid4())
+
+
+def reserve_unique_path(save_directory: str, filename: str) -> str:
+    """Creates an empty file named filename, or a uuid prefixed variant if it is taken."""
+    save_path = os.path.join(save_directory, filename)
+    try:
+        os.close(os.open(save_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return save_path
+    except FileExistsError:
+        save_path = os.path.join(save_directory, f"{uuid.uuid4()}_{filename}")
+        os.close(os.open(save_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return save_path
+
 
 async def download_file(
     url: str, save_directory: str, headers: Optional[dict] = None
@@ -15,43 +52,28 @@ async def download_file(
     try:
         os.makedirs(save_directory, exist_ok=True)
 
-        parsed_url = urlparse(url)
-        filename = os.path.basename(parsed_url.path)
-
-        if not filename or "." not in filename:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.head(url, headers=headers) as response:
-                    if response.status == 200:
-                        content_disposition = response.headers.get(
-                            "Content-Disposition", ""
-                        )
-                        if "filename=" in content_disposition:
-                            filename = content_disposition.split("filename=")[1].strip(
-                                "\"'"
-                            )
-                        else:
-                            content_type = response.headers.get("Content-Type", "")
-                            if content_type:
-                                extension = mimetypes.guess_extension(
-                                    content_type.split(";")[0]
-                                )
-                                if extension:
-                                    filename = f"{uuid.uuid4()}{extension}"
-
-        filename = filename or str(uuid.uuid4())
-        save_path = os.path.join(save_directory, filename)
-
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    with open(save_path, "wb") as file:
-                        async for chunk in response.content.iter_chunked(8192):
+        session = await HTTP_SESSION_SERVICE.get_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status == 200:
+                filename = get_download_filename(url, response.headers)
+                # Concurrent downloads of different urls may share a file name
+                temp_path = os.path.join(save_directory, f".{uuid.uuid4()}.tmp")
+                try:
+                    with open(temp_path, "wb") as file:
+                        async for chunk in response.content.iter_chunked(
+                            DOWNLOAD_CHUNK_SIZE
+                        ):
                             file.write(chunk)
-                    print(f"File downloaded successfully: {save_path}")
-                    return save_path
-                else:
-                    print(f"Failed to download file. HTTP status: {response.status}")
-                    return None
+                    save_path = reserve_unique_path(save_directory, filename)
+                    os.replace(temp_path, save_path)
+                finally:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                print(f"File downloaded successfully: {save_path}")
+                return save_path
+            else:
+                print(f"Failed to download file. HTTP status: {response.status}")
+                return None
 
     except Exception as e:
         print(f"Error downloading file from {url}: {e}")
@@ -59,22 +81,44 @@ async def download_file(
 
 
 async def download_files(
-    urls: List[str], save_directory: str, headers: Optional[dict] = None
+    urls: List[str],
+    save_directory: str,
+    headers: Optional[dict] = None,
+    use_cache: bool = False,
 ) -> List[Optional[str]]:
-    print(f"Starting download of {len(urls)} files to {save_directory}")
-    coroutines = [download_file(url, save_directory, headers) for url in urls]
+    """
+    Downloads every distinct url once and maps the results back to the input order.
+    With use_cache, files are served from and stored in the persistent download cache.
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    print(
+        f"Starting download of {len(unique_urls)} unique files for {len(urls)} urls to {save_directory}"
+    )
+    if use_cache:
+        coroutines = [
+            DOWNLOAD_CACHE_SERVICE.get_or_download(url, save_directory, headers)
+            for url in unique_urls
+        ]
+    else:
+        coroutines = [
+            download_file(url, save_directory, headers) for url in unique_urls
+        ]
     results = await asyncio.gather(*coroutines, return_exceptions=True)
-    final_results = []
-    for i, result in enumerate(results):
+
+    downloaded = {}
+    for url, result in zip(unique_urls, results):
         if isinstance(result, Exception):
-            print(f"Exception during download of {urls[i]}: {result}")
-            final_results.append(None)
+            print(f"Exception during download of {url}: {result}")
+            downloaded[url] = None
         else:
-            final_results.append(result)
+            downloaded[url] = result
+    final_results = [downloaded[url] for url in urls]
 
-    successful_downloads = sum(1 for result in final_results if result is not None)
+    successful_downloads = sum(
+        1 for result in downloaded.values() if result is not None
+    )
     print(
-        f"Download completed: {successful_downloads}/{len(urls)} files downloaded successfully"
+        f"Download completed: {successful_downloads}/{len(unique_urls)} files downloaded successfully"
     )
 
     return final_results
@@ -1,50 +1,117 @@
+import asyncio
 import json
 import os
+import shutil
+import tempfile
 import aiohttp
-from typing import Literal
+from typing import IO, Literal, Optional
+from urllib.parse import quote
 import uuid
 from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 from pathvalidate import sanitize_filename
 
+from constants.documents import POWERPOINT_TYPES
+
 from models.pptx_models import PptxPresentationModel
 from models.presentation_and_path import PresentationAndPath
+from services.pptx_export_service import PPTX_EXPORT_SERVICE
 from services.pptx_presentation_creator import PptxPresentationCreator
 from services.temp_file_service import TEMP_FILE_SERVICE
 from utils.asset_directory_utils import get_exports_directory
 import uuid
 
 
+# Exports up to this size are built in memory, larger ones spill to a temp file
+SPOOLED_EXPORT_MAX_MEMORY = 32 * 1024 * 1024
+EXPORT_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+async def get_pptx_model(presentation_id: uuid.UUID) -> PptxPresentationModel:
+    # Get the converted PPTX model from the Next.js service
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"Failed to get PPTX model: {error_text}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to convert presentation to PPTX model",
+                )
+            pptx_model_data = await response.json()
+
+    return PptxPresentationModel(**pptx_model_data)
+
+
+def get_pptx_export_path(title: Optional[str]) -> str:
+    return os.path.join(
+        get_exports_directory(),
+        f"{sanitize_filename(title or str(uuid.uuid4()))}.pptx",
+    )
+
+
+def copy_stream_to_file(stream: IO[bytes], path: str):
+    temp_path = f"{path}.{uuid.uuid4()}.tmp"
+    with open(temp_path, "wb") as f:
+        shutil.copyfileobj(stream, f, EXPORT_STREAM_CHUNK_SIZE)
+    os.replace(temp_path, path)
+
+
+async def stream_pptx(
+    pptx_model: PptxPresentationModel, title: Optional[str], persist: bool = False
+) -> StreamingResponse:
+    """
+    Builds the PPTX into a spooled buffer and streams it back as an attachment.
+    With persist, a copy is also written to the exports directory.
+    """
+    temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
+    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+    filename = f"{sanitize_filename(title or '') or 'presentation'}.pptx"
+
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOLED_EXPORT_MAX_MEMORY)
+    try:
+        timings = await PPTX_EXPORT_SERVICE.export(pptx_creator, buffer)
+        headers = {
+            "Content-Length": str(buffer.tell()),
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+            "Server-Timing": timings.server_timing,
+        }
+        if persist:
+            pptx_path = get_pptx_export_path(title)
+            buffer.seek(0)
+            await asyncio.to_thread(copy_stream_to_file, buffer, pptx_path)
+            headers["X-Export-Path"] = quote(pptx_path)
+        buffer.seek(0)
+    except Exception:
+        buffer.close()
+        raise
+
+    def iterate_buffer():
+        try:
+            while chunk := buffer.read(EXPORT_STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            buffer.close()
+
+    return StreamingResponse(
+        iterate_buffer(), media_type=POWERPOINT_TYPES[0], headers=headers
+    )
+
+
 async def export_presentation(
     presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
 ) -> PresentationAndPath:
     if export_as == "pptx":
-
-        # Get the converted PPTX model from the Next.js service
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"Failed to get PPTX model: {error_text}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to convert presentation to PPTX model",
-                    )
-                pptx_model_data = await response.json()
+        pptx_model = await get_pptx_model(presentation_id)
 
         # Create PPTX file using the converted model
-        pptx_model = PptxPresentationModel(**pptx_model_data)
         temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
         pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-        await pptx_creator.create_ppt()
 
-        export_directory = get_exports_directory()
-        pptx_path = os.path.join(
-            export_directory,
-            f"{sanitize_filename(title or str(uuid.uuid4()))}.pptx",
-        )
-        pptx_creator.save(pptx_path)
+        pptx_path = get_pptx_export_path(title)
+        await PPTX_EXPORT_SERVICE.export(pptx_creator, pptx_path)
 
         return PresentationAndPath(
             presentation_id=presentation_id,
@@ -1,8 +1,11 @@
+import hashlib
 import os
 from typing import BinaryIO
 import uuid
 
-from fastapi import UploadFile
+from fastapi import HTTPException, UploadFile
+
+from constants.documents import UPLOAD_CHUNK_SIZE
 
 
 def replace_file_name(filename: str, new_stem: str) -> str:
@@ -42,3 +45,44 @@ def set_file_ext(file_path: str, ext: str) -> str:
     if get_file_ext_or_none(file_path):
         return f"{os.path.splitext(file_path)[0]}{ext}"
     return f"{file_path}{ext}"
+
+
+def get_file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+async def save_upload_file(
+    file: UploadFile,
+    file_path: str,
+    max_size_mb: int | None = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> str:
+    """
+    Streams an upload to file_path in chunks so the whole file is never held in memory.
+    Returns the SHA-256 of the content. Raises 400 and removes the partial file when
+    the upload is larger than max_size_mb.
+    """
+    max_size = max_size_mb * 1024 * 1024 if max_size_mb else None
+    sha256 = hashlib.sha256()
+    size = 0
+    try:
+        with open(file_path, "wb") as f:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if max_size and size > max_size:
+                    raise HTTPException(
+                        400,
+                        detail=f"File '{file.filename}' exceeded max upload size of {max_size_mb} MB",
+                    )
+                sha256.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+    return sha256.hexdigest()
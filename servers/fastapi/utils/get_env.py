@@ -30,6 +30,10 @@ def get_app_data_directory_env():
     return os.getenv("APP_DATA_DIRECTORY", "/tmp/app_data")
 
 
+def get_heavy_features_enabled_env():
+    return os.getenv("HEAVY_FEATURES_ENABLED", "true")
+
+
 def get_temp_directory_env():
     return os.getenv("TEMP_DIRECTORY")
 
@@ -134,3 +138,91 @@ def get_extended_reasoning_env():
 
 def get_web_grounding_env():
     return os.getenv("WEB_GROUNDING")
+
+
+def get_document_parser_workers_env():
+    return os.getenv("DOCUMENT_PARSER_WORKERS")
+
+
+def get_document_parser_timeout_env():
+    return os.getenv("DOCUMENT_PARSER_TIMEOUT")
+
+
+def get_document_parser_max_memory_mb_env():
+    return os.getenv("DOCUMENT_PARSER_MAX_MEMORY_MB")
+
+
+def get_document_context_token_budget_env():
+    return os.getenv("DOCUMENT_CONTEXT_TOKEN_BUDGET")
+
+
+def get_llm_max_concurrent_requests_env():
+    return os.getenv("LLM_MAX_CONCURRENT_REQUESTS")
+
+
+def get_page_image_workers_env():
+    return os.getenv("PAGE_IMAGE_WORKERS")
+
+
+def get_page_image_resolution_env():
+    return os.getenv("PAGE_IMAGE_RESOLUTION")
+
+
+def get_page_image_format_env():
+    return os.getenv("PAGE_IMAGE_FORMAT")
+
+
+def get_page_image_quality_env():
+    return os.getenv("PAGE_IMAGE_QUALITY")
+
+
+def get_document_retrieval_passages_env():
+    return os.getenv("DOCUMENT_RETRIEVAL_PASSAGES")
+
+
+def get_pptx_image_cache_persist_env():
+    return os.getenv("PPTX_IMAGE_CACHE_PERSIST")
+
+
+def get_pptx_image_workers_env():
+    return os.getenv("PPTX_IMAGE_WORKERS")
+
+
+def get_pptx_image_dpi_env():
+    return os.getenv("PPTX_IMAGE_DPI")
+
+
+def get_pptx_image_quality_env():
+    return os.getenv("PPTX_IMAGE_QUALITY")
+
+
+def get_download_cache_max_mb_env():
+    return os.getenv("DOWNLOAD_CACHE_MAX_MB")
+
+
+def get_document_cache_max_mb_env():
+    return os.getenv("DOCUMENT_CACHE_MAX_MB")
+
+
+def get_pptx_export_concurrency_env():
+    return os.getenv("PPTX_EXPORT_CONCURRENCY")
+
+
+def get_libreoffice_pool_size_env():
+    return os.getenv("LIBREOFFICE_POOL_SIZE")
+
+
+def get_libreoffice_max_conversions_env():
+    return os.getenv("LIBREOFFICE_MAX_CONVERSIONS")
+
+
+def get_libreoffice_timeout_env():
+    return os.getenv("LIBREOFFICE_TIMEOUT")
+
+
+def get_google_fonts_offline_env():
+    return os.getenv("GOOGLE_FONTS_OFFLINE")
+
+
+def get_google_fonts_families_file_env():
+    return os.getenv("GOOGLE_FONTS_FAMILIES_FILE")
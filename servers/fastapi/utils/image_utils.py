@@ -1,6 +1,6 @@
 from typing import List
 
-from PIL import Image, ImageDraw
+from PIL import Image, ImageDraw, ImageOps
 
 from models.pptx_models import PptxObjectFitEnum, PptxObjectFitModel
 
@@ -62,11 +62,8 @@ def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
     if image.mode != "RGBA":
         image = image.convert("RGBA")
 
-    # Create a mask for the rounded corners (start with fully transparent)
-    rounded_mask = Image.new("L", image.size, 0)
-
-    # Create a rectangular mask (fully opaque)
-    rectangular_mask = Image.new("L", image.size, 255)
+    # Outside the corner boxes the alpha is unchanged, so only the corners are masked
+    alpha = image.getchannel("A")
 
     # Process each corner
     for i, radius in enumerate(clamped_radii):
@@ -76,66 +73,52 @@ def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
             draw = ImageDraw.Draw(circle)
             draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
 
-            # Calculate position based on corner index
+            # Corner box in the circle and in the image, based on corner index
             if i == 0:  # top-left
-                rounded_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
-                rectangular_mask.paste(0, (0, 0, radius, radius))
+                circle_box = (0, 0, radius, radius)
+                image_box = (0, 0, radius, radius)
             elif i == 1:  # top-right
-                rounded_mask.paste(
-                    circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
-                )
-                rectangular_mask.paste(0, (w - radius, 0, w, radius))
+                circle_box = (radius, 0, radius * 2, radius)
+                image_box = (w - radius, 0, w, radius)
             elif i == 2:  # bottom-right
-                rounded_mask.paste(
-                    circle.crop((radius, radius, radius * 2, radius * 2)),
-                    (w - radius, h - radius),
-                )
-                rectangular_mask.paste(0, (w - radius, h - radius, w, h))
+                circle_box = (radius, radius, radius * 2, radius * 2)
+                image_box = (w - radius, h - radius, w, h)
             else:  # bottom-left
-                rounded_mask.paste(
-                    circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
-                )
-                rectangular_mask.paste(0, (0, h - radius, radius, h))
-
-    # Get the original alpha channel
-    original_alpha = image.getchannel("A")
+                circle_box = (0, radius, radius, radius * 2)
+                image_box = (0, h - radius, radius, h)
 
-    # Combine the rectangular mask with the rounded corners
-    corner_mask = Image.composite(rounded_mask, rectangular_mask, rounded_mask)
+            corner = circle.crop(circle_box)
+            transparent = Image.new("L", corner.size, 0)
 
-    # Combine the corner mask with the original alpha channel
-    final_alpha = Image.composite(
-        original_alpha, Image.new("L", image.size, 0), corner_mask
-    )
+            # Same masking as a full size rounded mask over a transparent corner box
+            corner_mask = Image.composite(corner, transparent, corner)
+            corner_alpha = Image.composite(
+                alpha.crop(image_box), transparent, corner_mask
+            )
+            alpha.paste(corner_alpha, image_box[:2])
 
     # Create a new image with the modified alpha channel
-    result = Image.new("RGBA", image.size)
-    result.paste(image.convert("RGB"), (0, 0))
-    result.putalpha(final_alpha)
+    result = image.copy()
+    result.putalpha(alpha)
 
     return result
 
 
 def invert_image(img: Image.Image) -> Image.Image:
-    # Get image data
-    data = img.getdata()
-
-    # Process each pixel
-    new_data = []
-    for item in data:
-        # Get current pixel values
-        r, g, b, a = item
-
-        # Invert RGB values while preserving transparency
-        if a != 0:  # Skip fully transparent pixels
-            new_data.append((255 - r, 255 - g, 255 - b, a))
-        else:
-            new_data.append((0, 0, 0, 0))
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
 
-    # Create new image with modified data
-    new_img = Image.new("RGBA", img.size)
-    new_img.putdata(new_data)
-    return new_img
+    # Invert RGB values while preserving transparency
+    r, g, b, alpha = img.split()
+    inverted = Image.merge(
+        "RGBA", (*ImageOps.invert(Image.merge("RGB", (r, g, b))).split(), alpha)
+    )
+
+    # Fully transparent pixels become (0, 0, 0, 0)
+    visible_mask = alpha.point(lambda a: 255 if a != 0 else 0)
+    return Image.composite(
+        inverted, Image.new("RGBA", img.size, (0, 0, 0, 0)), visible_mask
+    )
 
 
 def create_circle_image(
@@ -147,8 +130,8 @@ def create_circle_image(
     size = img.size
     # Use the smaller dimension for the circle
     circle_size = min(size)
-    # Create a transparent image of the same size as original
-    mask = Image.new("RGBA", size, color=(0, 0, 0, 0))
+    # Create a circular mask, opaque inside the circle
+    mask = Image.new("L", size, 0)
     draw = ImageDraw.Draw(mask)
 
     # Calculate center position
@@ -156,7 +139,6 @@ def create_circle_image(
     center_y = size[1] // 2
     radius = circle_size // 2
 
-    # Create a circular mask
     draw.ellipse(
         (
             center_x - radius,
@@ -164,11 +146,11 @@ def create_circle_image(
             center_x + radius,
             center_y + radius,
         ),
-        fill=(255, 255, 255, 255),
+        fill=255,
     )
 
-    # Apply the circular mask
-    result = Image.composite(img, mask, mask)
+    # Apply the circular mask over a transparent background
+    result = Image.composite(img, Image.new("RGBA", size, (0, 0, 0, 0)), mask)
     return result
 
 
@@ -180,15 +162,13 @@ def set_image_opacity(image: Image.Image, opacity: float) -> Image.Image:
     if image.mode != "RGBA":
         image = image.convert("RGBA")
 
-    # Get the original alpha channel
-    original_alpha = image.getchannel("A")
-
-    # Create new alpha channel with adjusted opacity
-    new_alpha = original_alpha.point(lambda x: int(x * opacity))
+    # Scale the alpha channel through a lookup table
+    new_alpha = image.getchannel("A").point(
+        [int(alpha * opacity) for alpha in range(256)]
+    )
 
     # Create new image with modified alpha channel
-    result = Image.new("RGBA", image.size)
-    result.paste(image.convert("RGB"), (0, 0))
+    result = image.copy()
     result.putalpha(new_alpha)
 
     return result
@@ -0,0 +1,34 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Tuple
+
+
+class KeyedLock:
+    """
+    One asyncio.Lock per key, held only while a task holds or waits on it, so keys
+    that are used once (urls, content hashes) do not accumulate for the process lifetime.
+    """
+
+    def __init__(self):
+        # Lock of each key in use and the number of tasks holding or waiting on it
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._locks
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def __call__(self, key: str):
+        lock, users = self._locks.get(key, (asyncio.Lock(), 0))
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from typing import List, Optional
+
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from services.document_context_service import (
+    estimate_tokens,
+    split_into_chunks,
+    truncate_to_tokens,
+)
+from services.llm_client import LLMClient
+from services.llm_rate_limiter import LLM_RATE_LIMITER
+from utils.asset_directory_utils import get_cache_directory
+from utils.llm_client_error_handler import handle_llm_client_exceptions
+from utils.llm_provider import get_model
+
+# Bump when prompts change so cached summaries are regenerated
+SUMMARY_PROMPT_VERSION = 1
+
+CHUNK_TOKENS = 4000
+CHUNK_SUMMARY_MAX_TOKENS = 600
+SUMMARY_MAX_TOKENS = 2000
+# Token counts are estimates, reduce rounds are capped in case summaries stop shrinking
+MAX_REDUCE_ROUNDS = 3
+
+
+def get_system_prompt(is_reduce: bool):
+    if is_reduce:
+        return """
+            Combine the provided partial summaries of one document into a single summary.
+
+            # Notes
+            - Keep the document's structure, headings and logical flow.
+            - Preserve important numbers, names, dates and conclusions.
+            - Remove repetition between partial summaries.
+            - Provide output in markdown format.
+        """
+    return """
+        Summarize the provided section of a larger document.
+
+        # Notes
+        - Keep the key points, facts, numbers, names and dates.
+        - Keep headings of the section if present.
+        - Do not add information that is not in the section.
+        - Provide output in markdown format.
+    """
+
+
+def get_messages(text: str, is_reduce: bool):
+    return [
+        LLMSystemMessage(content=get_system_prompt(is_reduce)),
+        LLMUserMessage(content=text),
+    ]
+
+
+def _get_cache_path(text: str, model: str, is_reduce: bool) -> str:
+    key = hashlib.sha256(
+        f"{SUMMARY_PROMPT_VERSION}:{model}:{is_reduce}:{text}".encode("utf-8")
+    ).hexdigest()
+    return os.path.join(get_cache_directory("summaries"), f"{key}.md")
+
+
+def _read_cached_summary(cache_path: str) -> Optional[str]:
+    if not os.path.exists(cache_path):
+        return None
+    with open(cache_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _write_cached_summary(cache_path: str, summary: str):
+    temp_path = f"{cache_path}.{uuid.uuid4()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(summary)
+    os.replace(temp_path, cache_path)
+
+
+async def summarize_text(
+    client: LLMClient, model: str, text: str, is_reduce: bool = False
+) -> str:
+    cache_path = _get_cache_path(text, model, is_reduce)
+    cached_summary = await asyncio.to_thread(_read_cached_summary, cache_path)
+    if cached_summary is not None:
+        return cached_summary
+
+    async with LLM_RATE_LIMITER.limit():
+        summary = await client.generate(
+            model=model,
+            messages=get_messages(text, is_reduce),
+            max_tokens=SUMMARY_MAX_TOKENS if is_reduce else CHUNK_SUMMARY_MAX_TOKENS,
+        )
+
+    await asyncio.to_thread(_write_cached_summary, cache_path, summary)
+    return summary
+
+
+async def generate_document_summary(
+    document: str, max_tokens: int = SUMMARY_MAX_TOKENS
+) -> str:
+    """
+    Map-reduce summary of a document that does not fit in the model's context.
+    Chunks are summarized concurrently, then summaries are combined until together they
+    fit in max_tokens. If combining stops making progress the result is truncated.
+    """
+    if estimate_tokens(document) <= max_tokens:
+        return document
+
+    try:
+        client = LLMClient()
+        model = get_model()
+
+        chunks = split_into_chunks(document, CHUNK_TOKENS)
+        print(f"Summarizing document in {len(chunks)} chunks")
+        summaries = await asyncio.gather(
+            *[summarize_text(client, model, chunk) for chunk in chunks]
+        )
+
+        # Reduce, in groups that fit a single request, until the summaries fit
+        for _ in range(MAX_REDUCE_ROUNDS):
+            if estimate_tokens("\n\n".join(summaries)) <= max_tokens:
+                break
+            groups = split_into_chunks("\n\n".join(summaries), CHUNK_TOKENS)
+            if len(summaries) > 1 and len(groups) >= len(summaries):
+                print("Summaries stopped shrinking, truncating")
+                break
+            summaries = await asyncio.gather(
+                *[
+                    summarize_text(client, model, group, is_reduce=True)
+                    for group in groups
+                ]
+            )
+
+        return truncate_to_tokens("\n\n".join(summaries), max_tokens)
+
+    except Exception as e:
+        raise handle_llm_client_exceptions(e)
@@ -64,7 +64,9 @@ def get_system_prompt(
     """
 
 
-def get_user_prompt(outline: str, language: str):
+def get_user_prompt(
+    outline: str, language: str, document_context: Optional[str] = None
+):
     return f"""
         ## Current Date and Time
         {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
@@ -77,6 +79,10 @@ def get_user_prompt(outline: str, language: str):
 
         ## Slide Outline
         {outline}
+
+        {"## Relevant Excerpts From Provided Documents" if document_context else ""}
+        {"Use these only to support the outline with accurate facts." if document_context else ""}
+        {document_context or ""}
     """
 
 
@@ -86,6 +92,7 @@ def get_messages(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    document_context: Optional[str] = None,
 ):
 
     return [
@@ -93,7 +100,7 @@ def get_messages(
             content=get_system_prompt(tone, verbosity, instructions),
         ),
         LLMUserMessage(
-            content=get_user_prompt(outline, language),
+            content=get_user_prompt(outline, language, document_context),
         ),
     ]
 
@@ -105,6 +112,7 @@ async def get_slide_content_from_type_and_outline(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    document_context: Optional[str] = None,
 ):
     client = LLMClient()
     model = get_model()
@@ -134,6 +142,7 @@ async def get_slide_content_from_type_and_outline(
                 tone,
                 verbosity,
                 instructions,
+                document_context,
             ),
             response_format=response_schema,
             strict=False,
@@ -6,6 +6,9 @@ from constants.llm import (
     DEFAULT_OPENAI_MODEL,
     DEFAULT_CUSTOM_MODEL,
     DEFAULT_CUSTOM_LLM_URL,
+    DEFAULT_DOCUMENT_CONTEXT_TOKEN_BUDGET,
+    DOCUMENT_CONTEXT_TOKEN_BUDGETS_BY_MODEL,
+    DOCUMENT_CONTEXT_TOKEN_BUDGETS_BY_PROVIDER,
 )
 from enums.llm_provider import LLMProvider
 from openai import OpenAI
@@ -14,11 +17,13 @@ from utils.get_env import (
     get_custom_llm_api_key_env,
     get_custom_llm_url_env,
     get_custom_model_env,
+    get_document_context_token_budget_env,
     get_google_model_env,
     get_llm_provider_env,
     get_ollama_model_env,
     get_openai_model_env,
 )
+from utils.parsers import parse_int_or_none
 
 
 CUSTOM_COMPATIBLE_PROVIDERS = (LLMProvider.CUSTOM, LLMProvider.ZAI)
@@ -73,6 +78,20 @@ def get_model():
         )
 
 
+def get_document_context_token_budget() -> int:
+    budget = parse_int_or_none(get_document_context_token_budget_env())
+    if budget:
+        return budget
+
+    model = get_model()
+    if model in DOCUMENT_CONTEXT_TOKEN_BUDGETS_BY_MODEL:
+        return DOCUMENT_CONTEXT_TOKEN_BUDGETS_BY_MODEL[model]
+
+    return DOCUMENT_CONTEXT_TOKEN_BUDGETS_BY_PROVIDER.get(
+        get_llm_provider().value, DEFAULT_DOCUMENT_CONTEXT_TOKEN_BUDGET
+    )
+
+
 def get_llm_client() -> OpenAI:
     """Return a custom OpenAI-compatible client pointing at Z.AI."""
     base_url = get_custom_llm_url_env() or DEFAULT_CUSTOM_LLM_URL
@@ -2,3 +2,47 @@ def parse_bool_or_none(value: str | None) -> bool | None:
     if value is None:
         return None
     return value.lower() == "true"
+
+
+def parse_int_or_none(value: str | None) -> int | None:
+    if value is None or value.strip() == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def parse_page_ranges(value: str | None) -> list[tuple[int, int]] | None:
+    """
+    Parses 1-based page ranges like "1-3,5" into (start, end) pairs.
+    Ranges are only expanded by expand_page_ranges once the page count is known.
+    """
+    if value is None or value.strip() == "":
+        return None
+    page_ranges = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        start = int(start)
+        end = int(end) if end else start
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid page range: {part}")
+        page_ranges.append((start, end))
+    return page_ranges or None
+
+
+def expand_page_ranges(
+    page_ranges: list[tuple[int, int]], page_count: int
+) -> list[int]:
+    """Sorted unique page numbers of page_ranges, each range is clamped to page_count."""
+    page_numbers = set()
+    for start, end in page_ranges:
+        if start > page_count:
+            raise ValueError(
+                f"Page {start} is out of range, document has {page_count} pages"
+            )
+        page_numbers.update(range(start, min(end, page_count) + 1))
+    return sorted(page_numbers)